@@ -0,0 +1,78 @@
+"""Remove the files of the template options that were not selected and pick the prebuilt lock file."""
+
+import hashlib
+import os
+import shutil
+
+
+PACKAGE_DIR = os.path.join("src", "{{ cookiecutter.package_name }}")
+PROJECT_PROFILE = "{{ cookiecutter.project_profile }}"
+COMPILED_EXTENSION = "{{ cookiecutter.compiled_extension }}"
+INCLUDE_CACHING = "{{ cookiecutter.include_caching }}"
+INCLUDE_PARALLEL = "{{ cookiecutter.include_parallel }}"
+INCLUDE_IO = "{{ cookiecutter.include_io }}"
+
+# Prebuilt lock files, named after the fingerprint of the dependency tables they were locked for
+LOCKS_DIR = ".locks"
+# pyproject.toml tables that determine the locked dependencies
+DEPENDENCY_TABLES = ("tool.poetry.dependencies", "tool.poetry.extras", "tool.poetry.group.", "tool.poetry.source")
+
+# Files and directories generated only for some option values, mapped to whether they are kept
+OPTIONAL_FILES = {
+    os.path.join(PACKAGE_DIR, "numeric"): PROJECT_PROFILE == "numeric",
+    os.path.join("tests", "test_numeric.py"): PROJECT_PROFILE == "numeric",
+    os.path.join(PACKAGE_DIR, "service"): PROJECT_PROFILE == "async-service",
+    os.path.join("tests", "test_service.py"): PROJECT_PROFILE == "async-service",
+    "build.py": COMPILED_EXTENSION != "none",
+    os.path.join(PACKAGE_DIR, "speedups.py"): COMPILED_EXTENSION != "none",
+    os.path.join(PACKAGE_DIR, "_speedups_py.py"): COMPILED_EXTENSION != "none",
+    os.path.join(PACKAGE_DIR, "_speedups.pyi"): COMPILED_EXTENSION != "none",
+    os.path.join(PACKAGE_DIR, "_speedups.c"): COMPILED_EXTENSION == "c",
+    os.path.join(PACKAGE_DIR, "_speedups.pyx"): COMPILED_EXTENSION == "cython",
+    os.path.join("tests", "test_speedups.py"): COMPILED_EXTENSION != "none",
+    os.path.join(PACKAGE_DIR, "caching"): INCLUDE_CACHING == "yes",
+    os.path.join("tests", "test_caching.py"): INCLUDE_CACHING == "yes",
+    os.path.join(PACKAGE_DIR, "parallel.py"): INCLUDE_PARALLEL == "yes",
+    os.path.join("tests", "test_parallel.py"): INCLUDE_PARALLEL == "yes",
+    os.path.join(PACKAGE_DIR, "fileio.py"): INCLUDE_IO == "yes",
+    os.path.join("tests", "test_fileio.py"): INCLUDE_IO == "yes",
+}
+
+
+def remove_unselected_files() -> None:
+    for path, keep in OPTIONAL_FILES.items():
+        if keep:
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+
+def dependency_fingerprint(pyproject: str) -> str:
+    """Hash the dependency tables of a pyproject.toml, ignoring comments and blank lines."""
+    digest = hashlib.sha256()
+    relevant = False
+    for line in pyproject.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            relevant = line.strip("[]").startswith(DEPENDENCY_TABLES)
+        if relevant and line and not line.startswith("#"):
+            digest.update(line.encode() + b"\n")
+    return digest.hexdigest()[:16]
+
+
+def select_prebuilt_lock() -> None:
+    """Use the prebuilt lock file of the rendered dependencies as poetry.lock, so installs skip resolving."""
+    if not os.path.isdir(LOCKS_DIR):
+        return
+    with open("pyproject.toml") as f:
+        lock = os.path.join(LOCKS_DIR, f"{dependency_fingerprint(f.read())}.lock")
+    if os.path.isfile(lock):
+        shutil.move(lock, "poetry.lock")
+    shutil.rmtree(LOCKS_DIR)
+
+
+if __name__ == "__main__":
+    remove_unselected_files()
+    select_prebuilt_lock()
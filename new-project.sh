@@ -21,6 +21,8 @@ CREATE_PUBLIC=false
 CREATE_SECRETS=false
 CREATE_PYPIRC=false
 ENV_FILE="$SCRIPT_DIR/.env"
+USE_LOCK_CACHE=true
+LOCK_CACHE_DIR="${POETRY_TEMPLATE_LOCK_CACHE:-${XDG_CACHE_HOME:-$HOME/.cache}/poetry-template/locks}"
 HELP=false
 
 # Parse command line arguments
@@ -38,6 +40,10 @@ while [[ $# -gt 0 ]]; do
             INIT_GIT=false
             shift
             ;;
+        --no-lock-cache)
+            USE_LOCK_CACHE=false
+            shift
+            ;;
         --github)
             CREATE_GITHUB=true
             shift
@@ -101,6 +107,7 @@ if [ "$HELP" = true ] || [ -z "$PROJECT_NAME" ]; then
     echo "  --description=DESCRIPTION   Project short description"
     echo "  --no-install                Skip installing dependencies"
     echo "  --no-git                    Skip Git initialization"
+    echo "  --no-lock-cache             Resolve dependencies instead of reusing a cached poetry.lock"
     echo "  --github                    Create private GitHub repository (requires gh CLI)"
     echo "  --public                    Create public GitHub repository (implies --github)"
     echo "  --secrets                   Create GitHub repository secrets from .env"
@@ -127,6 +134,12 @@ if [ "$HELP" = true ] || [ -z "$PROJECT_NAME" ]; then
     echo "  PYPI_TOKEN=pypi-..."
     echo "  RTD_TOKEN=rtd_..."
     echo ""
+    echo "Provisioning:"
+    echo "  After the project is generated, dependency installation, GitHub repository creation,"
+    echo "  secrets and .pypirc creation run concurrently, and a timing summary is printed at the end."
+    echo "  Lock files are cached by the hash of the pyproject.toml dependency sections in:"
+    echo "  $LOCK_CACHE_DIR (set POETRY_TEMPLATE_LOCK_CACHE to change it)"
+    echo ""
     echo "Examples:"
     echo "  $0 my-project                              # Basic project"
     echo "  $0 my-project --github                     # Private GitHub repo"
@@ -178,24 +191,34 @@ create_github_secrets() {
 
     local created_count=0
     local skipped_count=0
+    local names=()
+    local pids=()
 
+    # Each secret is a separate API call, so they are set concurrently
     for secret_name in "${secrets[@]}"; do
         # Get the value from environment variable
         local secret_value="${!secret_name}"
 
         if [ -z "$secret_value" ]; then
             echo -e "${YELLOW}  ⚠️  Skipping $secret_name (not defined in environment)${NC}"
-            ((skipped_count++))
+            skipped_count=$((skipped_count + 1))
             continue
         fi
 
         # Create the secret in GitHub repository
-        if echo "$secret_value" | gh secret set "$secret_name" --repo "$project_name"; then
-            echo -e "${GREEN}  ✅ Created secret: $secret_name${NC}"
-            ((created_count++))
+        echo "$secret_value" | gh secret set "$secret_name" --repo "$project_name" &
+        names+=("$secret_name")
+        pids+=($!)
+    done
+
+    local i
+    for i in "${!pids[@]}"; do
+        if wait "${pids[$i]}"; then
+            echo -e "${GREEN}  ✅ Created secret: ${names[$i]}${NC}"
+            created_count=$((created_count + 1))
         else
-            echo -e "${RED}  ❌ Failed to create secret: $secret_name${NC}"
-            ((skipped_count++))
+            echo -e "${RED}  ❌ Failed to create secret: ${names[$i]}${NC}"
+            skipped_count=$((skipped_count + 1))
         fi
     done
 
@@ -273,6 +296,145 @@ EOF
     fi
 }
 
+# Function to print the current time in milliseconds, EPOCHREALTIME needs bash 5
+now_ms() {
+    if [ -n "$EPOCHREALTIME" ]; then
+        local now="${EPOCHREALTIME/[.,]/}"
+        echo $((now / 1000))
+    else
+        python3 -c 'import time; print(int(time.time() * 1000))'
+    fi
+}
+
+# Function to run a provisioning step, recording its duration and exit status for the summary
+run_step() {
+    local name="$1"
+    shift
+    echo "$name" >> "$STEP_DIR/steps"
+    local start
+    start=$(now_ms)
+    local status=0
+    "$@" || status=$?
+    echo "$(($(now_ms) - start)) $status" > "$STEP_DIR/$name.time"
+    return $status
+}
+
+# Function to record a step that was not run, so the summary shows it as skipped
+skip_step() {
+    echo "$1" >> "$STEP_DIR/steps"
+    echo "0 skipped" > "$STEP_DIR/$1.time"
+}
+
+# Function to start a step in the background, its output is shown when the step is awaited
+start_step() {
+    local name="$1"
+    run_step "$@" > "$STEP_DIR/$name.log" 2>&1 &
+    echo $! > "$STEP_DIR/$name.pid"
+}
+
+# Function to wait for a background step, print its output and return its exit status
+wait_step() {
+    local name="$1"
+    local status=0
+    wait "$(cat "$STEP_DIR/$name.pid")" || status=$?
+    cat "$STEP_DIR/$name.log"
+    return $status
+}
+
+# Function to print the duration of every step and the total wall-clock time
+print_step_summary() {
+    local total=$(($(now_ms) - START_MS))
+    local name duration status
+    echo -e "${BLUE}Step timings:${NC}"
+    while read -r name; do
+        read -r duration status < "$STEP_DIR/$name.time"
+        if [ "$status" = skipped ]; then
+            printf "  %-10s %9s\n" "$name" "skipped"
+        elif [ "$status" -eq 0 ]; then
+            printf "  %-10s %6d.%01ds\n" "$name" $((duration / 1000)) $((duration % 1000 / 100))
+        else
+            printf "  %-10s %6d.%01ds  (failed)\n" "$name" $((duration / 1000)) $((duration % 1000 / 100))
+        fi
+    done < "$STEP_DIR/steps"
+    printf "  %-10s %6d.%01ds\n" "total" $((total / 1000)) $((total % 1000 / 100))
+}
+
+# Function to print the lock cache key: a hash of the pyproject.toml sections poetry hashes into
+# poetry.lock and of the poetry version, so projects with the same dependencies share a lock file
+lock_cache_key() {
+    local poetry_version
+    poetry_version="$(poetry --version)" || return 1
+    python3 - "$poetry_version" << 'EOF'
+import hashlib
+import json
+import sys
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        sys.exit(1)
+
+with open("pyproject.toml", "rb") as f:
+    poetry = tomllib.load(f)["tool"]["poetry"]
+relevant = {key: poetry.get(key) for key in ("dependencies", "group", "source", "extras")}
+relevant["poetry"] = sys.argv[1]
+print(hashlib.sha256(json.dumps(relevant, sort_keys=True).encode()).hexdigest())
+EOF
+}
+
+# Function to install dependencies, reusing the cached lock file of identical dependency sections
+install_dependencies() {
+    echo -e "${YELLOW}Installing dependencies...${NC}"
+
+    local key=""
+    if [ "$USE_LOCK_CACHE" = true ]; then
+        key="$(lock_cache_key 2>/dev/null)" || key=""
+    fi
+    local cached_lock="$LOCK_CACHE_DIR/$key.lock"
+
+    if [ -n "$key" ] && [ -f "$cached_lock" ]; then
+        echo -e "${BLUE}Reusing cached lock file: $cached_lock${NC}"
+        cp "$cached_lock" poetry.lock
+        if poetry install; then
+            return 0
+        fi
+        echo -e "${YELLOW}  ⚠️  Cached lock file rejected, resolving dependencies${NC}"
+        rm -f poetry.lock "$cached_lock"
+    fi
+
+    poetry install || return 1
+
+    if [ -n "$key" ] && [ -f poetry.lock ]; then
+        # Copied under a temporary name first so that concurrent runs never read a partial lock file
+        mkdir -p "$LOCK_CACHE_DIR"
+        cp poetry.lock "$cached_lock.$$" && mv "$cached_lock.$$" "$cached_lock"
+    fi
+}
+
+# Function to create the GitHub repository and its secrets, the initial commit is pushed afterwards
+create_github_repository() {
+    local full_repo_name="$1"
+
+    # Determine repository visibility
+    local repo_visibility="--private"
+    if [ "$CREATE_PUBLIC" = true ]; then
+        repo_visibility="--public"
+        echo -e "${BLUE}Creating public GitHub repository...${NC}"
+    else
+        echo -e "${BLUE}Creating private GitHub repository...${NC}"
+    fi
+
+    gh repo create "$PROJECT_NAME" $repo_visibility --source=. --remote=origin || return 1
+
+    # Create secrets if requested
+    if [ "$CREATE_SECRETS" = true ]; then
+        create_github_secrets "$full_repo_name"
+    fi
+}
+
 # Function to check if gh CLI is available and authenticated
 check_github_cli() {
     if ! command -v gh &> /dev/null; then
@@ -307,9 +469,13 @@ if [ "$CREATE_SECRETS" = true ] || [ "$CREATE_PYPIRC" = true ]; then
     fi
 fi
 
+STEP_DIR="$(mktemp -d)"
+trap 'rm -rf "$STEP_DIR"' EXIT
+START_MS=$(now_ms)
+
 # Generate project
 echo -e "${YELLOW}Generating project structure...${NC}"
-cookiecutter "$TEMPLATE_PATH" --no-input project_name="$PROJECT_NAME" python_version="$PYTHON_VERSION" version="$VERSION" description="$DESCRIPTION"|| {
+run_step render cookiecutter "$TEMPLATE_PATH" --no-input project_name="$PROJECT_NAME" python_version="$PYTHON_VERSION" version="$VERSION" description="$DESCRIPTION" || {
     echo -e "${RED}Error: Failed to generate project${NC}"
     exit 1
 }
@@ -320,21 +486,19 @@ if [ ! -d "$PROJECT_NAME" ]; then
     exit 1
 fi
 
-# Create .pypirc file if requested (before changing directory)
-if [ "$CREATE_PYPIRC" = true ]; then
-    create_pypirc_file "$(pwd)/$PROJECT_NAME"
-fi
-
 cd "$PROJECT_NAME" || exit 1
 
+# The remaining steps only need the generated files: the installation and the GitHub repository
+# with its secrets run in the background while the local steps run, and the initial commit waits
+# for the installation so that it includes poetry.lock
 if [ "$INSTALL_DEPS" = true ]; then
-    echo -e "${YELLOW}Installing dependencies...${NC}"
-    poetry install || echo -e "${RED}Warning: Poetry install failed${NC}"
+    start_step install install_dependencies
 fi
 
+GITHUB_STARTED=false
 if [ "$INIT_GIT" = true ]; then
     echo -e "${YELLOW}Initializing Git repository...${NC}"
-    git init && git add . && git commit -m "Initial commit"
+    run_step git-init git init
 
     if [ "$CREATE_GITHUB" = true ]; then
         echo -e "${YELLOW}Creating GitHub repository...${NC}"
@@ -343,34 +507,50 @@ if [ "$INIT_GIT" = true ]; then
             # Get the current GitHub username for the full repository name
             GITHUB_USERNAME=$(gh api user --jq .login)
             FULL_REPO_NAME="$GITHUB_USERNAME/$PROJECT_NAME"
+            start_step github create_github_repository "$FULL_REPO_NAME"
+            GITHUB_STARTED=true
+        else
+            echo -e "${RED}GitHub repository creation failed due to CLI issues.${NC}"
+        fi
+    elif [ "$CREATE_SECRETS" = true ]; then
+        echo -e "${YELLOW}Warning: --secrets requires --github flag${NC}"
+    fi
+fi
 
-            # Determine repository visibility
-            if [ "$CREATE_PUBLIC" = true ]; then
-                REPO_VISIBILITY="--public"
-                echo -e "${BLUE}Creating public GitHub repository...${NC}"
-            else
-                REPO_VISIBILITY="--private"
-                echo -e "${BLUE}Creating private GitHub repository...${NC}"
-            fi
+# Create .pypirc file if requested
+if [ "$CREATE_PYPIRC" = true ]; then
+    run_step pypirc create_pypirc_file "$(pwd)" || true
+fi
 
-            # Create the repository
-            gh repo create "$PROJECT_NAME" $REPO_VISIBILITY --source=. --remote=origin
-            git push -u origin main || git push -u origin master
+if [ "$INSTALL_DEPS" = true ]; then
+    wait_step install || echo -e "${RED}Warning: Poetry install failed${NC}"
+fi
 
-            echo -e "${GREEN}GitHub repository created: https://github.com/$FULL_REPO_NAME${NC}"
+if [ "$INIT_GIT" = true ]; then
+    COMMITTED=false
+    if git add . && run_step commit git commit -m "Initial commit"; then
+        COMMITTED=true
+    else
+        echo -e "${RED}Warning: Initial commit failed${NC}"
+    fi
 
-            # Create secrets if requested
-            if [ "$CREATE_SECRETS" = true ]; then
-                create_github_secrets "$FULL_REPO_NAME"
+    if [ "$GITHUB_STARTED" = true ]; then
+        if wait_step github; then
+            if [ "$COMMITTED" = true ]; then
+                run_step push git push -u origin HEAD
+            else
+                skip_step push
+                echo -e "${YELLOW}Skipping the push because the initial commit failed${NC}"
             fi
+            echo -e "${GREEN}GitHub repository created: https://github.com/$FULL_REPO_NAME${NC}"
         else
-            echo -e "${RED}GitHub repository creation failed due to CLI issues.${NC}"
+            echo -e "${RED}GitHub repository creation failed.${NC}"
         fi
-    elif [ "$CREATE_SECRETS" = true ]; then
-        echo -e "${YELLOW}Warning: --secrets requires --github flag${NC}"
     fi
 fi
 
+print_step_summary
+
 echo -e "${GREEN}Project '$PROJECT_NAME' has been successfully created!${NC}"
 echo -e "To start working on your project:"
 echo -e "  cd $PROJECT_NAME"
@@ -90,6 +90,12 @@ function lock {
     poetry lock
 }
 
+# Prebuild the lock files the template ships for each python_version
+function locks {
+    echo "Building the template lock files..."
+    poetry run python scripts/build_locks.py "$@"
+}
+
 # Create a new Jupyter kernel for the current project
 function kernel {
     echo "Installing Jupyter kernel..."
@@ -544,6 +550,7 @@ function help {
     echo "  update               - Update dependencies"
     echo "  venv                 - Create and activate virtual environment"
     echo "  lock                 - Lock dependencies"
+    echo "  locks                - Prebuild the template lock files"
     echo "  kernel               - Create Jupyter kernel"
     echo "  remove:kernel        - Remove Jupyter kernel"
     echo "  requirements         - Export requirements.txt files"
@@ -0,0 +1,174 @@
+"""
+Prebuild the lock files shipped with the template.
+
+The dependencies of a generated project only depend on its ``python_version``, ``project_profile`` and
+``compiled_extension``. A project is baked for every combination and locked with Poetry. Its lock file is
+stored in ``{{cookiecutter.project_name}}/.locks/`` under the fingerprint of the rendered dependency
+tables, and the post-generation hook copies the matching one to ``poetry.lock`` so that installs skip
+dependency resolution. Lock files of combinations that are no longer rendered are removed.
+
+Existing lock files are reused as the starting point, so only changed dependencies are resolved again;
+``--upgrade`` resolves everything to the latest allowed versions. With ``--wheels DIR`` the locked wheels
+are downloaded into DIR, which ``run.sh install:offline`` of the generated projects installs from.
+
+Usage:
+    python scripts/build_locks.py [--python VERSION ...] [--upgrade] [--wheels DIR] [--jobs N]
+"""
+
+import argparse
+import importlib.util
+import itertools
+import json
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from cookiecutter.main import cookiecutter
+
+
+ROOT = Path(__file__).resolve().parents[1]
+TEMPLATE_DIR = ROOT / "{{cookiecutter.project_name}}"
+PYTHON_VERSIONS = ["^3.10", "^3.11", "^3.12", "^3.13"]
+# Options that change the rendered dependencies
+DEPENDENCY_OPTIONS = ["project_profile", "compiled_extension"]
+
+
+def load_hook() -> Any:
+    """Import the post-generation hook, the single definition of the lock file fingerprint."""
+    spec = importlib.util.spec_from_file_location("post_gen_project", ROOT / "hooks" / "post_gen_project.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def variants(python_versions: List[str]) -> List[Dict[str, str]]:
+    """Return the cookiecutter context of every combination of Python version and dependency option."""
+    with open(ROOT / "cookiecutter.json") as f:
+        options = json.load(f)
+    choices = [options[option] for option in DEPENDENCY_OPTIONS]
+    return [
+        {"python_version": python_version, **dict(zip(DEPENDENCY_OPTIONS, values))}
+        for python_version in python_versions
+        for values in itertools.product(*choices)
+    ]
+
+
+def minor_version(python_version: str) -> str:
+    """Return the lowest Python version allowed by a constraint, e.g. 3.11 for ^3.11."""
+    return python_version.lstrip("^~>=<!").split(",")[0].split()[0]
+
+
+def lock_command(poetry_version: str) -> List[str]:
+    """Return the command locking a project without updating the locked versions, from ``poetry --version``."""
+    version = re.search(r"(\d+)\.\d+", poetry_version)
+    # Poetry 1.x updates every dependency on lock unless told not to, 2.x keeps them by default
+    if version and int(version.group(1)) < 2:
+        return ["poetry", "lock", "--no-update"]
+    return ["poetry", "lock"]
+
+
+def lock(project: Path, command: List[str], upgrade: bool, wheels: Optional[Path], python_version: str) -> None:
+    if upgrade:
+        (project / "poetry.lock").unlink(missing_ok=True)
+    subprocess.run(command, cwd=project, check=True, capture_output=True, text=True)
+    if wheels is None:
+        return
+    subprocess.run([sys.executable, "scripts/export_requirements.py"], cwd=project, check=True, capture_output=True)
+    subprocess.run(
+        [
+            *(sys.executable, "-m", "pip", "download", "--quiet", "--only-binary=:all:"),
+            *("--python-version", minor_version(python_version), "--dest", str(wheels)),
+            *("-r", "requirements-dev.txt"),
+        ],
+        cwd=project,
+        check=True,
+    )
+
+
+def bake_variants(python_versions: List[str], output_dir: Path) -> List[Tuple[Path, Dict[str, str]]]:
+    """Bake every variant into its own directory and return the projects with their contexts."""
+    projects = []
+    for index, context in enumerate(variants(python_versions)):
+        project = cookiecutter(str(ROOT), no_input=True, output_dir=output_dir / str(index), extra_context=context)
+        projects.append((Path(project), context))
+        print(f"Baked {', '.join(context.values())}")
+    return projects
+
+
+def lock_variants(
+    projects: List[Tuple[Path, Dict[str, str]]], command: List[str], upgrade: bool, wheels: Optional[Path], jobs: int
+) -> None:
+    """Lock the baked projects concurrently, exiting on the first variant that fails to lock."""
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(lock, project, command, upgrade, wheels, context["python_version"])
+            for project, context in projects
+        ]
+        for future, (_, context) in zip(futures, projects):
+            try:
+                future.result()
+            except subprocess.CalledProcessError as e:
+                sys.exit(f"Locking {', '.join(context.values())} failed:\n{e.stderr}")
+
+
+def build_locks(
+    python_versions: List[str], upgrade: bool = False, wheels: Optional[Path] = None, jobs: int = 4
+) -> List[Path]:
+    """Lock every variant and return the lock files written to the template."""
+    hook = load_hook()
+    locks_dir = TEMPLATE_DIR / hook.LOCKS_DIR
+    version = subprocess.run(["poetry", "--version"], check=True, capture_output=True, text=True).stdout
+    command = lock_command(version)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Baking changes the working directory, so only the locking runs concurrently
+        projects = bake_variants(python_versions, Path(tmp))
+        lock_variants(projects, command, upgrade, wheels, jobs)
+
+        # Variants rendering the same dependencies share a lock file
+        locks_dir.mkdir(exist_ok=True)
+        written = set()
+        for project, _ in projects:
+            fingerprint = hook.dependency_fingerprint((project / "pyproject.toml").read_text())
+            target = locks_dir / f"{fingerprint}.lock"
+            shutil.copyfile(project / "poetry.lock", target)
+            written.add(target)
+
+    for stale in set(locks_dir.glob("*.lock")) - written:
+        stale.unlink()
+        print(f"Removed stale {stale.name}")
+    return sorted(written)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prebuild the lock files shipped with the template")
+    parser.add_argument(
+        "--python",
+        nargs="+",
+        default=PYTHON_VERSIONS,
+        help=f"python_version values to lock for (default: {' '.join(PYTHON_VERSIONS)})",
+    )
+    parser.add_argument("--upgrade", action="store_true", help="Resolve again instead of reusing the locked versions")
+    parser.add_argument("--wheels", type=Path, help="Download the locked wheels into this directory")
+    parser.add_argument("--jobs", type=int, default=4, help="Projects locked concurrently (default: 4)")
+    args = parser.parse_args()
+
+    if shutil.which("poetry") is None:
+        sys.exit("Poetry is required to build the lock files")
+    written = build_locks(args.python, args.upgrade, args.wheels, args.jobs)
+    print(f"Wrote {len(written)} lock files to {written[0].parent}" if written else "No lock files written")
+
+
+if __name__ == "__main__":
+    main()
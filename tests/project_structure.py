@@ -13,6 +13,10 @@ github_workflow_files = [
     ".github/workflows/update_rtd.yml",
 ]
 
+github_action_files = [
+    ".github/actions/setup/action.yml",
+]
+
 expected_files = (
     [
         "pyproject.toml",
@@ -25,6 +29,7 @@ expected_files = (
     ]
     + docs_files
     + github_workflow_files
+    + github_action_files
 )
 
 custom_context = {
@@ -0,0 +1,78 @@
+"""Test the cached, reproducible build of the generated project."""
+
+import hashlib
+import os
+import subprocess
+import sys
+import textwrap
+from typing import Dict
+
+from pytest_cookies.plugin import Result
+from tests.conftest import inside_dir
+
+
+# Writes archives with random timestamps, entry order and permissions, like a non reproducible build backend
+FAKE_BUILDER = """
+import io
+import random
+import tarfile
+import time
+import zipfile
+
+files = ["pkg/__init__.py", "pkg/core.py", "pkg-1.0.dist-info/RECORD"]
+random.shuffle(files)
+stamp = time.time() + random.randint(0, 10**6)
+with zipfile.ZipFile("dist/pkg-1.0-py3-none-any.whl", "w") as wheel:
+    for name in files:
+        wheel.writestr(zipfile.ZipInfo(name, time.localtime(stamp)[:6]), open("src/pkg/__init__.py").read())
+with tarfile.open("dist/pkg-1.0.tar.gz", "w:gz") as sdist:
+    for name in files:
+        info = tarfile.TarInfo(f"pkg-1.0/{name}")
+        info.mtime, info.mode, info.uname = stamp, random.choice([0o644, 0o664]), "builder"
+        info.size = 4
+        sdist.addfile(info, io.BytesIO(b"data"))
+"""
+
+
+def digests() -> Dict[str, str]:
+    result = {}
+    for name in os.listdir("dist"):
+        with open(os.path.join("dist", name), "rb") as f:
+            result[name] = hashlib.sha256(f.read()).hexdigest()
+    return result
+
+
+def test_build_cached(default_project: Result) -> None:
+    """Test that builds are byte-reproducible, cached by the sources and skipped when nothing changed."""
+    with inside_dir(default_project.project_path):
+        os.makedirs("src/pkg")
+        with open("src/pkg/__init__.py", "w") as f:
+            f.write("VALUE = 1\n")
+        with open("fake_build.py", "w") as f:
+            f.write(textwrap.dedent(FAKE_BUILDER))
+        command = [sys.executable, "scripts/build_cached.py", "--build-command", f"{sys.executable} fake_build.py"]
+        env = {**os.environ, "SOURCE_DATE_EPOCH": "1700000000"}
+
+        def build(*args: str) -> str:
+            return subprocess.run([*command, *args], capture_output=True, text=True, check=True, env=env).stdout
+
+        assert "Built pkg-1.0-py3-none-any.whl, pkg-1.0.tar.gz" in build()
+        first = digests()
+        assert "up to date" in build()
+        assert "Built" in build("--force")
+        assert digests() == first
+
+        with open("src/pkg/__init__.py", "w") as f:
+            f.write("VALUE = 2\n")
+        assert "Built" in build()
+        assert digests() != first
+
+        with open("src/pkg/__init__.py", "w") as f:
+            f.write("VALUE = 1\n")
+        assert "Restored" in build()
+        assert digests() == first
+
+        # The build script of the compiled extension is a build input
+        with open("build.py", "w") as f:
+            f.write("# build hook\n")
+        assert "Built" in build()
@@ -1,12 +1,23 @@
 """Test Poetry dependencies in the template."""
 
 import os
+import shutil
 import subprocess
+import sys
+import textwrap
+from pathlib import Path
+from typing import List
 
 import pytest
 
 import toml  # type: ignore[import-untyped]
+from cookiecutter.main import cookiecutter
 from pytest_cookies.plugin import Result
+from scripts.build_locks import (
+    ROOT,
+    load_hook,
+    lock_command,
+)
 
 # Import inside_dir from conftest
 from tests.conftest import inside_dir
@@ -57,3 +68,267 @@ def test_poetry_lock_generation(default_project: Result) -> None:
             assert os.path.exists("poetry.lock")
         except subprocess.CalledProcessError as e:
             pytest.fail(f"Failed to generate poetry.lock: {e.stderr}")
+
+
+SAMPLE_LOCK = """
+[[package]]
+name = "requests"
+version = "2.32.3"
+optional = false
+python-versions = ">=3.8"
+groups = ["main"]
+
+[package.dependencies]
+idna = ">=2.5,<4"
+PySocks = {version = ">=1.5.6,<1.5.7 || >1.5.7", optional = true}
+
+[package.extras]
+socks = ["PySocks (>=1.5.6,!=1.5.7)"]
+
+[[package]]
+name = "idna"
+version = "3.10"
+optional = false
+python-versions = ">=3.6"
+groups = ["main"]
+
+[[package]]
+name = "pysocks"
+version = "1.7.1"
+optional = true
+python-versions = "*"
+groups = ["main"]
+
+[[package]]
+name = "tomli"
+version = "2.2.1"
+optional = false
+python-versions = ">=3.8"
+groups = ["main"]
+markers = "python_version < \\"3.11\\""
+
+[[package]]
+name = "exceptiongroup"
+version = "1.2.2"
+optional = false
+python-versions = ">=3.7"
+groups = ["main"]
+
+[[package]]
+name = "pytest"
+version = "7.4.4"
+optional = false
+python-versions = ">=3.7"
+groups = ["test"]
+
+[package.dependencies]
+colorama = {version = "*", markers = "sys_platform == \\"win32\\""}
+iniconfig = "*"
+
+[[package]]
+name = "colorama"
+version = "0.4.6"
+optional = false
+python-versions = "*"
+groups = ["test"]
+markers = "sys_platform == \\"win32\\""
+
+[[package]]
+name = "iniconfig"
+version = "2.0.0"
+optional = false
+python-versions = ">=3.7"
+groups = ["test"]
+
+[metadata]
+lock-version = "2.1"
+python-versions = "^3.10"
+content-hash = "0000"
+"""
+
+
+# The python constraints of Poetry become python_version markers, combined with the explicit markers
+DEPENDENCIES = """\
+requests = "^2.32"
+tomli = {version = "^2", python = "<3.11"}
+exceptiongroup = [
+    {version = "^1.2", python = "<3.11"},
+    {version = "^1.2", python = ">=3.11,<3.13", markers = 'sys_platform == "win32"'},
+]
+"""
+
+
+def test_export_requirements(default_project: Result) -> None:
+    """Test that requirements are exported from poetry.lock and only rewritten when the lock changes."""
+    with inside_dir(default_project.project_path):
+        with open("pyproject.toml") as f:
+            pyproject = f.read()
+        with open("pyproject.toml", "w") as f:
+            f.write(pyproject.replace("[tool.poetry.dependencies]", "[tool.poetry.dependencies]\n" + DEPENDENCIES))
+        with open("poetry.lock", "w") as f:
+            f.write(textwrap.dedent(SAMPLE_LOCK))
+
+        command = [sys.executable, "scripts/export_requirements.py"]
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        assert "requirements.txt, requirements-dev.txt" in result.stdout
+        with open("requirements.txt") as f:
+            main = f.read().splitlines()
+        with open("requirements-dev.txt") as f:
+            dev = f.read().splitlines()
+        assert main[0].startswith("# Exported from poetry.lock sha256:")
+        assert main[1:] == [
+            'exceptiongroup==1.2.2 ; ((python_version >= "3.11" and python_version < "3.13")'
+            ' and (sys_platform == "win32")) or (python_version < "3.11")',
+            "idna==3.10",
+            "requests==2.32.3",
+            'tomli==2.2.1 ; python_version < "3.11"',
+        ]
+        assert dev[1:] == [
+            'colorama==0.4.6 ; sys_platform == "win32"',
+            *main[1:3],
+            "iniconfig==2.0.0",
+            "pytest==7.4.4",
+            *main[3:],
+        ]
+
+        mtime = os.path.getmtime("requirements.txt")
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        assert "up to date" in result.stdout
+        assert os.path.getmtime("requirements.txt") == mtime
+
+        with open("poetry.lock", "a") as f:
+            f.write("\n")
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        assert "Exported" in result.stdout
+
+
+SPLIT_LOCK = """
+[[package]]
+name = "numpy"
+version = "1.26.4"
+optional = false
+python-versions = ">=3.9"
+groups = ["main"]
+markers = "python_version < \\"3.10\\""
+
+[[package]]
+name = "numpy"
+version = "2.2.1"
+optional = false
+python-versions = ">=3.10"
+groups = ["main"]
+markers = "python_version >= \\"3.10\\""
+
+[[package]]
+name = "scipy"
+version = "1.13.1"
+optional = false
+python-versions = ">=3.9"
+groups = ["main"]
+
+[package.dependencies]
+numpy = [
+    {version = ">=1.22.4,<2.3", markers = "python_version < \\"3.10\\""},
+    {version = ">=1.23.5,<2.3", markers = "python_version >= \\"3.10\\""},
+]
+
+[metadata]
+lock-version = "2.1"
+python-versions = "^3.9"
+content-hash = "0000"
+"""
+
+
+def test_export_requirements_split_versions(default_project: Result) -> None:
+    """Test that a package locked in one version per Python version is pinned once per version."""
+    with inside_dir(default_project.project_path):
+        with open("pyproject.toml") as f:
+            pyproject = f.read()
+        with open("pyproject.toml", "w") as f:
+            f.write(pyproject.replace("[tool.poetry.dependencies]", '[tool.poetry.dependencies]\nscipy = "^1.13"'))
+        with open("poetry.lock", "w") as f:
+            f.write(textwrap.dedent(SPLIT_LOCK))
+
+        subprocess.run([sys.executable, "scripts/export_requirements.py"], capture_output=True, check=True)
+        with open("requirements.txt") as f:
+            assert f.read().splitlines()[1:] == [
+                'numpy==1.26.4 ; python_version < "3.10"',
+                'numpy==2.2.1 ; python_version >= "3.10"',
+                "scipy==1.13.1",
+            ]
+
+
+def test_prebuilt_lock(tmp_path: Path) -> None:
+    """Test that the prebuilt lock file matching the rendered dependencies becomes poetry.lock."""
+    template = tmp_path / "template"
+    shutil.copytree(ROOT / "hooks", template / "hooks")
+    shutil.copytree(ROOT / "{{cookiecutter.project_name}}", template / "{{cookiecutter.project_name}}")
+    shutil.copy(ROOT / "cookiecutter.json", template)
+    hook = load_hook()
+
+    numeric = Path(
+        cookiecutter(
+            str(template),
+            no_input=True,
+            output_dir=str(tmp_path / "first"),
+            extra_context={"project_profile": "numeric"},
+        )
+    )
+    fingerprint = hook.dependency_fingerprint((numeric / "pyproject.toml").read_text())
+    locks_dir = template / "{{cookiecutter.project_name}}" / hook.LOCKS_DIR
+    locks_dir.mkdir()
+    # Lock files are copied without rendering
+    (locks_dir / f"{fingerprint}.lock").write_text("# numeric {{ not rendered }}\n")
+    (locks_dir / "0000000000000000.lock").write_text("# other\n")
+
+    project = Path(
+        cookiecutter(
+            str(template),
+            no_input=True,
+            output_dir=str(tmp_path / "second"),
+            extra_context={"project_name": "other-name", "project_profile": "numeric"},
+        )
+    )
+    assert (project / "poetry.lock").read_text() == "# numeric {{ not rendered }}\n"
+    assert not (project / hook.LOCKS_DIR).exists()
+
+    library = Path(cookiecutter(str(template), no_input=True, output_dir=str(tmp_path / "third")))
+    assert not (library / "poetry.lock").exists()
+    assert not (library / hook.LOCKS_DIR).exists()
+    assert hook.dependency_fingerprint((library / "pyproject.toml").read_text()) != fingerprint
+
+
+@pytest.mark.parametrize(
+    "poetry_version,expected",
+    [
+        ("Poetry (version 1.8.3)", ["poetry", "lock", "--no-update"]),
+        ("Poetry (version 2.1.1)", ["poetry", "lock"]),
+    ],
+)
+def test_lock_keeps_locked_versions(poetry_version: str, expected: List[str]) -> None:
+    """Test that prebuilding the lock files does not update the versions already locked."""
+    assert lock_command(poetry_version) == expected
+
+
+def test_export_requirements_groups(default_project: Result) -> None:
+    """Test that --groups exports a single file with only the given groups."""
+    with inside_dir(default_project.project_path):
+        with open("poetry.lock", "w") as f:
+            f.write(textwrap.dedent(SAMPLE_LOCK))
+
+        command = [sys.executable, "scripts/export_requirements.py", "--groups", "main,test"]
+        subprocess.run(command, capture_output=True, text=True, check=True)
+        assert not os.path.exists("requirements.txt")
+        with open("requirements-main-test.txt") as f:
+            lines = f.read().splitlines()
+        assert lines[0].endswith("groups:main,test")
+        assert lines[1:] == ['colorama==0.4.6 ; sys_platform == "win32"', "iniconfig==2.0.0", "pytest==7.4.4"]
+
+        subprocess.run([*command, "--output", "test.txt"], capture_output=True, text=True, check=True)
+        result = subprocess.run([*command, "--output", "test.txt"], capture_output=True, text=True, check=True)
+        assert "up to date" in result.stdout
+
+        # A misspelled group fails instead of exporting the main dependencies only
+        result = subprocess.run([*command[:-1], "main,tests"], capture_output=True, text=True, check=False)
+        assert result.returncode == 1
+        assert "Unknown dependency groups in 'pyproject.toml': tests" in result.stderr
@@ -1,12 +1,23 @@
 """Test documentation generation in the project."""
 
+import json
 import os
 import subprocess
+import sys
+import zlib
+from pathlib import Path
+from typing import (
+    Dict,
+    List,
+)
 
 import pytest
 
 from pytest_cookies.plugin import Result
-from tests.conftest import inside_dir
+from tests.conftest import (
+    bake_in_temp_dir,
+    inside_dir,
+)
 
 
 def test_docs_generation(default_project: Result) -> None:
@@ -29,3 +40,164 @@ def test_docs_generation(default_project: Result) -> None:
             assert os.path.exists("docs/_build/html/index.html")
         except subprocess.CalledProcessError as e:
             pytest.fail(f"Documentation generation failed: {e.stderr}")
+
+
+def test_generate_readme(cookies: Result) -> None:
+    """Test that the README is assembled from the docs directory and only rewritten when it changes."""
+    with bake_in_temp_dir(cookies) as result:
+        with inside_dir(result.project_path):
+            with open("docs/home.md", "w") as f:
+                f.write("Hidden\n<!-- start -->\n# Home\n\nShown\n<!-- end -->\nHidden too\n")
+            with open("docs/tool.md", "w") as f:
+                f.write("## Tool\n")
+            script = (
+                "import sys; sys.path.insert(0, 'scripts'); import generate_readme as g; "
+                "g.ELEMENTS = [('home', '<!-- start -->', '<!-- end -->'), ('tool', '', '')]; g.main()"
+            )
+            command = [sys.executable, "-c", script]
+
+            first = subprocess.run(command, capture_output=True, text=True, check=True)
+            assert "Generated README.md" in first.stdout
+            with open("README.md") as f:
+                assert f.read() == "# Home\n\nShown\n## Tool\n"
+            modified = os.stat("README.md").st_mtime_ns
+
+            second = subprocess.run(command, capture_output=True, text=True, check=True)
+            assert "README.md is up to date" in second.stdout
+            assert os.stat("README.md").st_mtime_ns == modified
+            assert subprocess.run([*command, "--check"], check=False).returncode == 0
+
+            with open("docs/tool.md", "a") as f:
+                f.write("More\n")
+            assert subprocess.run([*command, "--check"], capture_output=True, check=False).returncode == 1
+
+
+def test_generate_readme_watch(cookies: Result) -> None:
+    """Test that watch mode rebuilds the README when one of the element files changes."""
+    with bake_in_temp_dir(cookies) as result:
+        with inside_dir(result.project_path):
+            for name in ("home", "tool"):
+                with open(f"docs/{name}.md", "w") as f:
+                    f.write(f"# {name}\n")
+            script = (
+                "import sys; sys.path.insert(0, 'scripts'); import generate_readme as g; "
+                "g.ELEMENTS = [('home', '', ''), ('tool', '', '')]; g.main()"
+            )
+            with subprocess.Popen(
+                [sys.executable, "-c", script, "--watch", "--interval", "0.05"], stdout=subprocess.PIPE, text=True
+            ) as watcher:
+                try:
+                    assert watcher.stdout is not None
+                    assert "Watching" in watcher.stdout.readline()
+                    assert "home, tool changed" in watcher.stdout.readline()
+                    with open("docs/tool.md", "w") as f:
+                        f.write("# tool, edited\n")
+                    assert "(tool changed)" in watcher.stdout.readline()
+                    with open("README.md") as f:
+                        assert f.read() == "# home\n\n# tool, edited\n"
+                finally:
+                    watcher.terminate()
+
+
+def write_build(pages: Dict[str, str], sitemap: List[str]) -> None:
+    """Write HTML pages and the sitemap sphinx_sitemap generates for the pages written by a build."""
+    os.makedirs("docs/_build/html", exist_ok=True)
+    for page, content in pages.items():
+        with open(f"docs/_build/html/{page}", "w") as f:
+            f.write(content)
+    urls = "".join(f"<url><loc>https://example.org/en/{page}</loc></url>" for page in sitemap)
+    with open("docs/_build/html/sitemap.xml", "w") as f:
+        f.write(f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>')
+
+
+def test_docs_deploy(cookies: Result) -> None:
+    """Test that unchanged sources keep their modification time and only changed pages are published."""
+    with bake_in_temp_dir(cookies) as result:
+        with inside_dir(result.project_path):
+            prepare = [sys.executable, "scripts/docs_deploy.py", "prepare"]
+            publish = [sys.executable, "scripts/docs_deploy.py", "publish", "--target", "site"]
+
+            subprocess.run(prepare, check=True)
+            first = os.stat("docs/index.md").st_mtime
+            with open("docs/guides/index.md", "a") as f:
+                f.write("More\n")
+            os.utime("docs/index.md")
+            output = subprocess.run(prepare, capture_output=True, text=True, check=True).stdout
+            unchanged, _, total = output.split()[:3]
+            assert int(unchanged) == int(total) - 1
+            assert os.stat("docs/index.md").st_mtime == first
+            assert os.stat("docs/guides/index.md").st_mtime > first
+
+            write_build({"index.html": "1", "about.html": "1", "old.html": "1"}, ["index.html", "about.html"])
+            output = subprocess.run(publish, capture_output=True, text=True, check=True).stdout
+            assert "Published 3 changed and removed 0 files" in output
+            published = os.stat("site/about.html").st_mtime_ns
+
+            # An incremental build only rewrites and lists the changed pages
+            os.remove("docs/_build/html/old.html")
+            write_build({"index.html": "2", "about.html": "1"}, ["index.html"])
+            output = subprocess.run(publish, capture_output=True, text=True, check=True).stdout
+            assert "Published 1 changed and removed 1 files" in output
+            assert sorted(os.listdir("site")) == ["about.html", "index.html", "sitemap.xml"]
+            assert os.stat("site/about.html").st_mtime_ns == published
+            with open("site/sitemap.xml") as f:
+                sitemap = f.read()
+            assert "https://example.org/en/about.html" in sitemap and "https://example.org/en/index.html" in sitemap
+
+
+def test_intersphinx_cache(cookies: Result, tmp_path: Path) -> None:
+    """Test that inventories are only downloaded when missing and the docs build reads the cached ones."""
+    inventory = b"# Sphinx inventory version 2\n# Project: Python\n# Version: 3.13\n" + zlib.compress(b"")
+    (tmp_path / "objects.inv").write_bytes(inventory)
+    with bake_in_temp_dir(cookies) as result:
+        with inside_dir(result.project_path):
+            conf = Path("docs/conf.py")
+            conf.write_text(conf.read_text().replace("https://docs.python.org/3", tmp_path.as_uri()))
+            command = [sys.executable, "scripts/intersphinx_cache.py"]
+
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            assert "Cached python: Python 3.13" in output
+            assert Path("docs/_intersphinx/python.inv").read_bytes() == inventory
+            manifest = json.loads(Path("docs/_intersphinx/inventories.json").read_text())
+            assert manifest["python"]["version"] == "3.13"
+
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            assert "Inventories up to date" in output
+            output = subprocess.run([*command, "--refresh"], capture_output=True, text=True, check=True).stdout
+            assert "Cached python" in output
+
+            mapping = subprocess.run(
+                [sys.executable, "-c", "import runpy; print(runpy.run_path('docs/conf.py')['intersphinx_mapping'])"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            assert str(Path("docs/_intersphinx/python.inv").resolve()) in mapping
+
+
+def test_docs_check(cookies: Result) -> None:
+    """Test that broken internal references are reported and unchanged files are not read again."""
+    with bake_in_temp_dir(cookies) as result:
+        with inside_dir(result.project_path):
+            command = [sys.executable, "scripts/docs_check.py"]
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            assert ": 0 problems" in output
+
+            with open("docs/guides/index.md", "a") as f:
+                f.write(
+                    "\n(guide)=\n## Links\n\n"
+                    "[Installation](../index.md#installation), {ref}`guide`, {doc}`../api/index`\n"
+                    "[Missing](missing.md), [Anchor](../index.md#nowhere), {ref}`nolabel`, {doc}`nothing`\n"
+                    "\n#### Too deep\n"
+                )
+            failed = subprocess.run(command, capture_output=True, text=True, check=False)
+            assert failed.returncode == 1
+            assert "(1 changed)" in failed.stdout
+            problems = {line.split(": ", 1)[1] for line in failed.stdout.splitlines()[:-1]}
+            assert problems == {
+                "broken link 'missing.md'",
+                "unknown anchor '#nowhere' in '../index.md#nowhere'",
+                "undefined label 'nolabel'",
+                "unknown document 'nothing'",
+                "heading level skips from h2 to h4",
+            }
@@ -1,12 +1,17 @@
 """Test GitHub integration features."""
 
 import os
+from typing import List
 
 import pytest
 
 import yaml  # type: ignore[import-untyped]
 from pytest_cookies.plugin import Result
-from tests.project_structure import github_workflow_files
+from tests.conftest import bake_in_temp_dir
+from tests.project_structure import (
+    github_action_files,
+    github_workflow_files,
+)
 
 
 def test_github_workflows(default_project: Result) -> None:
@@ -47,6 +52,47 @@ def test_github_variables_templating(default_project: Result) -> None:
         assert "{%" not in content, f"Unprocessed Jinja2 tags in {workflow_file}"
 
 
+def test_github_setup_action(default_project: Result) -> None:
+    """Test that the workflows set up Poetry and the dependencies with the shared cached action."""
+    for action_file in github_action_files:
+        with open(os.path.join(default_project.project_path, action_file)) as f:
+            content = f.read()
+        assert "{%" not in content and "{{ cookiecutter." not in content
+        assert yaml.safe_load(content)["runs"]["using"] == "composite"
+        assert "hashFiles('poetry.lock')" in content
+        # Poetry is installed where it is cached, whatever pipx paths the runner image sets
+        assert 'PIPX_HOME="$HOME/.poetry-pipx/home" PIPX_BIN_DIR="$HOME/.poetry-pipx/bin"' in content
+        assert "path: ~/.poetry-pipx\n" in content
+
+    for workflow_file in github_workflow_files:
+        with open(os.path.join(default_project.project_path, workflow_file)) as f:
+            content = f.read()
+        assert "install.python-poetry.org" not in content, f"Network Poetry installer in {workflow_file}"
+
+
+@pytest.mark.parametrize(
+    "python_version,expected",
+    [
+        ("^3.10", ["3.10", "3.11", "3.12", "3.13", "3.14"]),
+        ("3.11", ["3.11"]),
+        ("~3.12", ["3.12"]),
+        (">=3.10,<3.13", ["3.10", "3.11", "3.12"]),
+    ],
+)
+def test_github_tests_matrix(cookies: Result, python_version: str, expected: List[str]) -> None:
+    """Test that the checks run as parallel jobs and the tests are sharded across the allowed Python versions."""
+    with bake_in_temp_dir(cookies, extra_context={"python_version": python_version}) as result:
+        with open(os.path.join(result.project_path, ".github/workflows/tests.yml")) as f:
+            workflow = yaml.safe_load(f)
+
+    assert set(workflow["jobs"]) == {"format", "typing", "lint", "tests"}
+    matrix = workflow["jobs"]["tests"]["strategy"]["matrix"]
+    assert matrix["python-version"] == expected
+    assert matrix["shard"] == [1, 2]
+    for job in workflow["jobs"].values():
+        assert job["steps"][1]["uses"] == "./.github/actions/setup"
+
+
 def test_readthedocs_config(default_project: Result) -> None:
     """Test that ReadTheDocs config is valid."""
     rtd_config_path = os.path.join(default_project.project_path, ".readthedocs.yaml")
@@ -0,0 +1,113 @@
+"""Test the new-project.sh provisioning script."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).parents[1]
+
+# Stands in for poetry: records its calls and resolves by writing a lock file when there is none
+FAKE_POETRY = """#!/bin/bash
+echo "$*" >> "$POETRY_CALLS"
+case "$1" in
+    --version) echo "Poetry (version 1.8.0)" ;;
+    install) [ -f poetry.lock ] || echo "# resolved in $(basename "$PWD")" > poetry.lock ;;
+esac
+"""
+
+# Stands in for an authenticated gh: reports the user and succeeds without creating anything
+FAKE_GH = """#!/bin/bash
+[ "$1" = api ] && echo "tester"
+exit 0
+"""
+
+
+def run_new_project(tmp_path: Path, name: str, *args: str) -> subprocess.CompletedProcess:
+    env = {
+        **os.environ,
+        "PATH": f"{tmp_path / 'bin'}{os.pathsep}{Path(sys.executable).parent}{os.pathsep}{os.environ['PATH']}",
+        "HOME": str(tmp_path),
+        "XDG_CACHE_HOME": str(tmp_path / "cache"),
+        "POETRY_CALLS": str(tmp_path / "poetry_calls"),
+        "GIT_AUTHOR_NAME": "Test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+    }
+    return subprocess.run(
+        ["bash", str(ROOT / "new-project.sh"), name, f"--template={ROOT}", *args],
+        cwd=tmp_path / "work",
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_new_project_reuses_cached_lock(tmp_path: Path) -> None:
+    """Test that the lock file of a first project is reused by a project with the same dependencies."""
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "work").mkdir()
+    poetry = tmp_path / "bin" / "poetry"
+    poetry.write_text(FAKE_POETRY)
+    poetry.chmod(0o755)
+
+    first = run_new_project(tmp_path, "first-project")
+    assert first.returncode == 0, first.stdout + first.stderr
+    assert "Reusing cached lock file" not in first.stdout
+    locks = list((tmp_path / "cache" / "poetry-template" / "locks").glob("*.lock"))
+    assert len(locks) == 1
+
+    second = run_new_project(tmp_path, "second-project")
+    assert second.returncode == 0, second.stdout + second.stderr
+    assert "Reusing cached lock file" in second.stdout
+    second_dir = tmp_path / "work" / "second-project"
+    assert (second_dir / "poetry.lock").read_text() == "# resolved in first-project\n"
+
+    # The initial commit waits for the installation and includes the lock file
+    tracked = subprocess.run(
+        ["git", "ls-files", "poetry.lock"], cwd=second_dir, capture_output=True, text=True, check=True
+    )
+    assert tracked.stdout.strip() == "poetry.lock"
+
+    summary = second.stdout[second.stdout.index("Step timings:") :]
+    for step in ("render", "install", "git-init", "commit", "total"):
+        assert f"  {step} " in summary
+
+
+def test_new_project_without_lock_cache(tmp_path: Path) -> None:
+    """Test that --no-lock-cache resolves dependencies and leaves the cache untouched."""
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "work").mkdir()
+    poetry = tmp_path / "bin" / "poetry"
+    poetry.write_text(FAKE_POETRY)
+    poetry.chmod(0o755)
+
+    result = run_new_project(tmp_path, "uncached-project", "--no-lock-cache", "--no-git")
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert not (tmp_path / "cache" / "poetry-template").exists()
+    assert (tmp_path / "poetry_calls").read_text() == "install\n"
+    assert "git-init" not in result.stdout
+
+
+def test_new_project_skips_push_after_failed_commit(tmp_path: Path) -> None:
+    """Test that the repository is not pushed when the initial commit fails, and the summary shows it."""
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "work").mkdir()
+    for name, script in (("poetry", FAKE_POETRY), ("gh", FAKE_GH)):
+        (tmp_path / "bin" / name).write_text(script)
+        (tmp_path / "bin" / name).chmod(0o755)
+    hooks = tmp_path / "hooks"
+    hooks.mkdir()
+    (hooks / "pre-commit").write_text("#!/bin/sh\nexit 1\n")
+    (hooks / "pre-commit").chmod(0o755)
+    (tmp_path / ".gitconfig").write_text(f"[core]\n\thooksPath = {hooks}\n")
+
+    result = run_new_project(tmp_path, "unpushed-project", "--github", "--no-lock-cache")
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Skipping the push because the initial commit failed" in result.stdout
+    steps = [line.split() for line in result.stdout[result.stdout.index("Step timings:") :].splitlines()[1:]]
+    assert ["push", "skipped"] in steps
+    assert any(step[0] == "commit" and step[-1] == "(failed)" for step in steps)
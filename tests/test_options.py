@@ -0,0 +1,149 @@
+"""Test the optional parts of the template selected through cookiecutter options."""
+
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from pytest_cookies.plugin import Result
+from tests.conftest import (
+    bake_in_temp_dir,
+    inside_dir,
+)
+
+
+SPEEDUPS_FILES = [
+    "build.py",
+    "src/my_project/speedups.py",
+    "src/my_project/_speedups_py.py",
+    "src/my_project/_speedups.pyi",
+    "tests/test_speedups.py",
+]
+
+
+def run_project_tests(project: Result, *args: str) -> subprocess.CompletedProcess:
+    with inside_dir(project.project_path):
+        return subprocess.run(
+            [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", *args],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONPATH": "src"},
+            check=False,
+        )
+
+
+def test_compiled_extension_none(default_project: Result) -> None:
+    """Test that no extension files are generated by default."""
+    for path in SPEEDUPS_FILES + ["src/my_project/_speedups.c", "src/my_project/_speedups.pyx"]:
+        assert not os.path.exists(os.path.join(default_project.project_path, path)), path
+    with open(os.path.join(default_project.project_path, "pyproject.toml")) as f:
+        assert "[tool.poetry.build]" not in f.read()
+
+
+@pytest.mark.skipif(shutil.which("cc") is None, reason="needs a C compiler")
+def test_compiled_extension_c(cookies: Result) -> None:
+    """Test that the C extension builds and both implementations pass the same tests."""
+    with bake_in_temp_dir(cookies, extra_context={"compiled_extension": "c"}) as result:
+        for path in SPEEDUPS_FILES + ["src/my_project/_speedups.c"]:
+            assert os.path.exists(os.path.join(result.project_path, path)), path
+        assert not os.path.exists(os.path.join(result.project_path, "src/my_project/_speedups.pyx"))
+
+        fallback = run_project_tests(result, "tests/test_speedups.py", "-rs")
+        assert fallback.returncode == 0, fallback.stdout
+        assert "extension not built" in fallback.stdout
+
+        with inside_dir(result.project_path):
+            env = {**os.environ, "REQUIRE_SPEEDUPS": "1"}
+            subprocess.run([sys.executable, "build.py"], capture_output=True, check=True, env=env)
+        compiled = run_project_tests(result, "tests/test_speedups.py", "-v")
+        assert compiled.returncode == 0, compiled.stdout
+        assert "test_fnv1a_64_batch[compiled] PASSED" in compiled.stdout
+        assert "SKIPPED" not in compiled.stdout
+
+
+def test_compiled_extension_cython(cookies: Result) -> None:
+    """Test that the Cython track generates its sources and build requirements."""
+    with bake_in_temp_dir(cookies, extra_context={"compiled_extension": "cython"}) as result:
+        for path in SPEEDUPS_FILES + ["src/my_project/_speedups.pyx"]:
+            assert os.path.exists(os.path.join(result.project_path, path)), path
+        assert not os.path.exists(os.path.join(result.project_path, "src/my_project/_speedups.c"))
+        with open(os.path.join(result.project_path, "pyproject.toml")) as f:
+            pyproject = f.read()
+        assert '"cython>=3.0"' in pyproject
+        assert 'script = "build.py"' in pyproject
+
+        pytest.importorskip("Cython")
+        with inside_dir(result.project_path):
+            env = {**os.environ, "REQUIRE_SPEEDUPS": "1"}
+            subprocess.run([sys.executable, "build.py"], capture_output=True, check=True, env=env)
+        compiled = run_project_tests(result, "tests/test_speedups.py", "-v")
+        assert compiled.returncode == 0, compiled.stdout
+        assert "SKIPPED" not in compiled.stdout
+
+
+def test_library_profile(default_project: Result) -> None:
+    """Test that the default library profile has no numeric core and no NumPy dependency."""
+    assert not os.path.exists(os.path.join(default_project.project_path, "src/my_project/numeric"))
+    assert not os.path.exists(os.path.join(default_project.project_path, "tests/test_numeric.py"))
+    with open(os.path.join(default_project.project_path, "pyproject.toml")) as f:
+        assert "numpy" not in f.read().split("[tool.isort]")[0]
+
+
+def test_numeric_profile(cookies: Result) -> None:
+    """Test that the numeric profile passes its tests and its benchmarks only run on request."""
+    with bake_in_temp_dir(cookies, extra_context={"project_profile": "numeric"}) as result:
+        with open(os.path.join(result.project_path, "pyproject.toml")) as f:
+            pyproject = f.read()
+        assert 'numpy = ">=1.26"' in pyproject
+        assert 'accel = ["numba"]' in pyproject
+
+        pytest.importorskip("numpy")
+        tests = run_project_tests(result, "tests/test_numeric.py")
+        assert tests.returncode == 0, tests.stdout
+        assert "3 skipped" in tests.stdout
+
+        benchmarks = run_project_tests(result, "tests/test_numeric.py", "-m", "benchmark", "--benchmarks")
+        assert benchmarks.returncode == 0, benchmarks.stdout
+        assert "benchmarks: best time per call" in benchmarks.stdout
+        assert "vectorized" in benchmarks.stdout
+
+
+def test_async_service_profile(cookies: Result) -> None:
+    """Test that the async-service profile ships the service package and its tests pass."""
+    with bake_in_temp_dir(cookies, extra_context={"project_profile": "async-service"}) as result:
+        assert os.path.isfile(os.path.join(result.project_path, "src/my_project/service/pool.py"))
+        assert not os.path.exists(os.path.join(result.project_path, "src/my_project/numeric"))
+
+        pytest.importorskip("pytest_asyncio")
+        tests = run_project_tests(result, "tests/test_service.py")
+        assert tests.returncode == 0, tests.stdout
+
+
+def test_caching_option(default_project: Result, cookies: Result) -> None:
+    """Test that the caching package is only generated on request and its tests pass."""
+    assert not os.path.exists(os.path.join(default_project.project_path, "src/my_project/caching"))
+    assert not os.path.exists(os.path.join(default_project.project_path, "tests/test_caching.py"))
+    with bake_in_temp_dir(cookies, extra_context={"include_caching": "yes"}) as result:
+        tests = run_project_tests(result, "tests/test_caching.py")
+        assert tests.returncode == 0, tests.stdout
+        benchmarks = run_project_tests(result, "tests/test_caching.py", "-m", "benchmark", "--benchmarks")
+        assert benchmarks.returncode == 0, benchmarks.stdout
+        assert "memoized" in benchmarks.stdout
+
+
+def test_parallel_option(default_project: Result, cookies: Result) -> None:
+    """Test that the process-pool module is only generated on request and its tests pass."""
+    assert not os.path.exists(os.path.join(default_project.project_path, "src/my_project/parallel.py"))
+    with bake_in_temp_dir(cookies, extra_context={"include_parallel": "yes"}) as result:
+        tests = run_project_tests(result, "tests/test_parallel.py")
+        assert tests.returncode == 0, tests.stdout
+
+
+def test_io_option(default_project: Result, cookies: Result) -> None:
+    """Test that the file I/O module is only generated on request and its tests pass."""
+    assert not os.path.exists(os.path.join(default_project.project_path, "src/my_project/fileio.py"))
+    with bake_in_temp_dir(cookies, extra_context={"include_io": "yes"}) as result:
+        tests = run_project_tests(result, "tests/test_fileio.py")
+        assert tests.returncode == 0, tests.stdout
@@ -0,0 +1,92 @@
+"""Test the profiling tools shipped with the generated project."""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+from pytest_cookies.plugin import Result
+from tests.conftest import inside_dir
+
+
+def test_profile_cpu_script(default_project: Result) -> None:
+    """Test that profiling a script writes collapsed stacks, a flamegraph and compares with the last run."""
+    with inside_dir(default_project.project_path):
+        with open("busy.py", "w") as f:
+            f.write(
+                textwrap.dedent(
+                    """
+                    def spin() -> int:
+                        return sum(i * i for i in range(3_000_000))
+
+
+                    if __name__ == "__main__":
+                        spin()
+                    """
+                )
+            )
+        command = [sys.executable, "scripts/profile_cpu.py", "--interval", "0.001", "run", "busy.py"]
+        subprocess.run(command, capture_output=True, text=True, check=True)
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+
+        assert "Hottest frames" in result.stdout
+        assert "busy.py" in result.stdout
+        for name in ("latest.collapsed", "latest.html", "previous.collapsed", "previous.html"):
+            assert os.path.exists(os.path.join(".perf", "cpu", name)), f"Missing profile output: {name}"
+        with open(".perf/cpu/latest.collapsed") as f:
+            stacks = f.read()
+        assert "spin (busy.py:2)" in stacks
+        assert "runpy" not in stacks
+        with open(".perf/cpu/latest.html") as f:
+            assert "spin (busy.py:2)" in f.read()
+
+
+def test_profile_cpu_tests(default_project: Result) -> None:
+    """Test that a pytest node can be profiled."""
+    with inside_dir(default_project.project_path):
+        with open("tests/test_busy.py", "w") as f:
+            f.write("def test_busy() -> None:\n    assert sum(i * i for i in range(3_000_000))\n")
+        result = subprocess.run(
+            [sys.executable, "scripts/profile_cpu.py", "--interval", "0.001", "test", "tests/test_busy.py::test_busy"],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONPATH": "src"},
+            check=False,
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+        with open(".perf/cpu/latest.collapsed") as f:
+            assert "test_busy (tests/test_busy.py:1)" in f.read()
+
+
+def test_instrumentation_from_dotenv(default_project: Result) -> None:
+    """Test that .env enables the instrumentation, metrics are flushed at exit and can be summarized."""
+    env = {key: value for key, value in os.environ.items() if not key.startswith("MY_PROJECT_INSTRUMENT")}
+    env["PYTHONPATH"] = "src"
+    with inside_dir(default_project.project_path):
+        with open(".env", "w") as f:
+            f.write("# Instrumentation\nMY_PROJECT_INSTRUMENT=1\nMY_PROJECT_INSTRUMENT_FILE=.perf/metrics.jsonl\n")
+        script = textwrap.dedent(
+            """
+            from my_project.instrumentation import counter, timed
+
+
+            @timed("square")
+            def square(value: int) -> int:
+                return value * value
+
+
+            for value in range(100):
+                square(value)
+            counter("done").add()
+            """
+        )
+        subprocess.run([sys.executable, "-c", script], env=env, check=True)
+        summary = subprocess.run(
+            [sys.executable, "-m", "my_project.instrumentation", ".perf/metrics.jsonl"],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+    assert "square" in summary.stdout
+    assert "done" in summary.stdout
@@ -0,0 +1,188 @@
+"""Test the pytest plugins shipped with the generated project."""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from pytest_cookies.plugin import Result
+from tests.conftest import inside_dir
+
+
+def run_generated_tests(project: Result, test_code: str, *args: str) -> subprocess.CompletedProcess:
+    """Write a test module into the generated project and run pytest on it."""
+    with inside_dir(project.project_path):
+        with open("tests/test_generated_plugin.py", "w") as f:
+            f.write(textwrap.dedent(test_code))
+        return subprocess.run(
+            [sys.executable, "-m", "pytest", "tests/test_generated_plugin.py", "-p", "no:cacheprovider", *args],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONPATH": "src"},
+            check=False,
+        )
+
+
+def test_time_budget_marker(default_project: Result) -> None:
+    """Test that tests exceeding their time budget fail and durations are recorded."""
+    result = run_generated_tests(
+        default_project,
+        """
+        import time
+
+        import pytest
+
+
+        @pytest.mark.time_budget(0.01)
+        def test_too_slow() -> None:
+            time.sleep(0.05)
+
+
+        @pytest.mark.time_budget(seconds=5)
+        def test_within_budget() -> None:
+            pass
+        """,
+    )
+    assert result.returncode == 1, result.stdout
+    assert "1 failed, 1 passed" in result.stdout
+    assert "Time budget exceeded" in result.stdout
+    assert "slowest 2 tests" in result.stdout
+
+    history = os.path.join(default_project.project_path, ".perf", "timings.jsonl")
+    with open(history) as f:
+        records = [json.loads(line) for line in f]
+    assert {record["nodeid"].split("::")[-1] for record in records} == {"test_too_slow", "test_within_budget"}
+    assert all(record["commit"] for record in records)
+
+
+def test_timings_report(default_project: Result) -> None:
+    """Test that the timings history can be reported without running the tests."""
+    run_generated_tests(default_project, "def test_one() -> None:\n    pass\n")
+    run_generated_tests(default_project, "def test_one() -> None:\n    pass\n", "--no-timings")
+
+    with inside_dir(default_project.project_path):
+        with open(".perf/timings.jsonl") as f:
+            assert len(f.readlines()) == 1
+        report = subprocess.run(
+            [sys.executable, "-m", "tests.plugins.timing"], capture_output=True, text=True, check=True
+        )
+    assert "test_one" in report.stdout
+
+
+def test_asyncio_blocking_detection(default_project: Result) -> None:
+    """Test that synchronous calls blocking the event loop fail async tests."""
+    pytest.importorskip("pytest_asyncio")
+    result = run_generated_tests(
+        default_project,
+        """
+        import asyncio
+        import time
+
+        import pytest
+
+
+        @pytest.mark.asyncio
+        async def test_blocks_loop() -> None:
+            time.sleep(0.3)
+
+
+        @pytest.mark.asyncio
+        @pytest.mark.allow_blocking
+        async def test_blocking_allowed(blocking_calls) -> None:
+            time.sleep(0.3)
+            await asyncio.sleep(0)
+            assert len(blocking_calls) == 1
+
+
+        @pytest.mark.asyncio
+        async def test_latency_and_throughput(loop_latency, task_throughput) -> None:
+            async with loop_latency as probe:
+                result = await task_throughput(lambda: asyncio.sleep(0.001), 50, concurrency=10)
+            assert probe.samples
+            assert result.tasks == 50 and result.per_second > 0
+        """,
+        "--blocking-threshold=0.2",
+    )
+    assert "1 failed, 2 passed" in result.stdout, result.stdout
+    assert "Blocking calls detected on the event loop" in result.stdout
+
+
+def test_asyncio_loop_policy_comparison(default_project: Result) -> None:
+    """Test that async tests run once per selected event loop policy."""
+    pytest.importorskip("pytest_asyncio")
+    pytest.importorskip("uvloop")
+    result = run_generated_tests(
+        default_project,
+        """
+        import pytest
+
+
+        @pytest.mark.asyncio
+        async def test_policy(loop_policy_name) -> None:
+            assert loop_policy_name in ("default", "uvloop")
+
+
+        def test_sync() -> None:
+            pass
+        """,
+        "--event-loop-policy=default,uvloop",
+        "-v",
+    )
+    assert result.returncode == 0, result.stdout
+    assert "test_policy[default] PASSED" in result.stdout
+    assert "test_policy[uvloop] PASSED" in result.stdout
+    assert "test_sync PASSED" in result.stdout
+
+
+def test_memory_profile_baseline(default_project: Result, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that memory results are recorded and peaks above the baseline fail."""
+    test_code = """
+        import os
+
+
+        def test_allocates() -> None:
+            data = bytearray(int(os.environ["ALLOCATE"]))
+            assert data
+
+
+        def test_fixture(memory_usage) -> None:
+            data = bytearray(1_000_000)
+            assert memory_usage.peak >= 1_000_000
+            assert "test_generated_plugin.py" in memory_usage.top(1)[0]
+        """
+    monkeypatch.setenv("ALLOCATE", "500000")
+    result = run_generated_tests(default_project, test_code, "--memprofile", "--memprofile-save-baseline")
+    assert result.returncode == 0, result.stdout
+    assert "memory: top 2 tests by peak allocation" in result.stdout
+
+    monkeypatch.setenv("ALLOCATE", "2000000")
+    result = run_generated_tests(default_project, test_code, "--memprofile")
+    assert "1 failed, 1 passed" in result.stdout, result.stdout
+    assert "Memory regression" in result.stdout
+
+    with open(os.path.join(default_project.project_path, ".perf", "memory", "latest.json")) as f:
+        results = json.load(f)
+    assert results["tests/test_generated_plugin.py::test_allocates"]["peak"] >= 2_000_000
+
+
+def test_sharding(default_project: Result) -> None:
+    """Test that shards run disjoint parts of the tests which together cover all of them."""
+    test_code = "".join(f"def test_{index}() -> None:\n    pass\n\n\n" for index in range(5))
+    run_generated_tests(default_project, test_code)
+
+    # Every shard must read the same history, so the shard runs do not record their timings
+    for options in (["--no-timings"], ["--no-timings", "--shard-durations", ".perf/timings.jsonl"]):
+        shards = []
+        for shard in (1, 2):
+            result = run_generated_tests(default_project, test_code, f"--shard={shard}/2", "-v", *options)
+            assert result.returncode == 0, result.stdout
+            assert f"shard {shard}/2:" in result.stdout
+            shards.append({line.split("::")[1].split()[0] for line in result.stdout.splitlines() if " PASSED" in line})
+        assert shards[0].isdisjoint(shards[1])
+        assert shards[0] | shards[1] == {f"test_{index}" for index in range(5)}
+
+    result = run_generated_tests(default_project, test_code, "--shard=3/2")
+    assert "K must be between 1 and N" in result.stderr
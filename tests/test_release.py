@@ -0,0 +1,157 @@
+"""Test the release script of the project."""
+
+import json
+import os
+import subprocess
+import sys
+
+from pytest_cookies.plugin import Result
+from tests.conftest import (
+    bake_in_temp_dir,
+    inside_dir,
+)
+
+
+CHANGELOG = """\
+import sys
+sys.path.insert(0, "scripts")
+import release
+print(release.synthesize_changelog(release.read_commits(release.get_latest_release_tag())))
+"""
+
+# Runs the release script with the editor accepting every text as proposed
+RELEASE = """\
+import builtins
+import sys
+sys.path.insert(0, "scripts")
+import release
+release.open_in_editor = lambda context, text, extension: text
+builtins.input = lambda prompt: "y"
+sys.argv = ["release.py", *sys.argv[1:]]
+release.main()
+"""
+
+
+def git(*args: str) -> str:
+    return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout
+
+
+def init_repository() -> None:
+    """Commit the project to a new repository and tag it as the first release."""
+    git("init", "-q")
+    git("config", "user.name", "Test")
+    git("config", "user.email", "test@example.org")
+    git("add", ".")
+    git("commit", "-q", "-m", "Initial commit")
+    git("tag", "v0.0.0")
+
+
+def test_release_changelog(cookies: Result) -> None:
+    """Test that commits are grouped by conventional type and scope, and parsed commits are cached by SHA."""
+    with bake_in_temp_dir(cookies) as result:
+        with inside_dir(result.project_path):
+            init_repository()
+            messages = [
+                "fix(cli): handle empty input",
+                "feat(api): add the client",
+                "Update the readme",
+                "feat: add the command line",
+                "refactor(api)!: rename the client",
+                "fix(api): retry on timeouts\n\nThe request is retried.\n\nRefs: #12",
+                "perf(io): read in chunks\n\nBREAKING CHANGE: the reader returns bytes",
+            ]
+            for message in messages:
+                git("commit", "-q", "--allow-empty", "-m", message)
+            shas = git("rev-list", "--abbrev-commit", "v0.0.0..HEAD").split()
+
+            changelog = subprocess.run([sys.executable, "-c", CHANGELOG], capture_output=True, text=True, check=True)
+            assert changelog.stdout.strip().split("\n") == [
+                "#### Breaking Changes",
+                f"- **api**: rename the client ({shas[2]})",
+                f"- **io**: read in chunks ({shas[0]})",
+                "",
+                "#### Features",
+                f"- add the command line ({shas[3]})",
+                f"- **api**: add the client ({shas[5]})",
+                "",
+                "#### Bug Fixes",
+                f"- **api**: retry on timeouts ({shas[1]})",
+                f"- **cli**: handle empty input ({shas[6]})",
+                "",
+                "#### Other Changes",
+                f"- Update the readme ({shas[4]})",
+            ]
+            with open(".release_commits.json") as f:
+                cache = json.load(f)
+            assert len(cache) == len(messages)
+            assert cache[git("rev-parse", "HEAD~1").strip()]["trailers"] == {"Refs": ["#12"]}
+
+            # Cached commits are not read again, so editing the cache shows in the changelog
+            cache[git("rev-parse", "HEAD").strip()]["change"]["description"] = "read from the cache"
+            with open(".release_commits.json", "w") as f:
+                json.dump(cache, f)
+            changelog = subprocess.run([sys.executable, "-c", CHANGELOG], capture_output=True, text=True, check=True)
+            assert f"- **io**: read from the cache ({shas[0]})" in changelog.stdout
+            assert ".release_commits.json" not in git("status", "--porcelain")
+
+
+def test_release_plan(cookies: Result) -> None:
+    """Test that planning a release shows its changes as a diff without writing files, commits or tags."""
+    with bake_in_temp_dir(cookies) as result:
+        with inside_dir(result.project_path):
+            init_repository()
+            git("commit", "-q", "--allow-empty", "-m", "feat(api): add the client")
+            head = git("rev-parse", "HEAD")
+
+            plan = [sys.executable, "scripts/release.py", "plan", "minor", "--pre", "rc"]
+            output = subprocess.run(plan, capture_output=True, text=True, check=True).stdout
+            assert '-version = "0.0.0"\n+version = "0.1.0rc1"' in output
+            assert '+__version__ = "0.1.0rc1"' in output
+            assert "--- /dev/null\n+++ b/CHANGELOG.md" in output
+            assert "+#### Features\n+- **api**: add the client" in output
+            assert output.endswith("Release 0.1.0rc1 would be committed and tagged as v0.1.0rc1\n")
+
+            assert git("status", "--porcelain") == ""
+            assert not os.path.exists(".release_commits.json")
+            assert git("rev-parse", "HEAD") == head
+            assert git("tag").split() == ["v0.0.0"]
+
+
+def test_release_rollback(cookies: Result) -> None:
+    """Test that rollback deletes the recorded tag and commit, unless they moved or the release has local changes."""
+    with bake_in_temp_dir(cookies) as result:
+        with inside_dir(result.project_path):
+            init_repository()
+            git("commit", "-q", "--allow-empty", "-m", "fix: handle empty input")
+            before = git("rev-parse", "HEAD")
+            release = [sys.executable, "-c", RELEASE]
+
+            subprocess.run([*release, "create", "micro"], capture_output=True, check=True)
+            assert git("tag").split() == ["v0.0.0", "v0.0.1"]
+            released = git("rev-parse", "HEAD")
+
+            # Local changes to a file of the release are kept, and so are the release commit and tag
+            with open("CHANGELOG.md", "a") as f:
+                f.write("Reviewed\n")
+            rollback = subprocess.run([*release, "rollback"], capture_output=True, text=True, check=False)
+            assert rollback.returncode == 1 and "Rollback failed" in rollback.stdout
+            assert git("rev-parse", "HEAD") == released
+            assert git("tag").split() == ["v0.0.0", "v0.0.1"]
+            assert git("status", "--porcelain", "--untracked-files=no") == " M CHANGELOG.md\n"
+
+            git("checkout", "CHANGELOG.md")
+            output = subprocess.run([*release, "rollback"], capture_output=True, text=True, check=True).stdout
+            assert "Successfully rolled back to 0.0.0" in output
+            assert git("rev-parse", "HEAD") == before
+            assert git("tag").split() == ["v0.0.0"]
+            assert git("status", "--porcelain", "--untracked-files=no") == ""
+            assert not os.path.exists("CHANGELOG.md")
+
+            # An amended release commit is not the recorded one, so neither the commit nor the tag is undone
+            subprocess.run([*release, "create", "micro"], capture_output=True, check=True)
+            git("commit", "-q", "--amend", "-m", "release 0.0.1")
+            amended = git("rev-parse", "HEAD")
+            rollback = subprocess.run([*release, "rollback"], capture_output=True, text=True, check=False)
+            assert rollback.returncode == 1 and "Rollback failed" in rollback.stdout
+            assert git("rev-parse", "HEAD") == amended
+            assert git("tag").split() == ["v0.0.0", "v0.0.1"]
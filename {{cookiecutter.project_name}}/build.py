@@ -0,0 +1,58 @@
+"""
+Build hook compiling the optional ``_speedups`` extension module.
+
+Poetry runs this script when it builds or installs the package; it can also be run directly with
+``./run.sh build:ext`` to compile the extension in place during development. When the extension cannot be
+compiled, e.g. because no C compiler is available, the build goes on without it and the package uses its
+pure-Python implementation. Set ``REQUIRE_SPEEDUPS=1`` to make such a failure fatal instead.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import List
+
+from setuptools import (
+    Distribution,
+    Extension,
+)
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import (
+    CCompilerError,
+    ExecError,
+    PlatformError,
+)
+
+
+COMPILED_EXTENSION = "{{ cookiecutter.compiled_extension }}"
+PACKAGE_DIR = Path("src") / "{{ cookiecutter.package_name }}"
+SOURCE = PACKAGE_DIR / ("_speedups.pyx" if COMPILED_EXTENSION == "cython" else "_speedups.c")
+COMPILE_ARGS = ["/O2"] if os.name == "nt" else ["-O3"]
+
+
+def extensions() -> List[Extension]:
+    extension = Extension("{{ cookiecutter.package_name }}._speedups", [str(SOURCE)], extra_compile_args=COMPILE_ARGS)
+    if COMPILED_EXTENSION == "cython":
+        from Cython.Build import cythonize
+
+        return cythonize([extension], language_level=3)
+    return [extension]
+
+
+def build() -> None:
+    """Compile the extension into ``build/lib.*``, where Poetry picks it up, and copy it next to its sources."""
+    command = build_ext(Distribution({"name": "{{ cookiecutter.project_name }}", "ext_modules": extensions()}))
+    command.ensure_finalized()
+    try:
+        command.run()
+    except (CCompilerError, ExecError, PlatformError) as e:
+        if os.environ.get("REQUIRE_SPEEDUPS"):
+            raise
+        print(f"Could not build the _speedups extension ({e}), the pure-Python implementation will be used.")
+        return
+    for output in command.get_outputs():
+        shutil.copyfile(output, Path("src") / Path(output).relative_to(command.build_lib))
+
+
+if __name__ == "__main__":
+    build()
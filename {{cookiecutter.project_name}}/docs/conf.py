@@ -68,9 +68,14 @@ autodoc_default_options = {
     "show-inheritance": True,
 }
 
-# Intersphinx configuration for external documentation
+# Intersphinx configuration for external documentation. Inventories cached in _intersphinx/ by
+# `./run.sh docs:cache` are read instead of fetched, so builds are fast and work without network access
+INTERSPHINX_CACHE = docs_dir.resolve() / "_intersphinx"
 intersphinx_mapping = {
-    "python": ("https://docs.python.org/3", None),
+    name: (url, str(INTERSPHINX_CACHE / f"{name}.inv") if (INTERSPHINX_CACHE / f"{name}.inv").is_file() else None)
+    for name, url in {
+        "python": "https://docs.python.org/3",
+    }.items()
 }
 
 intersphinx_disabled_domains = []  # type: ignore
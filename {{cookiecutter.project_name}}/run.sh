@@ -25,6 +25,15 @@ function install:all {
     poetry install --with dev,test,lint,typing,docs --no-interaction
 }
 
+# Install all dependencies from poetry.lock and a local wheel cache, without network access
+function install:offline {
+    local wheelhouse="${WHEELHOUSE:-$HOME/.cache/poetry-template/wheels}"
+    echo "Installing all dependencies from $wheelhouse..."
+    python scripts/export_requirements.py
+    poetry run pip install --no-index --find-links "$wheelhouse" -r requirements-dev.txt
+    poetry install --only-root
+}
+
 # Install specific dependency groups
 function install:test {
     echo "Installing test dependencies..."
@@ -84,6 +93,46 @@ function venv {
     SHELL=/bin/zsh exec poetry shell
 }
 
+# Helper function to get the current time in milliseconds, EPOCHREALTIME needs bash 5
+function get:time:ms {
+    if [ -n "$EPOCHREALTIME" ]; then
+        local now="${EPOCHREALTIME/[.,]/}"
+        echo $((now / 1000))
+    else
+        python -c 'import time; print(int(time.time() * 1000))'
+    fi
+}
+
+# Create .venv with uv from poetry.lock: packages are hardlinked from uv's shared cache and the locked
+# requirements of all groups are installed in one concurrent pass, without resolving them again
+function venv:fast {
+    if ! command -v uv >/dev/null 2>&1; then
+        echo "uv not found, install it with: pipx install uv"
+        return 1
+    fi
+    local groups="${1:-main,dev,test,lint,typing,docs}"
+    export UV_LINK_MODE="${UV_LINK_MODE:-hardlink}"
+    echo "Bootstrapping .venv with groups $groups..."
+
+    local timings="" phase start
+    for phase in lock venv export install project; do
+        start=$(get:time:ms)
+        case "$phase" in
+            # Only resolves when the project has no lock file yet
+            lock) [ -f poetry.lock ] || poetry lock ;;
+            venv) uv venv --allow-existing --python "${UV_PYTHON:-{{ cookiecutter.python_version.lstrip('^~>=<!').split(',')[0].split()[0] }}}" .venv ;;
+            export) python scripts/export_requirements.py --groups "$groups" --output .venv/requirements.txt ;;
+            # sync also removes the packages that are no longer locked
+            install) uv pip sync --python .venv/bin/python .venv/requirements.txt ;;
+            project) uv pip install --python .venv/bin/python --no-deps --editable . ;;
+        esac
+        timings+="$(printf "  %-8s %7d ms" "$phase" $(($(get:time:ms) - start)))"$'\n'
+    done
+    echo "Phase timings:"
+    printf "%s" "$timings"
+    echo "Poetry uses .venv from now on, or activate it with: source .venv/bin/activate"
+}
+
 # Lock dependencies without installing them
 function lock {
     echo "Locking dependencies..."
@@ -110,13 +159,8 @@ function remove:kernel {
 # Export requirements.txt files
 function requirements {
     echo "Exporting requirements.txt..."
-    if ! poetry export --help >/dev/null 2>&1; then
-        echo "Installing poetry-plugin-export..."
-        poetry self add poetry-plugin-export
-    fi
-    poetry export -f requirements.txt --output requirements.txt --without-hashes
-    poetry export -f requirements.txt --with dev,test,lint,typing,docs --output requirements-dev.txt --without-hashes
-    echo "Requirements files created successfully"
+    # Reads poetry.lock directly and does nothing when the lock file has not changed since the last export
+    python scripts/export_requirements.py "$@"
 }
 
 ######################
@@ -292,6 +336,7 @@ function check:ci {
 function pre:commit {
     format:diff
     lint:diff
+    docs:check:fast
     tests
 }
 
@@ -315,6 +360,60 @@ function tests:cov {
     poetry run pytest "$TEST_FILE" --cov={{ cookiecutter.package_name }}  --cov-report=term "$@"
 }
 
+# Run the micro-benchmarks (tests marked with benchmark)
+function tests:bench {
+    echo "Running benchmarks..."
+    TEST_FILE="${1:-$(get:python:files:tests)}"
+    shift || true
+    poetry run pytest "$TEST_FILE" -m benchmark --benchmarks "$@"
+}
+
+# Run tests recording peak and retained memory of each test
+function profile:mem {
+    echo "Running tests with memory profiling..."
+    TEST_FILE="${1:-$(get:python:files:tests)}"
+    shift || true
+    poetry run pytest "$TEST_FILE" --memprofile "$@"
+    echo "Memory results written to .perf/memory/latest.json"
+}
+
+# Store the memory profile of the test suite as the baseline for future runs
+function profile:mem:baseline {
+    echo "Saving memory baseline..."
+    TEST_FILE="${1:-$(get:python:files:tests)}"
+    shift || true
+    poetry run pytest "$TEST_FILE" --memprofile --memprofile-save-baseline "$@"
+}
+
+# Profile a module or script with the sampling CPU profiler
+function profile:cpu {
+    if [ -z "$1" ]; then
+        echo "Usage: profile:cpu <module|script.py> [args...]"
+        return 1
+    fi
+    echo "Profiling $1..."
+    poetry run python scripts/profile_cpu.py run "$@"
+}
+
+# Profile selected tests with the sampling CPU profiler
+function profile:test {
+    echo "Profiling tests..."
+    TEST_FILE="${1:-$(get:python:files:tests)}"
+    shift || true
+    poetry run python scripts/profile_cpu.py test "$TEST_FILE" "$@"
+}
+
+# Compare the hot frames of the last two CPU profiles
+function profile:compare {
+    poetry run python scripts/profile_cpu.py compare "$@"
+}
+
+# Report the slowest tests and their trend across commits
+function tests:timings {
+    echo "Reporting test timings..."
+    poetry run python -m tests.plugins.timing "$@"
+}
+
 # Run tests in verbose mode
 function tests:verbose {
     echo "Running tests in verbose mode..."
@@ -370,6 +469,13 @@ function help:test {
     echo '  --log-cli-level=INFO    Show log messages in the console'
     echo '  --cov=PACKAGE           Measure code coverage for a package'
     echo '  --cov-report=html       Generate HTML coverage report'
+    echo '  --timings-top=N         Report the N slowest tests (0 disables the report)'
+    echo '  --no-timings            Do not record test durations in .perf/timings.jsonl'
+    echo '  --event-loop-policy=P   Run async tests on policies P, e.g. default,uvloop to compare'
+    echo '  --blocking-threshold=S  Fail async tests blocking the event loop over S seconds (0 disables)'
+    echo '  --memprofile            Record peak and retained allocations of each test'
+    echo '  --memprofile-tolerance  Allowed peak growth over the memory baseline (default: 0.2)'
+    echo '  --benchmarks            Run the tests marked with benchmark (skipped otherwise)'
     echo ''
     echo 'Examples:'
     echo '  ./run.sh tests tests/ -v'
@@ -377,9 +483,25 @@ function help:test {
     echo '  ./run.sh tests:file tests/test_example.py -v'
     echo '  ./run.sh tests:cov tests/unit/ --cov-report=html -v'
     echo ''
+    echo 'Time budgets:'
+    echo '  @pytest.mark.time_budget(0.5) fails a test whose call phase takes longer than 0.5s'
+    echo ''
+    echo 'Benchmarks:'
+    echo '  @pytest.mark.benchmark tests use the bench fixture: bench.measure(name, func, *args)'
+    echo ''
+    echo 'Asyncio fixtures:'
+    echo '  loop_latency             Async context manager measuring event loop latency'
+    echo '  task_throughput          Run many tasks with bounded concurrency, report tasks per second'
+    echo '  blocking_calls           Callbacks that blocked the loop (see @pytest.mark.allow_blocking)'
+    echo ''
     echo 'Specialized test functions:'
     echo '  tests:verbose            Run tests with verbose output'
     echo '  tests:cov                Run tests with coverage report'
+    echo '  tests:timings [--top N]  Report slowest tests and their trend across commits'
+    echo '  tests:bench              Run the micro-benchmarks and compare their timings'
+    echo '  profile:mem              Run tests recording peak and retained memory per test'
+    echo '  profile:mem:baseline     Store the memory results as the baseline to compare with'
+    echo '  profile:test [node]      Profile tests on CPU, flamegraph in .perf/cpu/latest.html'
     echo '  tests:pattern <pattern>  Run test files matching pattern'
     echo '  tests:file <file>        Run tests in specific file'
 }
@@ -401,12 +523,21 @@ function docs {
     echo "Documentation built in docs/_build/html/"
 }
 
-# Live documentation server
+# Live documentation server, keeping README.md in sync with the docs while it runs
 function docs:live {
     echo "Starting live documentation server..."
+    python scripts/generate_readme.py --watch &
+    local readme_watcher=$!
+    trap "kill $readme_watcher 2>/dev/null" EXIT
     poetry run sphinx-autobuild docs docs/_build/html --open-browser
 }
 
+# Download the intersphinx inventories read by the docs build, --refresh downloads them again
+function docs:cache {
+    echo "Caching intersphinx inventories..."
+    python scripts/intersphinx_cache.py "$@"
+}
+
 # Check documentation quality
 function docs:check {
     echo "Checking documentation quality..."
@@ -414,6 +545,11 @@ function docs:check {
     cd docs && poetry run make linkcheck
 }
 
+# Check the docs structure and internal links, only reading the files changed since the last check
+function docs:check:fast {
+    poetry run python scripts/docs_check.py "$@"
+}
+
 # Clean and rebuild documentation
 function docs:clean {
     echo "Cleaning documentation build files..."
@@ -454,6 +590,20 @@ function build {
     poetry build
 }
 
+# Build reproducible archives, reusing them while the package sources are unchanged
+function build:cached {
+    echo "Building package (cached)..."
+    python scripts/build_cached.py "$@"
+}
+{%- if cookiecutter.compiled_extension != "none" %}
+
+# Compile the optional extension module in place, next to its sources
+function build:ext {
+    echo "Compiling the _speedups extension..."
+    poetry run python build.py
+}
+{%- endif %}
+
 # Publish to TestPyPI
 function publish:test {
     echo "Publishing to TestPyPI..."
@@ -529,6 +679,11 @@ function release:alpha {
     python scripts/release.py create micro --pre a --changes "$changes"
 }
 
+# Show the changes of the next release without making them, e.g. ./run.sh release:plan minor --pre rc
+function release:plan {
+    python scripts/release.py plan "${@:-micro}"
+}
+
 # Rollback release
 function rollback {
     echo "Rolling back last release..."
@@ -544,6 +699,7 @@ function help:release {
     echo "  release:rc      - Create release candidate"
     echo "  release:beta    - Create beta release"
     echo "  release:alpha   - Create alpha release"
+    echo "  release:plan    - Show the diff of the next release without making it"
     echo "  rollback        - Rollback last release"
 }
 
@@ -564,12 +720,14 @@ function help {
     echo "  install:lint         - Install linting dependencies"
     echo "  install:docs         - Install documentation dependencies"
     echo "  install:all          - Install all dependencies"
+    echo "  install:offline      - Install all dependencies from a local wheel cache"
     echo "  update               - Update dependencies"
     echo "  venv                 - Create and activate virtual environment"
+    echo "  venv:fast [groups]   - Create .venv with uv from poetry.lock, with phase timings"
     echo "  lock                 - Lock dependencies"
     echo "  kernel               - Create Jupyter kernel"
     echo "  remove:kernel        - Remove Jupyter kernel"
-    echo "  requirements         - Export requirements.txt files"
+    echo "  requirements         - Export requirements.txt files from poetry.lock (skipped when unchanged)"
     echo ""
     echo "Linting & Formatting:"
     echo "  format               - Run all formatters (applies changes)"
@@ -581,11 +739,18 @@ function help {
     echo "  lint:tests           - Run linters on test files"
     echo "  check                - Run format + lint + test (applies changes)"
     echo "  check:ci             - Run format check + lint + test (CI)"
-    echo "  pre:commit           - Run format and lint on changed files"
+    echo "  pre:commit           - Run format, lint, docs check and tests"
     echo ""
     echo "Testing:"
     echo "  tests [file] [args]   - Run tests"
     echo "  tests:cov             - Run tests with coverage"
+    echo "  tests:timings         - Report slowest tests and their trend"
+    echo "  tests:bench           - Run the micro-benchmarks"
+    echo "  profile:mem           - Run tests with per-test memory profiling"
+    echo "  profile:mem:baseline  - Save the memory profile as the baseline"
+    echo "  profile:cpu <target>  - CPU profile a module or script (flamegraph)"
+    echo "  profile:test [node]   - CPU profile tests (flamegraph)"
+    echo "  profile:compare       - Compare hot frames of the last two CPU profiles"
     echo "  tests:verbose         - Run tests in verbose mode"
     echo "  tests:pattern <pat>   - Run tests matching pattern"
     echo "  tests:file <file>     - Run specific test file"
@@ -596,12 +761,18 @@ function help {
     echo "  docs:api             - Generate API documentation"
     echo "  docs                 - Build documentation"
     echo "  docs:live            - Start live documentation server"
+    echo "  docs:cache           - Cache intersphinx inventories (--refresh to update)"
     echo "  docs:check           - Check documentation quality"
+    echo "  docs:check:fast      - Check docs structure and internal links incrementally"
     echo "  docs:clean           - Clean and rebuild documentation"
     echo ""
     echo "Building & Publishing:"
     echo "  clean                - Clean build artifacts"
     echo "  build                - Build package"
+    echo "  build:cached         - Build reproducible archives, skipped when the sources are unchanged"
+{%- if cookiecutter.compiled_extension != "none" %}
+    echo "  build:ext            - Compile the optional extension module in place"
+{%- endif %}
     echo "  publish:test         - Publish to TestPyPI"
     echo "  publish              - Publish to PyPI"
     echo "  validate:build       - Validate build"
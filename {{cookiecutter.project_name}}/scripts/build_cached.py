@@ -0,0 +1,211 @@
+"""
+Reproducible, cached package build.
+
+The build inputs (the package sources, ``pyproject.toml``, ``README.md``, ``LICENSE`` and the ``build.py``
+script compiling the optional extension) are hashed into a cache key. When ``dist/`` already holds the
+archives of that key nothing is done; when the key is in ``.build-cache/`` the cached archives are copied
+to ``dist/``; otherwise the package is built and the archives are stored in the cache.
+
+Archives are byte-reproducible: every entry gets the same fixed timestamp, normalized permissions and
+owner, and a stable order. The timestamp is ``SOURCE_DATE_EPOCH`` when set, otherwise the time of the last
+commit touching the build inputs, so unrelated commits do not invalidate the cache.
+
+Usage:
+    python scripts/build_cached.py [--force] [--build-command "poetry build"]
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import (
+    Iterator,
+    List,
+    Optional,
+)
+
+
+# Inputs that do not exist, such as build.py without a compiled extension, are skipped
+INPUTS = ["src", "pyproject.toml", "README.md", "LICENSE", "build.py"]
+IGNORED_PARTS = {"__pycache__", ".mypy_cache", ".pytest_cache"}
+IGNORED_SUFFIXES = {".pyc", ".pyo", ".so", ".pyd"}
+CACHE_DIR = Path(".build-cache")
+DIST_DIR = Path("dist")
+KEY_FILE = "dist.key"
+KEEP_ENTRIES = 5
+DEFAULT_BUILD_COMMAND = "poetry build"
+# Zip archives cannot store dates before 1980
+MIN_EPOCH = 315532800
+
+
+def input_files(root: Path) -> Iterator[Path]:
+    """Yield the build input files in a stable order."""
+    for name in INPUTS:
+        path = root / name
+        if path.is_file():
+            yield path
+        elif path.is_dir():
+            for file in sorted(path.rglob("*")):
+                if file.is_file() and not IGNORED_PARTS & set(file.parts) and file.suffix not in IGNORED_SUFFIXES:
+                    yield file
+
+
+def source_date_epoch(root: Path) -> int:
+    """Return ``SOURCE_DATE_EPOCH``, or the time of the last commit that touched the build inputs."""
+    if os.environ.get("SOURCE_DATE_EPOCH"):
+        return max(MIN_EPOCH, int(os.environ["SOURCE_DATE_EPOCH"]))
+    try:
+        result = subprocess.run(
+            ["git", "log", "-1", "--format=%ct", "--", *INPUTS], cwd=root, capture_output=True, text=True, check=True
+        )
+        return max(MIN_EPOCH, int(result.stdout.strip()))
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return MIN_EPOCH
+
+
+def cache_key(root: Path, epoch: int, build_command: str) -> str:
+    digest = hashlib.sha256(f"{epoch}\0{build_command}\0".encode())
+    for file in input_files(root):
+        digest.update(file.relative_to(root).as_posix().encode() + b"\0")
+        digest.update(hashlib.sha256(file.read_bytes()).digest())
+    return digest.hexdigest()[:24]
+
+
+def normalize_wheel(path: Path, epoch: int) -> None:
+    """Rewrite a wheel with sorted entries, a fixed timestamp and normalized permissions."""
+    date_time = time.gmtime(epoch)[:6]
+    with zipfile.ZipFile(path) as source:
+        entries = [(info, source.read(info)) for info in source.infolist()]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as target:
+        # The RECORD file goes last, as the wheel specification recommends
+        entries.sort(key=lambda entry: (entry[0].filename.endswith("/RECORD"), entry[0].filename))
+        for info, data in entries:
+            normalized = zipfile.ZipInfo(info.filename, date_time)
+            normalized.compress_type = zipfile.ZIP_DEFLATED
+            normalized.external_attr = (0o755 if info.external_attr >> 16 & 0o111 else 0o644) << 16
+            normalized.create_system = 3
+            target.writestr(normalized, data)
+    path.write_bytes(buffer.getvalue())
+
+
+def normalize_sdist(path: Path, epoch: int) -> None:
+    """Rewrite a gzipped tarball with sorted members, a fixed mtime and anonymous ownership."""
+    with tarfile.open(path, "r:gz") as source:
+        members = [
+            (member, source.extractfile(member).read() if member.isfile() else None)  # type: ignore[union-attr]
+            for member in source.getmembers()
+        ]
+    buffer = io.BytesIO()
+    with gzip.GzipFile(filename="", mode="wb", fileobj=buffer, mtime=epoch) as compressed:
+        with tarfile.open(fileobj=compressed, mode="w", format=tarfile.PAX_FORMAT) as target:
+            for member, data in sorted(members, key=lambda item: item[0].name):
+                member.mtime = epoch
+                member.uid = member.gid = 0
+                member.uname = member.gname = ""
+                member.mode = 0o755 if member.isdir() or member.mode & 0o111 else 0o644
+                member.pax_headers = {}
+                target.addfile(member, io.BytesIO(data) if data is not None else None)
+    path.write_bytes(buffer.getvalue())
+
+
+def normalize(dist: Path, epoch: int) -> List[Path]:
+    archives = sorted(dist.glob("*.whl")) + sorted(dist.glob("*.tar.gz"))
+    for archive in archives:
+        if archive.suffix == ".whl":
+            normalize_wheel(archive, epoch)
+        else:
+            normalize_sdist(archive, epoch)
+    return archives
+
+
+def dist_matches(cache: Path, key: str) -> bool:
+    """Check whether ``dist/`` still holds the archives built for the given key."""
+    key_file, entry = cache / KEY_FILE, cache / key
+    if not key_file.exists() or key_file.read_text().strip() != key or not entry.is_dir():
+        return False
+    return all(
+        (DIST_DIR / archive.name).exists() and (DIST_DIR / archive.name).read_bytes() == archive.read_bytes()
+        for archive in entry.iterdir()
+    )
+
+
+def prune(cache: Path, keep: int = KEEP_ENTRIES) -> None:
+    entries = sorted((entry for entry in cache.iterdir() if entry.is_dir()), key=lambda entry: entry.stat().st_mtime)
+    for entry in entries[:-keep]:
+        shutil.rmtree(entry)
+
+
+def build(root: Path, build_command: str, cache: Path = CACHE_DIR, force: bool = False) -> Optional[str]:
+    """
+    Bring ``dist/`` up to date with the build inputs.
+
+    Returns:
+        "up to date" when nothing had to be done, "cached" when the archives came from the cache and None
+        after a fresh build.
+    """
+    epoch = source_date_epoch(root)
+    key = cache_key(root, epoch, build_command)
+    entry = cache / key
+    if not force and dist_matches(cache, key):
+        return "up to date"
+
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    DIST_DIR.mkdir()
+    status: Optional[str] = "cached"
+    if force or not entry.is_dir():
+        status = None
+        env = {**os.environ, "SOURCE_DATE_EPOCH": str(epoch)}
+        subprocess.run(shlex.split(build_command), cwd=root, env=env, check=True)
+        archives = normalize(DIST_DIR, epoch)
+        if not archives:
+            raise RuntimeError(f"'{build_command}' did not write any archive to {DIST_DIR}/")
+        shutil.rmtree(entry, ignore_errors=True)
+        entry.mkdir(parents=True)
+        for archive in archives:
+            shutil.copy2(archive, entry / archive.name)
+    else:
+        for archive in entry.iterdir():
+            shutil.copy2(archive, DIST_DIR / archive.name)
+    # Touching the entry keeps recently used keys from being pruned
+    os.utime(entry)
+    (cache / KEY_FILE).write_text(key)
+    prune(cache)
+    return status
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reproducible package build cached by a hash of its inputs")
+    parser.add_argument("--force", action="store_true", help="Rebuild even when the inputs have not changed")
+    parser.add_argument(
+        "--build-command",
+        default=DEFAULT_BUILD_COMMAND,
+        help=f"Command writing the sdist and wheel to dist/ (default: {DEFAULT_BUILD_COMMAND})",
+    )
+    parser.add_argument("--cache", type=Path, default=CACHE_DIR, help=f"Cache directory (default: {CACHE_DIR})")
+    args = parser.parse_args()
+
+    try:
+        status = build(Path.cwd(), args.build_command, args.cache, args.force)
+    except (subprocess.CalledProcessError, RuntimeError) as e:
+        sys.exit(f"Build failed: {e}")
+    archives = ", ".join(sorted(path.name for path in DIST_DIR.iterdir()))
+    if status == "up to date":
+        print(f"Build inputs unchanged, {DIST_DIR}/ is up to date: {archives}")
+    elif status == "cached":
+        print(f"Restored {archives} from {args.cache}/")
+    else:
+        print(f"Built {archives}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Fast, incremental check of the documentation sources.
+
+Every Markdown and reStructuredText file of ``docs/`` is checked for the problems doc8 reports (long lines,
+tabs, missing final newline) and for Markdown headings skipping a level, and its internal references are
+collected: links to files and their anchors, toctree entries and the ``doc``, ``ref`` and Python object
+roles. The results are cached in ``docs/_build/check.json`` by the hash of each file, so only changed
+files are read again.
+
+The references of all files are then resolved against the documents, labels and heading anchors of the
+sources and, when a previous Sphinx build left one, the Sphinx environment pickle, which adds the labels
+and Python objects generated by autodoc and autosummary. Loading the pickle needs Sphinx; the names taken
+from it are cached until it changes. Python object roles are only checked when the pickle is available.
+
+Usage:
+    python scripts/docs_check.py [--no-cache]
+"""
+
+import argparse
+import configparser
+import hashlib
+import json
+import pickle
+import posixpath
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from urllib.parse import unquote
+
+
+DOCS_DIR = Path("docs")
+CACHE_FILE = DOCS_DIR / "_build" / "check.json"
+ENVIRONMENT = DOCS_DIR / "_build" / "doctrees" / "environment.pickle"
+SUFFIXES = (".md", ".rst")
+IGNORED_DIRS = {"_build", "_intersphinx", "_static", "_templates"}
+# Bump when the checks change, so the cached results are not reused
+CHECK_VERSION = 1
+DEFAULT_MAX_LINE_LENGTH = 120
+# Heading levels that get an anchor, myst_heading_anchors of docs/conf.py
+ANCHOR_LEVELS = 3
+PY_ROLES = {"mod", "func", "data", "const", "class", "meth", "attr", "exc", "obj"}
+
+FENCE = re.compile(r"^(`{3,}|~{3,})\s*(?:\{([\w-]+)\})?")
+MD_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+MD_LINK = re.compile(r"!?\[[^\]]*\]\(\s*<?([^)\s>]+)>?(?:\s+\"[^\"]*\")?\s*\)")
+MD_LABEL = re.compile(r"^\(([^)\s]+)\)=\s*$")
+RST_LABEL = re.compile(r"^\.\.\s+_([^:]+):\s*$")
+RST_TOCTREE = re.compile(r"^(\s*)\.\.\s+toctree::")
+ROLE = re.compile(r"[{:]([\w-]+(?::[\w-]+)?)[}:]`([^`]+)`")
+INLINE_CODE = re.compile(r"`+[^`]*`+")
+URL = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+SLUG_CLEAN = re.compile(r"[^\w\- ]")
+
+
+def max_line_length(docs_dir: Path = DOCS_DIR) -> int:
+    """Return the maximum line length configured for doc8."""
+    config = configparser.ConfigParser()
+    config.read(docs_dir / "doc8.ini")
+    return config.getint("doc8", "max-line-length", fallback=DEFAULT_MAX_LINE_LENGTH)
+
+
+def slugify(title: str) -> str:
+    """Return the anchor MyST generates for a heading."""
+    return SLUG_CLEAN.sub("", title).strip().lower().replace(" ", "-")
+
+
+def target_of(content: str) -> str:
+    """Return the target of a role or toctree entry, written either as ``target`` or ``Title <target>``."""
+    content = content.strip()
+    if content.endswith(">") and "<" in content:
+        content = content[content.rindex("<") + 1 : -1]
+    return content.lstrip("~!")
+
+
+def role_references(number: int, line: str) -> List[Tuple[int, str, str]]:
+    """Return the ``doc``, ``ref`` and Python object roles of a line."""
+    references = []
+    for role in ROLE.finditer(line):
+        name = role.group(1).split(":")[-1]
+        if name in ("doc", "ref"):
+            references.append((number, name, target_of(role.group(2))))
+        elif name in PY_ROLES and role.group(1).split(":")[0] in ("py", name):
+            references.append((number, "obj", target_of(role.group(2))))
+    return references
+
+
+def scan_markdown(lines: List[str]) -> Dict[str, Any]:
+    """Return the heading problems, references, labels and heading anchors of Markdown lines."""
+    issues: List[Tuple[int, str]] = []
+    references: List[Tuple[int, str, str]] = []
+    labels: List[str] = []
+    anchors: List[str] = []
+    # Marker and directive of the open code fence, empty outside of one
+    fence = directive = ""
+    level = 0
+    for number, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if fence:
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                fence = directive = ""
+            elif directive == "toctree" and stripped and not stripped.startswith(":"):
+                references.append((number, "doc", target_of(stripped)))
+            continue
+        match = FENCE.match(stripped)
+        if match:
+            fence, directive = match.group(1), match.group(2) or ""
+            continue
+        heading = MD_HEADING.match(line)
+        if heading:
+            new_level = len(heading.group(1))
+            if level and new_level > level + 1:
+                issues.append((number, f"heading level skips from h{level} to h{new_level}"))
+            level = new_level
+            if new_level <= ANCHOR_LEVELS:
+                anchors.append(slugify(heading.group(2)))
+        label = MD_LABEL.match(line)
+        if label:
+            labels.append(label.group(1).lower())
+        references += [(number, "link", link.group(1)) for link in MD_LINK.finditer(INLINE_CODE.sub("", line))]
+        references += role_references(number, line)
+    return {"issues": issues, "references": references, "labels": labels, "anchors": anchors}
+
+
+def scan_rst(lines: List[str]) -> Dict[str, Any]:
+    """Return the references and labels of reStructuredText lines."""
+    references: List[Tuple[int, str, str]] = []
+    labels: List[str] = []
+    toctree_indent: Optional[int] = None
+    for number, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if toctree_indent is not None:
+            if not stripped or len(line) - len(line.lstrip()) > toctree_indent:
+                if stripped and not stripped.startswith(":"):
+                    references.append((number, "doc", target_of(stripped)))
+                continue
+            toctree_indent = None
+        toctree = RST_TOCTREE.match(line)
+        if toctree:
+            toctree_indent = len(toctree.group(1))
+            continue
+        label = RST_LABEL.match(line)
+        if label:
+            labels.append(label.group(1).lower())
+        references += role_references(number, line)
+    return {"issues": [], "references": references, "labels": labels, "anchors": []}
+
+
+def check_file(path: Path, text: str, max_length: int) -> Dict[str, Any]:
+    """Return the problems, references, labels and heading anchors of a documentation file."""
+    lines = text.splitlines()
+    issues: List[Tuple[int, str]] = []
+    if text and not text.endswith("\n"):
+        issues.append((len(lines), "D005 no newline at end of file"))
+    for number, line in enumerate(lines, 1):
+        # Like doc8, lines made of a single word such as a URL may be long
+        if len(line) > max_length and " " in line.strip():
+            issues.append((number, f"D001 line too long ({len(line)} > {max_length})"))
+        if "\t" in line:
+            issues.append((number, "D003 tabulation used for indentation"))
+
+    result = scan_markdown(lines) if path.suffix == ".md" else scan_rst(lines)
+    result["issues"] = sorted(issues + result["issues"])
+    return result
+
+
+def docname(path: str) -> str:
+    return posixpath.splitext(path)[0]
+
+
+def environment_names(path: Path, cached: Dict[str, Any]) -> Optional[Dict[str, List[str]]]:
+    """Return the documents, labels and Python objects of a Sphinx environment pickle, None without one."""
+    if not path.is_file():
+        return None
+    stat = path.stat()
+    key = f"{stat.st_mtime_ns}:{stat.st_size}"
+    if cached.get("key") == key:
+        names: Dict[str, List[str]] = cached["names"]
+        return names
+    try:
+        with open(path, "rb") as f:
+            env = pickle.load(f)
+        std, py = env.domaindata["std"], env.domaindata["py"]
+        names = {
+            "docs": sorted(env.found_docs),
+            "labels": sorted(set(std["labels"]) | set(std["anonlabels"])),
+            "objects": sorted(set(py["objects"]) | set(py["modules"])),
+        }
+    except (ImportError, AttributeError, KeyError, EOFError, pickle.UnpicklingError):
+        # Sphinx is not installed or wrote the pickle with an incompatible version
+        return None
+    cached.update(key=key, names=names)
+    return names
+
+
+@dataclass
+class Targets:
+    """The documents, labels, Markdown heading anchors and Python objects references may point to."""
+
+    docs: Set[str]
+    labels: Set[str]
+    anchors: Dict[str, Set[str]]
+    # None when no Sphinx environment tells which Python objects exist
+    objects: Optional[Set[str]]
+
+    @classmethod
+    def collect(cls, files: Dict[str, Dict[str, Any]], environment: Optional[Dict[str, List[str]]]) -> "Targets":
+        """Collect the targets defined by the checked files and the Sphinx environment, if any."""
+        docs = {docname(path) for path in files} | set(environment["docs"] if environment else [])
+        labels = {label for result in files.values() for label in result["labels"]}
+        labels |= set(environment["labels"] if environment else [])
+        anchors = {docname(path): set(result["anchors"]) for path, result in files.items() if path.endswith(".md")}
+        if not environment:
+            return cls(docs, labels, anchors, None)
+        # Objects may be referenced by any dotted suffix of their full name, relative to the current module
+        objects: Set[str] = set()
+        for name in environment["objects"]:
+            parts = name.split(".")
+            objects.update(".".join(parts[index:]) for index in range(len(parts)))
+        return cls(docs, labels, anchors, objects)
+
+    def problem(self, path: str, kind: str, target: str) -> Optional[str]:
+        """Return why a reference of a file is broken, None if it resolves."""
+        directory = posixpath.dirname(path)
+        if kind == "doc":
+            if target == "self" or URL.match(target) or "*" in target:
+                return None
+            name = target[1:] if target.startswith("/") else posixpath.join(directory, target)
+            name = posixpath.normpath(docname(name) if name.endswith(SUFFIXES) else name)
+            return None if name in self.docs else f"unknown document '{target}'"
+        if kind == "ref":
+            return None if target.lower() in self.labels else f"undefined label '{target}'"
+        if kind == "obj":
+            known = self.objects is None or target.lstrip(".") in self.objects
+            return None if known else f"unknown Python object '{target}'"
+        if URL.match(target):
+            return None
+        return self.link_problem(path, target)
+
+    def link_problem(self, path: str, target: str) -> Optional[str]:
+        """Return why a Markdown link to a file and/or an anchor is broken, None if it resolves."""
+        file, _, anchor = target.partition("#")
+        name = docname(path)
+        if file:
+            resolved = posixpath.normpath(posixpath.join(posixpath.dirname(path), unquote(file)))
+            name = docname(resolved) if resolved.endswith(SUFFIXES) else resolved
+            if name not in self.docs and not (DOCS_DIR / resolved).exists():
+                return f"broken link '{target}'"
+        if anchor and name in self.anchors and anchor not in self.anchors[name] | self.labels:
+            return f"unknown anchor '#{anchor}' in '{target}'"
+        return None
+
+
+def resolve(
+    files: Dict[str, Dict[str, Any]], environment: Optional[Dict[str, List[str]]]
+) -> List[Tuple[str, int, str]]:
+    """Return the references of the files that point to no document, file, anchor, label or object."""
+    targets = Targets.collect(files, environment)
+    broken = []
+    for path, result in files.items():
+        for line, kind, target in result["references"]:
+            problem = targets.problem(path, kind, target)
+            if problem:
+                broken.append((path, line, problem))
+    return broken
+
+
+def check(use_cache: bool = True) -> Tuple[List[Tuple[str, int, str]], int, int]:
+    """
+    Check the documentation sources.
+
+    Returns:
+        The problems found, the number of files and the number of files read again.
+    """
+    max_length = max_line_length()
+    cache: Dict[str, Any] = {}
+    if use_cache and CACHE_FILE.is_file():
+        cache = json.loads(CACHE_FILE.read_text())
+        if cache.get("version") != [CHECK_VERSION, max_length]:
+            cache = {"environment": cache.get("environment", {})}
+
+    cached_files = cache.get("files", {})
+    files = {}
+    checked = 0
+    for path in sorted(DOCS_DIR.rglob("*")):
+        relative = path.relative_to(DOCS_DIR)
+        if path.suffix not in SUFFIXES or IGNORED_DIRS & set(relative.parts) or not path.is_file():
+            continue
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        key = relative.as_posix()
+        if cached_files.get(key, {}).get("sha256") == digest:
+            files[key] = cached_files[key]
+            continue
+        files[key] = {"sha256": digest, **check_file(path, data.decode("utf-8", errors="replace"), max_length)}
+        checked += 1
+
+    environment_cache = cache.get("environment", {})
+    environment = environment_names(ENVIRONMENT, environment_cache)
+    problems = [(path, line, message) for path, result in files.items() for line, message in result["issues"]]
+    problems += resolve(files, environment)
+
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    cache = {"version": [CHECK_VERSION, max_length], "files": files, "environment": environment_cache}
+    CACHE_FILE.write_text(json.dumps(cache))
+    return sorted(problems), len(files), checked
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incremental check of the documentation structure and links")
+    parser.add_argument("--no-cache", action="store_true", help="Read every file again")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    problems, total, checked = check(use_cache=not args.no_cache)
+    for path, line, message in problems:
+        print(f"{DOCS_DIR / path}:{line}: {message}")
+    elapsed = time.perf_counter() - started
+    print(f"Checked {total} documentation files ({checked} changed) in {elapsed:.2f}s: {len(problems)} problems")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Incremental documentation build and deployment.
+
+A fresh checkout gives every source a new modification time, so Sphinx rebuilds every page even when the
+doctrees and HTML of the previous build are restored. ``prepare`` hashes the docs and package sources and
+gives each one a modification time that only moves forward when its hash changes: the time recorded when
+the source last changed, or the start of the current run for changed and new sources. Sphinx then only
+rebuilds the pages whose sources changed.
+
+``publish`` hashes the built HTML and copies only the files that differ from the previous deployment into
+the deployment directory, e.g. a checkout of the ``gh-pages`` branch, deleting the files that are no
+longer built. sphinx_sitemap only lists the pages written by the current build, so the sitemap is
+regenerated from the previously published one and the pages of the current build; the URLs of changed
+pages get a new ``lastmod``.
+
+The hashes are stored in ``docs/_build/`` next to the doctrees, which the docs workflow caches between
+runs.
+
+Usage:
+    python scripts/docs_deploy.py prepare
+    python scripts/docs_deploy.py publish --target DIR
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import (
+    datetime,
+    timezone,
+)
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlsplit
+from xml.etree import ElementTree
+
+
+SOURCE_DIRS = ["docs", "src"]
+IGNORED_PARTS = {"_build", "__pycache__", ".mypy_cache", ".pytest_cache"}
+BUILD_DIR = Path("docs/_build")
+HTML_DIR = BUILD_DIR / "html"
+SOURCES_FILE = BUILD_DIR / "sources.json"
+PUBLISHED_FILE = BUILD_DIR / "published.json"
+SITEMAP = "sitemap.xml"
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+# Files of the deployment directory that are not built by Sphinx
+KEPT_FILES = {".git", ".nojekyll", "CNAME"}
+
+
+def hash_tree(root: Path) -> Dict[str, str]:
+    """Return the sha256 of every file below root by its path relative to root."""
+    hashes = {}
+    for path in sorted(root.rglob("*")):
+        relative = path.relative_to(root)
+        if path.is_file() and not IGNORED_PARTS & set(relative.parts):
+            hashes[relative.as_posix()] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return hashes
+
+
+def load(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            data: Dict[str, Any] = json.load(f)
+        return data
+    except (OSError, ValueError):
+        return None
+
+
+def save(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+
+
+def prepare(root: Path) -> Tuple[int, int]:
+    """
+    Reset the modification time of the sources to the time their content last changed.
+
+    Returns:
+        The number of unchanged sources and the number of sources.
+    """
+    started = time.time()
+    previous = load(root / SOURCES_FILE) or {}
+    sources = {}
+    unchanged = 0
+    for name in SOURCE_DIRS:
+        if not (root / name).is_dir():
+            continue
+        for relative, digest in hash_tree(root / name).items():
+            path = f"{name}/{relative}"
+            # Earlier than the build that last read an unchanged source, later than any build for a changed one
+            recorded = previous.get(path)
+            if recorded and recorded[0] == digest:
+                modified = recorded[1]
+                unchanged += 1
+            else:
+                modified = started
+            os.utime(root / path, (modified, modified))
+            sources[path] = [digest, modified]
+    save(root / SOURCES_FILE, sources)
+    return unchanged, len(sources)
+
+
+def read_sitemap(path: Path) -> Dict[str, str]:
+    """Return the last modification date of each URL of a sitemap, empty when it has none."""
+    if not path.is_file():
+        return {}
+    namespaces = {"sitemap": SITEMAP_NAMESPACE}
+    return {
+        url.findtext("sitemap:loc", "", namespaces): url.findtext("sitemap:lastmod", "", namespaces)
+        for url in ElementTree.parse(path).getroot().iterfind("sitemap:url", namespaces)
+    }
+
+
+def write_sitemap(path: Path, entries: Dict[str, str]) -> None:
+    urlset = ElementTree.Element("urlset", xmlns=SITEMAP_NAMESPACE)
+    for loc, lastmod in sorted(entries.items()):
+        url = ElementTree.SubElement(urlset, "url")
+        ElementTree.SubElement(url, "loc").text = loc
+        ElementTree.SubElement(url, "lastmod").text = lastmod
+    ElementTree.ElementTree(urlset).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def page_of(loc: str, pages: Dict[str, str]) -> Optional[str]:
+    """Return the built file of a sitemap URL, whatever base URL, language or version prefixes it."""
+    parts = urlsplit(loc).path.split("/")
+    for index in range(len(parts)):
+        # Directory URLs, e.g. of the dirhtml builder, point to their index.html
+        candidate = "/".join(parts[index:]) + ("index.html" if parts[-1] == "" else "")
+        if candidate in pages:
+            return candidate
+    return None
+
+
+def deployed_files(target: Path) -> List[str]:
+    return [
+        path.relative_to(target).as_posix()
+        for path in target.rglob("*")
+        if path.is_file() and path.name != SITEMAP and not KEPT_FILES & set(path.relative_to(target).parts)
+    ]
+
+
+def publish(root: Path, target: Path) -> Tuple[List[str], List[str]]:
+    """
+    Bring the deployment directory up to date with the built HTML.
+
+    Returns:
+        The changed and the removed files.
+    """
+    html = root / HTML_DIR
+    if not (html / "index.html").is_file():
+        raise FileNotFoundError(f"No documentation built in {HTML_DIR}/")
+    pages = hash_tree(html)
+    pages.pop(SITEMAP, None)
+
+    published = load(root / PUBLISHED_FILE)
+    target.mkdir(parents=True, exist_ok=True)
+    if published is None:
+        # Without the hashes of the previous deployment every file is copied and stray ones are removed
+        published = {"pages": dict.fromkeys(deployed_files(target), ""), "sitemap": read_sitemap(target / SITEMAP)}
+    changed = [path for path, digest in pages.items() if published["pages"].get(path) != digest]
+    removed = sorted(set(published["pages"]) - set(pages))
+
+    for path in changed:
+        (target / path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(html / path, target / path)
+    for path in removed:
+        (target / path).unlink(missing_ok=True)
+        parent = (target / path).parent
+        while parent != target and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+
+    today = datetime.now(timezone.utc).date().isoformat()
+    updated = set(changed)
+    sitemap = {}
+    for loc in set(published["sitemap"]) | set(read_sitemap(html / SITEMAP)):
+        page = page_of(loc, pages)
+        if page is not None:
+            sitemap[loc] = today if page in updated else published["sitemap"].get(loc) or today
+    write_sitemap(target / SITEMAP, sitemap)
+
+    save(root / PUBLISHED_FILE, {"pages": pages, "sitemap": sitemap})
+    return changed, removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incremental documentation build and deployment")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("prepare", help="Let Sphinx skip the pages whose sources did not change")
+    publish_parser = subparsers.add_parser("publish", help="Copy the changed HTML files to the deployment")
+    publish_parser.add_argument("--target", type=Path, required=True, help="Deployment directory")
+    args = parser.parse_args()
+
+    root = Path.cwd()
+    if args.command == "prepare":
+        unchanged, total = prepare(root)
+        print(f"{unchanged} of {total} documentation sources unchanged since the previous build")
+        return
+    try:
+        changed, removed = publish(root, args.target)
+    except FileNotFoundError as e:
+        sys.exit(str(e))
+    print(f"Published {len(changed)} changed and removed {len(removed)} files in {args.target}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Export requirements files straight from ``poetry.lock``.
+
+Both requirement sets are written in a single pass over the lock file, without Poetry or its export
+plugin: ``requirements.txt`` with the main dependencies and ``requirements-dev.txt`` with the main and
+development dependencies. The dependencies of each set are the direct dependencies declared in
+``pyproject.toml`` plus everything they require according to the lock file. A package locked in several
+versions, e.g. one per Python version, gets one pinned line per version with the marker selecting it.
+
+Each file starts with a header holding the sha256 of ``poetry.lock``. When every file already carries the
+hash of the current lock file nothing is resolved or written, so the export is cheap to run on every build.
+
+``--groups`` exports a single file with the given groups instead, e.g. ``--groups main,test`` for an
+environment that only runs the tests.
+
+Usage:
+    python scripts/export_requirements.py [--force] [--groups GROUP,... [--output FILE]]
+"""
+
+import argparse
+import hashlib
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+
+try:
+    import tomllib  # Part of the standard library on Python 3.11+
+except ImportError:
+    try:
+        import tomli as tomllib  # For Python < 3.11
+    except ImportError:
+        sys.exit("Please install tomli package: pip install tomli")
+
+
+LOCK_FILE = "poetry.lock"
+PROJECT_FILE = "pyproject.toml"
+DEV_GROUPS = ("dev", "test", "lint", "typing", "docs")
+EXPORTS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("requirements.txt", ("main",)),
+    ("requirements-dev.txt", ("main", *DEV_GROUPS)),
+]
+HEADER = "# Exported from {lock} sha256:{digest} groups:{groups}"
+
+REQUIREMENT_PATTERN = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[([^\]]*)\])?[^;]*(?:;\s*(.+))?$")
+# A clause of a Poetry version constraint, e.g. "^3.8", ">=3.8" or "3.9.*"
+CONSTRAINT_PATTERN = re.compile(r"^(\^|~=|~|>=|<=|!=|==|>|<|=)?\s*(\d+(?:\.\d+)*)(\.\*)?$")
+
+# A dependency as (name, extras, marker), the marker being None when the dependency is unconditional
+Dependency = Tuple[str, Tuple[str, ...], Optional[str]]
+
+
+def canonical_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def header(lock: Path, digest: str, groups: Iterable[str]) -> str:
+    return HEADER.format(lock=lock.name, digest=digest, groups=",".join(groups))
+
+
+def is_up_to_date(path: Path, expected_header: str) -> bool:
+    """Check whether the first line of an exported file is the header of the current lock file."""
+    if not path.exists():
+        return False
+    with open(path) as f:
+        return f.readline().rstrip("\n") == expected_header
+
+
+def parse_requirement(requirement: str) -> Optional[Dependency]:
+    """Parse a PEP 508 requirement, or a lock file extra entry such as ``pytest (>=6)``."""
+    match = REQUIREMENT_PATTERN.match(requirement)
+    if match is None:
+        return None
+    name, extras, marker = match.groups()
+    return canonical_name(name), tuple(e.strip() for e in (extras or "").split(",") if e.strip()), marker
+
+
+def bump(release: List[int], index: int) -> str:
+    """Return the first version after a release at the given component, e.g. 3.8 at 0 is 4.0 and at 1 is 3.9."""
+    bumped = [*release[:index], release[index] + 1]
+    return ".".join(str(part) for part in bumped + [0] * (2 - len(bumped)))
+
+
+def python_marker(constraint: Optional[str]) -> Optional[str]:
+    """Convert the Poetry ``python`` constraint of a dependency, e.g. ``>=3.8,<3.11``, to an environment marker."""
+    alternatives = []
+    for alternative in (constraint or "*").split("||"):
+        clauses = []
+        for clause in alternative.replace(",", " ").split():
+            match = CONSTRAINT_PATTERN.match(clause)
+            if clause == "*" or match is None:
+                continue
+            operator, version, wildcard = match.groups()
+            release = [int(part) for part in version.split(".")]
+            if operator == "^":
+                nonzero = next((index for index, part in enumerate(release) if part), len(release) - 1)
+                bounds = [(">=", version), ("<", bump(release, nonzero))]
+            elif operator == "~":
+                bounds = [(">=", version), ("<", bump(release, min(1, len(release) - 1)))]
+            elif operator == "~=":
+                bounds = [(">=", version), ("<", bump(release, max(0, len(release) - 2)))]
+            elif operator in (None, "=", "==") and (wildcard or len(release) < 3):
+                bounds = [("==", version)] if len(release) == 2 else [(">=", version), ("<", bump(release, 0))]
+            else:
+                bounds = [("==" if operator == "=" else operator or "==", version)]
+            for bound_operator, bound in bounds:
+                # python_version only holds major.minor, longer versions compare with the full version
+                variable = "python_full_version" if bound.count(".") >= 2 else "python_version"
+                clauses.append(f'{variable} {bound_operator} "{bound}"')
+        if not clauses:
+            return None
+        alternatives.append(" and ".join(clauses))
+    return alternatives[0] if len(alternatives) == 1 else " or ".join(f"({marker})" for marker in alternatives)
+
+
+def poetry_dependency(name: str, spec: Any) -> List[Dependency]:
+    """Convert a Poetry dependency specification, possibly a list of constraints, to dependencies."""
+    dependencies = []
+    for constraint in spec if isinstance(spec, list) else [spec]:
+        if isinstance(constraint, dict):
+            if constraint.get("optional"):
+                continue
+            marker = combine_markers(python_marker(constraint.get("python")), constraint.get("markers"))
+            dependencies.append((canonical_name(name), tuple(constraint.get("extras", ())), marker))
+        else:
+            dependencies.append((canonical_name(name), (), None))
+    return dependencies
+
+
+def direct_dependencies(project: Dict[str, Any], groups: Iterable[str]) -> List[Dependency]:
+    """Collect the dependencies that ``pyproject.toml`` declares for the given groups."""
+    poetry = project.get("tool", {}).get("poetry", {})
+    dependencies: List[Dependency] = []
+    for group in groups:
+        if group == "main":
+            declared = poetry.get("dependencies", {})
+            for requirement in project.get("project", {}).get("dependencies", []):
+                parsed = parse_requirement(requirement)
+                if parsed:
+                    dependencies.append(parsed)
+        else:
+            declared = poetry.get("group", {}).get(group, {}).get("dependencies", {})
+        for name, spec in declared.items():
+            if name != "python":
+                dependencies.extend(poetry_dependency(name, spec))
+    return dependencies
+
+
+def declared_groups(project: Dict[str, Any]) -> Set[str]:
+    """Return the dependency groups of ``pyproject.toml``, main included."""
+    return {"main", *project.get("tool", {}).get("poetry", {}).get("group", {})}
+
+
+def combine_markers(parent: Optional[str], child: Optional[str]) -> Optional[str]:
+    if parent is None or child is None:
+        return parent or child
+    return f"({parent}) and ({child})"
+
+
+def version_marker(package: Dict[str, Any]) -> Optional[str]:
+    """Return the marker selecting one of the versions of a package locked in several versions."""
+    markers = package.get("markers")
+    # Lock files record the markers of each version, per group when they differ between groups. Older lock
+    # files have none, the Python versions the version supports are the closest approximation
+    if isinstance(markers, dict):
+        markers = join_alternatives(set(markers.values()))
+    return markers or python_marker(package.get("python-versions"))
+
+
+def locked_versions(packages: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+    """Pair each locked version of a package with the marker selecting it, None for a single version."""
+    if len(packages) == 1:
+        return [(packages[0], None)]
+    return [(package, version_marker(package)) for package in packages]
+
+
+def package_dependencies(package: Dict[str, Any], extras: Tuple[str, ...], marker: Optional[str]) -> List[Dependency]:
+    """Return the dependencies of a locked package and of its requested extras, needed under ``marker``."""
+    dependencies = []
+    for dependency, spec in package.get("dependencies", {}).items():
+        dependencies.extend(poetry_dependency(dependency, spec))
+    for extra in extras:
+        for requirement in package.get("extras", {}).get(extra, []):
+            parsed = parse_requirement(requirement)
+            if parsed:
+                dependencies.append(parsed)
+    return [
+        (child, child_extras, combine_markers(marker, child_marker))
+        for child, child_extras, child_marker in dependencies
+    ]
+
+
+def resolve(packages: Dict[str, List[Dict[str, Any]]], roots: List[Dependency]) -> Dict[str, Set[Optional[str]]]:
+    """
+    Walk the dependency graph of the lock file from the given root dependencies.
+
+    Returns:
+        A mapping from package name to the alternative environment markers under which it is needed, None
+        among them when it is needed unconditionally.
+    """
+    markers: Dict[str, Set[Optional[str]]] = defaultdict(set)
+    seen: Set[Tuple[str, Tuple[str, ...], Optional[str]]] = set()
+    pending = list(roots)
+    while pending:
+        name, extras, marker = pending.pop()
+        if name not in packages or (name, extras, marker) in seen:
+            continue
+        seen.add((name, extras, marker))
+        markers[name].add(marker)
+        for package, selected in locked_versions(packages[name]):
+            pending.extend(package_dependencies(package, extras, combine_markers(marker, selected)))
+    return markers
+
+
+def join_alternatives(alternatives: Set[Optional[str]]) -> Optional[str]:
+    if None in alternatives:
+        return None
+    ordered = sorted(marker for marker in alternatives if marker)
+    return ordered[0] if len(ordered) == 1 else " or ".join(f"({marker})" for marker in ordered)
+
+
+def requirement_line(package: Dict[str, Any], marker: Optional[str]) -> str:
+    """Format a locked package as a pinned requirement, or a direct reference for non index sources."""
+    name, version = package["name"], package["version"]
+    source = package.get("source", {})
+    kind = source.get("type")
+    if kind == "git":
+        reference = source.get("resolved_reference") or source.get("reference")
+        line = f"{name} @ git+{source['url']}" + (f"@{reference}" if reference else "")
+    elif kind in ("directory", "file"):
+        line = f"{name} @ {Path(source['url']).resolve().as_uri()}"
+    elif kind == "url":
+        line = f"{name} @ {source['url']}"
+    else:
+        line = f"{name}=={version}"
+    return f"{line} ; {marker}" if marker else line
+
+
+def requirement_lines(packages: Dict[str, List[Dict[str, Any]]], roots: List[Dependency]) -> List[str]:
+    """Return the pinned requirements of the root dependencies and their locked dependencies, sorted by name."""
+    lines = []
+    for name, alternatives in sorted(resolve(packages, roots).items()):
+        for package, selected in locked_versions(packages[name]):
+            # A version selected by one of the alternatives is needed exactly under its own marker
+            if selected not in alternatives:
+                selected = combine_markers(join_alternatives(alternatives), selected)
+            lines.append(requirement_line(package, selected))
+    return lines
+
+
+def export(
+    lock: Path,
+    project_file: Path,
+    force: bool = False,
+    exports: Optional[List[Tuple[str, Tuple[str, ...]]]] = None,
+) -> List[Path]:
+    """
+    Write every requirements file whose header does not match the current lock file.
+
+    ``exports`` lists the files to write with their groups, by default ``EXPORTS``.
+
+    Returns:
+        The files that were written, empty when all of them were up to date.
+    """
+    if exports is None:
+        exports = EXPORTS
+    digest = file_digest(lock)
+    stale = [
+        (Path(output), groups)
+        for output, groups in exports
+        if force or not is_up_to_date(Path(output), header(lock, digest, groups))
+    ]
+    if not stale:
+        return []
+
+    with open(lock, "rb") as f:
+        locked = tomllib.load(f)
+    with open(project_file, "rb") as f:
+        project = tomllib.load(f)
+    # A package is locked once per version when its versions are selected by markers, e.g. by Python version
+    packages: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for package in locked.get("package", []):
+        packages[canonical_name(package["name"])].append(package)
+
+    for output, groups in stale:
+        lines = requirement_lines(packages, direct_dependencies(project, groups))
+        output.write_text("\n".join([header(lock, digest, groups), *lines]) + "\n")
+    return [output for output, _ in stale]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export requirements files from poetry.lock")
+    parser.add_argument("--lock", type=Path, default=Path(LOCK_FILE), help=f"Lock file (default: {LOCK_FILE})")
+    parser.add_argument(
+        "--project", type=Path, default=Path(PROJECT_FILE), help=f"Project file (default: {PROJECT_FILE})"
+    )
+    parser.add_argument("--force", action="store_true", help="Export even when the lock file has not changed")
+    parser.add_argument("--groups", help="Comma-separated groups to export to a single file, e.g. main,test")
+    parser.add_argument("--output", help="File the --groups export is written to (default: requirements-GROUPS.txt)")
+    args = parser.parse_args()
+
+    if not args.lock.exists():
+        sys.exit(f"'{args.lock}' not found, run 'poetry lock' first.")
+    exports = None
+    if args.groups:
+        groups = tuple(group.strip() for group in args.groups.split(",") if group.strip())
+        with open(args.project, "rb") as f:
+            unknown = set(groups) - declared_groups(tomllib.load(f))
+        if unknown:
+            sys.exit(f"Unknown dependency groups in '{args.project}': {', '.join(sorted(unknown))}")
+        exports = [(args.output or f"requirements-{'-'.join(groups)}.txt", groups)]
+    written = export(args.lock, args.project, args.force, exports)
+    if written:
+        print(f"Exported {', '.join(str(path) for path in written)}")
+    else:
+        print(f"Requirements files are up to date with '{args.lock}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,213 @@
-"""Generate README.md from documentation files."""
+"""
+Generate README.md from documentation files.
 
-from typing import Optional
+Each entry of ``ELEMENTS`` names a Markdown file of the docs directory and optional start and end markers;
+only the text between the markers is used when both are found, otherwise the whole file. Files with
+markers are streamed line by line and reading stops at the end marker.
 
+The docs directory is ``docs/source/`` for projects using Sphinx's separate source layout and ``docs/``
+otherwise. README.md is only rewritten when the assembled content differs from the current one, so running
+the script from hooks or builds does not touch its modification time needlessly.
 
-DOCS_PATH = "./docs/source/"
+With ``--watch`` the script keeps the extracted sections in memory, polls the element files and
+re-extracts only the ones that changed, so the README follows the docs within milliseconds; ``docs:live``
+runs it next to sphinx-autobuild.
+
+Usage:
+    python scripts/generate_readme.py [--docs DIR] [--output README.md] [--check | --watch [--interval SECONDS]]
+"""
+
+import argparse
+import os
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+
+DOCS_CANDIDATES = ["docs/source", "docs"]
 ELEMENTS = [
     ("badges", "", ""),
     ("home", "", ""),
     ("runnable", "", ""),
     ("tool", "", ""),
 ]
+README = "README.md"
+# Seconds between two checks of the element files in watch mode
+DEFAULT_INTERVAL = 0.5
 
 
-def extract_content(file_path: str, start_marker: Optional[str] = None, end_marker: Optional[str] = None) -> str:
-    """Extract content between markers from a file."""
+def find_docs_dir(root: Path = Path(".")) -> Path:
+    """Return the directory holding the Sphinx configuration of the project."""
+    for candidate in DOCS_CANDIDATES:
+        if (root / candidate / "conf.py").is_file():
+            return root / candidate
+    for candidate in DOCS_CANDIDATES:
+        if (root / candidate).is_dir():
+            return root / candidate
+    raise FileNotFoundError(f"No documentation directory found, looked for {', '.join(DOCS_CANDIDATES)}")
+
+
+def read_section(file_path: Path, start_marker: str, end_marker: str) -> Optional[str]:
+    """Stream a file up to the end marker and return the text between the markers, None when one is missing."""
+    section: List[str] = []
+    found_start = False
     with open(file_path, "r") as f:
-        content = f.read()
+        for line in f:
+            if not found_start:
+                position = line.find(start_marker)
+                if position == -1:
+                    continue
+                found_start = True
+                line = line[position + len(start_marker) :]
+            position = line.find(end_marker)
+            if position != -1:
+                section.append(line[:position])
+                return "".join(section)
+            section.append(line)
+    return None
 
+
+def extract_content(file_path: Path, start_marker: Optional[str] = None, end_marker: Optional[str] = None) -> str:
+    """Extract content between markers from a file."""
     if start_marker and end_marker:
-        start = content.find(start_marker)
-        end = content.find(end_marker)
-        if start != -1 and end != -1:
-            return content[start + len(start_marker) : end].strip()
-    return content
+        section = read_section(file_path, start_marker, end_marker)
+        if section is not None:
+            return section.strip()
+    with open(file_path, "r") as f:
+        return f.read()
+
+
+class SectionCache:
+    """Extracted sections of the README elements, re-extracted only when their file changes."""
+
+    def __init__(self, docs_dir: Path, elements: Optional[List[Tuple[str, str, str]]] = None) -> None:
+        self.docs_dir = docs_dir
+        self.elements = ELEMENTS if elements is None else elements
+        # Element name to the (modification time, size) of its file and its extracted section
+        self.sections: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+    def path(self, name: str) -> Path:
+        return self.docs_dir / f"{name}.md"
+
+    def refresh(self) -> List[str]:
+        """Re-extract the sections whose file changed, appeared or disappeared and return their names."""
+        changed = []
+        for name, start_marker, end_marker in self.elements:
+            try:
+                info = self.path(name).stat()
+            except FileNotFoundError:
+                if self.sections.pop(name, None) is not None:
+                    changed.append(name)
+                continue
+            signature = (info.st_mtime_ns, info.st_size)
+            cached = self.sections.get(name)
+            if cached is None or cached[0] != signature:
+                self.sections[name] = (signature, extract_content(self.path(name), start_marker, end_marker))
+                changed.append(name)
+        return changed
+
+    def missing(self) -> List[Path]:
+        return [self.path(name) for name, _, _ in self.elements if name not in self.sections]
+
+    def content(self) -> Optional[str]:
+        """Join the cached sections in element order, None when none of the files exists."""
+        sections = [self.sections[name][1] for name, _, _ in self.elements if name in self.sections]
+        return "\n".join(sections) if sections else None
+
+
+def assemble(docs_dir: Path, elements: Optional[List[Tuple[str, str, str]]] = None) -> Optional[str]:
+    """Join the sections of the elements found in the docs directory, None when none of them exists."""
+    cache = SectionCache(docs_dir, elements)
+    cache.refresh()
+    for path in cache.missing():
+        print(f"Skipping '{path}': file not found", file=sys.stderr)
+    return cache.content()
+
+
+def has_content(path: Path, data: bytes) -> bool:
+    return path.is_file() and path.read_bytes() == data
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Atomically replace the file when its content differs, returning whether it was written."""
+    data = content.encode()
+    if has_content(path, data):
+        return False
+    mode = stat.S_IMODE(path.stat().st_mode) if path.exists() else 0o644
+    with tempfile.NamedTemporaryFile("wb", dir=path.parent, prefix=f".{path.name}.", delete=False) as f:
+        f.write(data)
+    os.chmod(f.name, mode)
+    os.replace(f.name, path)
+    return True
+
+
+def generate_readme(docs_dir: Optional[Path] = None, output: Path = Path(README)) -> bool:
+    """
+    Generate README.md from documentation files.
+
+    Returns:
+        Whether the README was written, False when it was already up to date.
+    """
+    content = assemble(docs_dir or find_docs_dir())
+    if content is None:
+        raise FileNotFoundError("None of the README elements was found in the documentation")
+    return write_if_changed(output, content)
+
 
+def watch(docs_dir: Path, output: Path = Path(README), interval: float = DEFAULT_INTERVAL) -> None:
+    """Poll the element files and rebuild the README from the cached sections whenever one changes."""
+    cache = SectionCache(docs_dir)
+    print(f"Watching the README elements in {docs_dir}, press Ctrl+C to stop", flush=True)
+    try:
+        while True:
+            start = time.perf_counter()
+            changed = cache.refresh()
+            content = cache.content() if changed else None
+            if content is not None and write_if_changed(output, content):
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"Rebuilt {output} in {elapsed:.1f} ms ({', '.join(changed)} changed)", flush=True)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
 
-def generate_readme() -> None:
-    """Generate README.md from documentation files."""
-    # Start with the basic structure
-    readme = []
 
-    # Add elements
-    for element in ELEMENTS:
-        content = extract_content(DOCS_PATH + element[0] + ".md", element[1], element[2])
-        readme.append(content)
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate README.md from documentation files")
+    parser.add_argument("--docs", type=Path, help="Documentation directory (default: docs/source or docs)")
+    parser.add_argument("--output", type=Path, default=Path(README), help=f"Output file (default: {README})")
+    parser.add_argument("--check", action="store_true", help="Only check, exit with 1 when the README is outdated")
+    parser.add_argument("--watch", action="store_true", help="Keep running and rebuild the README on changes")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help=f"Polling interval in seconds (default: {DEFAULT_INTERVAL})",
+    )
+    args = parser.parse_args()
 
-    # Write the README.md
-    with open("README.md", "w") as f:
-        f.write("\n".join(readme))
+    try:
+        docs_dir = args.docs or find_docs_dir()
+        if args.check:
+            content = assemble(docs_dir)
+            if content is not None and not has_content(args.output, content.encode()):
+                sys.exit(f"{args.output} is out of date, run: python scripts/generate_readme.py")
+            return
+        if args.watch:
+            watch(docs_dir, args.output, args.interval)
+            return
+        written = generate_readme(docs_dir, args.output)
+    except FileNotFoundError as e:
+        sys.exit(str(e))
+    print(f"Generated {args.output}" if written else f"{args.output} is up to date")
 
 
 if __name__ == "__main__":
-    generate_readme()
+    main()
@@ -0,0 +1,114 @@
+"""
+Download the intersphinx inventories read by the documentation build.
+
+The inventories of the projects in ``intersphinx_mapping`` of ``docs/conf.py`` are stored in
+``docs/_intersphinx/`` as ``<name>.inv``, next to ``inventories.json`` recording the URL, the project
+version and the hash of each one. ``docs/conf.py`` reads a cached inventory instead of fetching it, so
+builds are fast and deterministic without network access. Commit the directory to share the inventories.
+
+Only missing inventories are downloaded; ``--refresh`` downloads all of them again, e.g. to pick up a new
+Python release.
+
+Usage:
+    python scripts/intersphinx_cache.py [--refresh] [NAME ...]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import runpy
+import sys
+import tempfile
+import urllib.request
+from pathlib import Path
+from typing import (
+    Dict,
+    List,
+)
+
+
+CONF = Path("docs/conf.py")
+CACHE_DIR = Path("docs/_intersphinx")
+MANIFEST = "inventories.json"
+INVENTORY_HEADER = b"# Sphinx inventory version"
+TIMEOUT = 30
+
+
+def inventory_urls(conf: Path = CONF) -> Dict[str, str]:
+    """Return the documentation URL of every project in the intersphinx mapping of the Sphinx configuration."""
+    mapping = runpy.run_path(str(conf))["intersphinx_mapping"]
+    return {name: target[0] for name, target in mapping.items()}
+
+
+def parse_header(data: bytes) -> Dict[str, str]:
+    """Return the project and version of an inventory, from the comment lines heading the compressed part."""
+    if not data.startswith(INVENTORY_HEADER):
+        raise ValueError("not a Sphinx inventory")
+    header = {}
+    for line in data.split(b"\n")[1:3]:
+        key, _, value = line.decode().lstrip("# ").partition(": ")
+        header[key.lower()] = value
+    return header
+
+
+def download(url: str, path: Path) -> Dict[str, str]:
+    """Download the inventory of the documentation at the URL to the path and return its manifest entry."""
+    inventory_url = url.rstrip("/") + "/objects.inv"
+    with urllib.request.urlopen(inventory_url, timeout=TIMEOUT) as response:
+        data = response.read()
+    header = parse_header(data)
+    # Written to a temporary file first, so an interrupted download never leaves a truncated inventory
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return {
+        "url": url,
+        "project": header.get("project", ""),
+        "version": header.get("version", ""),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def cache(urls: Dict[str, str], cache_dir: Path = CACHE_DIR, refresh: bool = False) -> List[str]:
+    """
+    Download the missing inventories, all of them when refreshing.
+
+    Returns:
+        The names of the downloaded inventories.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = cache_dir / MANIFEST
+    manifest: Dict[str, Dict[str, str]] = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    downloaded = []
+    for name, url in urls.items():
+        path = cache_dir / f"{name}.inv"
+        if not refresh and path.is_file() and manifest.get(name, {}).get("url") == url:
+            continue
+        manifest[name] = download(url, path)
+        downloaded.append(name)
+        print(f"Cached {name}: {manifest[name]['project']} {manifest[name]['version']}")
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    return downloaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Download the intersphinx inventories read by the docs build")
+    parser.add_argument("names", nargs="*", help="Projects to cache (default: all of intersphinx_mapping)")
+    parser.add_argument("--refresh", action="store_true", help="Download the inventories again")
+    args = parser.parse_args()
+
+    urls = inventory_urls()
+    unknown = set(args.names) - set(urls)
+    if unknown:
+        sys.exit(f"Not in intersphinx_mapping: {', '.join(sorted(unknown))}")
+    try:
+        downloaded = cache({name: urls[name] for name in args.names or urls}, refresh=args.refresh)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Could not download the inventory: {e}")
+    print(f"Downloaded {len(downloaded)} inventories to {CACHE_DIR}/" if downloaded else "Inventories up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Statistical CPU profiler producing collapsed stacks and an HTML flamegraph.
+
+The profiled code runs in this process while a ``SIGPROF`` interval timer samples the Python stack of the
+main thread every ``--interval`` seconds of CPU time. It needs no external services or packages and works
+offline on Linux and macOS.
+
+Each run writes ``latest.collapsed`` and ``latest.html`` to ``.perf/cpu/`` and keeps the previous run as
+``previous.*``, so the hottest frames can be compared between the two.
+
+Usage:
+    python scripts/profile_cpu.py run <module|script.py> [args...]
+    python scripts/profile_cpu.py test [pytest args...]
+    python scripts/profile_cpu.py compare [old.collapsed] [new.collapsed]
+"""
+
+import argparse
+import html
+import inspect
+import os
+import runpy
+import signal
+import sys
+import zlib
+from collections import Counter
+from pathlib import Path
+from types import (
+    CodeType,
+    FrameType,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+
+OUTPUT_DIR = Path(".perf/cpu")
+DEFAULT_INTERVAL = 0.005
+DEFAULT_TOP = 15
+# Frames below this share of the samples are left out of the flamegraph
+MIN_FLAMEGRAPH_SHARE = 0.001
+# Frames of the profiler itself and of runpy are not recorded
+HIDDEN_FILES = {__file__, runpy.__file__, "<frozen runpy>"}
+
+FLAMEGRAPH_STYLE = """
+body { font: 12px monospace; margin: 16px; }
+.node { display: flex; flex-direction: column; min-width: 0; }
+.children { display: flex; flex-direction: row; }
+.frame { height: 18px; line-height: 18px; margin: 1px; padding: 0 3px; overflow: hidden; white-space: nowrap;
+         text-overflow: ellipsis; border-radius: 2px; cursor: default; }
+"""
+
+
+class Sampler:
+    """Sample the stack of the main thread on every ``SIGPROF`` tick of CPU time."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL) -> None:
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._root: Optional[CodeType] = None
+        self._cwd = os.getcwd()
+        self._previous_handler: Any = None
+
+    def _sample(self, _signum: int, frame: Optional[FrameType]) -> None:
+        names = []
+        while frame is not None and frame.f_code is not self._root:
+            code = frame.f_code
+            frame = frame.f_back
+            filename = code.co_filename
+            if filename in HIDDEN_FILES:
+                continue
+            if filename.startswith(self._cwd):
+                filename = os.path.relpath(filename, self._cwd)
+            names.append(f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":"))
+        if names:
+            self.stacks[";".join(reversed(names))] += 1
+
+    def start(self) -> None:
+        """Start sampling; the frame calling ``start`` and the frames above it are not recorded."""
+        frame = inspect.currentframe()
+        caller = frame.f_back if frame is not None else None
+        self._root = caller.f_code if caller is not None else None
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self) -> None:
+        """Stop sampling and restore the previous ``SIGPROF`` handler."""
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler)
+
+    def profile(self, target: Callable[[], Any]) -> Any:
+        """Run ``target`` while sampling; frames above it are not recorded."""
+        self.start()
+        try:
+            return target()
+        finally:
+            self.stop()
+
+
+def run_target(target: str, args: List[str]) -> Callable[[], Any]:
+    """Build a callable running a script path or module as ``__main__`` with the given arguments."""
+
+    def run() -> Any:
+        sys.argv = [target, *args]
+        try:
+            if target.endswith(".py") or Path(target).is_file():
+                sys.path.insert(0, str(Path(target).resolve().parent))
+                runpy.run_path(target, run_name="__main__")
+            else:
+                runpy.run_module(target, run_name="__main__", alter_sys=True)
+        except SystemExit as e:
+            return e.code
+        return 0
+
+    return run
+
+
+def run_pytest(args: List[str]) -> Callable[[], Any]:
+    def run() -> Any:
+        import pytest
+
+        return pytest.main(args)
+
+    return run
+
+
+def read_collapsed(path: Path) -> Counter[str]:
+    stacks: Counter[str] = Counter()
+    if path.exists():
+        with open(path) as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                if stack and count.isdigit():
+                    stacks[stack] += int(count)
+    return stacks
+
+
+def write_collapsed(stacks: Counter[str], path: Path) -> None:
+    with open(path, "w") as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+
+def hot_frames(stacks: Counter[str]) -> Dict[str, Tuple[float, float]]:
+    """Return the self and total share of the samples for every frame."""
+    total_samples = sum(stacks.values()) or 1
+    self_counts: Counter[str] = Counter()
+    total_counts: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            total_counts[frame] += count
+    return {frame: (self_counts[frame] / total_samples, total_counts[frame] / total_samples) for frame in total_counts}
+
+
+def print_comparison(previous: Counter[str], latest: Counter[str], top: int = DEFAULT_TOP) -> None:
+    """Print the hottest frames by self time, with their change against the previous profile."""
+    latest_frames = hot_frames(latest)
+    previous_frames = hot_frames(previous) if previous else {}
+    ranked = sorted(latest_frames.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    print(f"Hottest frames ({sum(latest.values())} samples):")
+    print(f"{'self':>7} {'total':>7} {'change':>8}  frame")
+    for frame, (self_share, total_share) in ranked:
+        if frame in previous_frames:
+            change = f"{(self_share - previous_frames[frame][0]) * 100:+7.1f}%"
+        else:
+            change = "     new" if previous_frames else ""
+        print(f"{self_share:7.1%} {total_share:7.1%} {change:>8}  {frame}")
+    if previous_frames:
+        gone = [frame for frame, (self_share, _) in previous_frames.items() if frame not in latest_frames]
+        gone.sort(key=lambda frame: previous_frames[frame][0], reverse=True)
+        for frame in gone[:top]:
+            if previous_frames[frame][0] > 0:
+                print(f"{'':7} {'':7} {'gone':>8}  {frame} (was {previous_frames[frame][0]:.1%} self)")
+
+
+def build_tree(stacks: Counter[str]) -> Dict[str, Any]:
+    root: Dict[str, Any] = {"count": 0, "children": {}}
+    for stack, count in stacks.items():
+        root["count"] += count
+        node = root
+        for frame in stack.split(";"):
+            node = node["children"].setdefault(frame, {"count": 0, "children": {}})
+            node["count"] += count
+    return root
+
+
+def frame_color(name: str) -> str:
+    """Pick a stable warm color for a frame name."""
+    hue = zlib.crc32(name.encode()) % 50
+    return f"hsl({hue}, 80%, {60 + hue % 15}%)"
+
+
+def render_node(name: str, node: Dict[str, Any], parent_count: int, total: int, out: List[str]) -> None:
+    width = 100 * node["count"] / parent_count
+    title = html.escape(f"{name} - {node['count']} samples ({node['count'] / total:.1%})", quote=True)
+    out.append(f'<div class="node" style="width:{width:.4f}%">')
+    out.append(f'<div class="frame" style="background:{frame_color(name)}" title="{title}">{html.escape(name)}</div>')
+    children = [
+        (child, data) for child, data in node["children"].items() if data["count"] / total >= MIN_FLAMEGRAPH_SHARE
+    ]
+    if children:
+        out.append('<div class="children">')
+        for child, data in sorted(children, key=lambda item: -item[1]["count"]):
+            render_node(child, data, node["count"], total, out)
+        out.append("</div>")
+    out.append("</div>")
+
+
+def write_flamegraph(stacks: Counter[str], path: Path, title: str) -> None:
+    """Write a self-contained HTML flamegraph (root at the top) of the collapsed stacks."""
+    tree = build_tree(stacks)
+    total = tree["count"] or 1
+    out = [
+        "<!DOCTYPE html>",
+        f"<html><head><meta charset='utf-8'><title>{html.escape(title)}</title>",
+        f"<style>{FLAMEGRAPH_STYLE}</style></head><body>",
+        f"<h3>{html.escape(title)} - {tree['count']} samples</h3>",
+    ]
+    render_node("all", tree, total, total, out)
+    out.append("</body></html>")
+    path.write_text("\n".join(out))
+
+
+def save_profile(stacks: Counter[str], output_dir: Path, title: str) -> Tuple[Path, Path]:
+    """Rotate the latest profile to ``previous.*`` and write the new one as ``latest.*``."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for suffix in (".collapsed", ".html"):
+        latest = output_dir / f"latest{suffix}"
+        if latest.exists():
+            latest.replace(output_dir / f"previous{suffix}")
+    collapsed, flamegraph = output_dir / "latest.collapsed", output_dir / "latest.html"
+    write_collapsed(stacks, collapsed)
+    write_flamegraph(stacks, flamegraph, title)
+    return collapsed, flamegraph
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sampling CPU profiler with collapsed stacks and flamegraphs")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Sampling interval in seconds")
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR, help=f"Output directory (default: {OUTPUT_DIR})")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Number of hot frames to report")
+    subparsers = parser.add_subparsers(dest="command")
+
+    run_parser = subparsers.add_parser("run", help="Profile a module or a script")
+    run_parser.add_argument("target", help="Module name or path to a Python script")
+    run_parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments passed to the target")
+
+    test_parser = subparsers.add_parser("test", help="Profile pytest on the given tests")
+    test_parser.add_argument("args", nargs=argparse.REMAINDER, help="Pytest arguments, e.g. a test node id")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare the hot frames of two collapsed profiles")
+    compare_parser.add_argument("old", nargs="?", type=Path, help="Older profile (default: previous.collapsed)")
+    compare_parser.add_argument("new", nargs="?", type=Path, help="Newer profile (default: latest.collapsed)")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        old = args.old or args.output / "previous.collapsed"
+        new = args.new or args.output / "latest.collapsed"
+        print_comparison(read_collapsed(old), read_collapsed(new), args.top)
+        return
+    if args.command == "run":
+        target, title = run_target(args.target, args.args), f"{args.target} {' '.join(args.args)}"
+    elif args.command == "test":
+        target, title = run_pytest(args.args), f"pytest {' '.join(args.args)}"
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+    sampler = Sampler(args.interval)
+    exit_code = sampler.profile(target)
+    if not sampler.stacks:
+        print("No samples collected, the target finished too quickly for the sampling interval.")
+        sys.exit(0 if exit_code is None else exit_code)
+
+    previous = read_collapsed(args.output / "latest.collapsed")
+    collapsed, flamegraph = save_profile(sampler.stacks, args.output, title.strip())
+    print()
+    print_comparison(previous, sampler.stacks, args.top)
+    print(f"\nCollapsed stacks: {collapsed}")
+    print(f"Flamegraph:       {flamegraph}")
+    sys.exit(0 if exit_code is None else exit_code)
+
+
+if __name__ == "__main__":
+    main()
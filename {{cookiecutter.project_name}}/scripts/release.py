@@ -1,5 +1,7 @@
 """Release management script."""
 
+import difflib
+import json
 import logging
 import os
 import pickle
@@ -7,12 +9,19 @@ import re
 import subprocess
 import sys
 import tempfile
+from dataclasses import (
+    asdict,
+    dataclass,
+    field,
+)
 from datetime import datetime
 from enum import Enum
 from itertools import chain
 from pathlib import Path
 from typing import (
+    Dict,
     Iterator,
+    List,
     Optional,
     Tuple,
 )
@@ -60,6 +69,64 @@ class PrereleaseType(Enum):
 PROJECT_FILE = "pyproject.toml"
 CHANGELOG_FILE = "CHANGELOG.md"
 BEFORE_LAST_RELEASE = ".before_last_release.pkl"
+COMMITS_CACHE = ".release_commits.json"
+
+# Changelog sections by conventional commit type, in the order they are listed
+CHANGE_SECTIONS = {
+    "feat": "Features",
+    "fix": "Bug Fixes",
+    "perf": "Performance",
+    "refactor": "Refactoring",
+    "docs": "Documentation",
+    "test": "Tests",
+    "build": "Build System",
+    "ci": "Continuous Integration",
+    "style": "Style",
+    "chore": "Chores",
+    "revert": "Reverts",
+}
+BREAKING_SECTION = "Breaking Changes"
+OTHER_SECTION = "Other Changes"
+# type(scope)!: description, the scope and the breaking change marker being optional
+CONVENTIONAL_SUBJECT = re.compile(
+    r"^(?P<type>[A-Za-z]+)(?:\((?P<scope>[^)]*)\))?(?P<breaking>!)?: *(?P<description>.+)$"
+)
+BREAKING_NOTES = ("BREAKING CHANGE:", "BREAKING-CHANGE:")
+# Separators of the fields and records in the git log output, which cannot appear in commit messages
+FIELD_SEPARATOR = "\x1f"
+RECORD_SEPARATOR = "\x1e"
+
+
+@dataclass
+class Change:
+    """The type, scope, description and breaking marker of a conventional commit subject."""
+
+    type: str = "other"
+    scope: str = ""
+    description: str = ""
+    breaking: bool = False
+
+
+@dataclass
+class Commit:
+    """A commit parsed following the conventional commits specification."""
+
+    sha: str
+    subject: str
+    body: str = ""
+    trailers: Dict[str, List[str]] = field(default_factory=dict)
+    change: Change = field(default_factory=Change)
+
+
+@dataclass
+class ReleaseRefs:
+    """Refs recorded while creating a release, to undo it with a single ref transaction."""
+
+    before: str
+    commit: Optional[str] = None
+    tag: Optional[str] = None
+    tag_object: Optional[str] = None
+
 
 files_backup: Optional[Iterator[Tuple[str, str]]] = None
 
@@ -93,6 +160,7 @@ def create_release(
         ImportError: If tomllib or tomli is not available for reading TOML files.
     """
     time_stamp = datetime.now().astimezone()
+    refs: Optional[ReleaseRefs] = None
     try:
         # Ensure working directory is a git repository and is clean
         logger.info("Checking working directory git status...")
@@ -100,37 +168,97 @@ def create_release(
         if result.stdout.strip():
             logger.error("Not a git repository or working directory is not clean.")
             raise ValueError("Not a git repository or working directory is not clean.")
+        refs = ReleaseRefs(before=rev_parse("HEAD"))
 
-        # Verify that there are changes since the last release
-        latest_tag = get_latest_release_tag()
-        commit_messages = get_commits_since_tag(latest_tag)
-        if not commit_messages:
-            logger.error("No new commits since last release.")
-            raise ValueError("No new commits since last release.")
-        if not changes_message:
-            changes_message = "\n".join(f"- {msg}" for msg in commit_messages)
-
+        changes_message = release_changes(changes_message)
         date = time_stamp.strftime("%Y-%m-%d")
         current_version = get_current_version(project_file)
         new_version = bump_version(current_version, release_type, prerelease_type)
         update_version_files(project_file, new_version)
-        changelog_entry = update_changelog(changelog_file, date, new_version, changes_message)
-        commit_message = create_commit(new_version, changelog_entry)  # type: ignore
+        entry = update_changelog(changelog_file, date, new_version, changes_message)
+        commit_message = create_commit(new_version, entry)  # type: ignore
+        refs.commit = rev_parse("HEAD")
         create_tag(date, new_version, commit_message)
-        save_state(time_stamp, current_version)
+        refs.tag = f"refs/tags/{release_tag(new_version)}"
+        refs.tag_object = rev_parse(refs.tag)
+        save_state(refs, current_version)
 
         return new_version
 
     except subprocess.CalledProcessError as e:
         logger.error(f"Git or shell command failed ({e}). Rolling back changes.")
-        rollback(time_stamp)
+        rollback(refs)
         raise RuntimeError(f"Git or shell command failed: {e}")
     except Exception as e:
         logger.error(f"Failed to create release: {e}. Rolling back changes.")
-        rollback(time_stamp)
+        rollback(refs)
         raise
 
 
+def plan_release(
+    release_type: ReleaseType,
+    prerelease_type: Optional[PrereleaseType] = None,
+    changes_message: Optional[str] = None,
+    project_file: str = PROJECT_FILE,
+    changelog_file: str = CHANGELOG_FILE,
+) -> Tuple[Version, str, str]:
+    """
+    Compute a release in memory, without writing any project file nor creating the commit and tag.
+
+    Args:
+        release_type: Type of release using PEP 440 release types.
+        prerelease_type: Optional pre-release type using PEP 440 prerelease types.
+        changes_message: Optional string with descriptions of changes since last release for the changelog file
+            If no message is provided, will use git commit messages since last release.
+        project_file: Path to the project TOML file. Default: pyproject.toml.
+        changelog_file: Path to the changelog markdown file. Default: CHANGELOG.md.
+
+    Returns:
+        The release version number, the release tag name and a unified diff of the changes the release would
+        make to the version files and the changelog.
+
+    Raises:
+        FileNotFoundError: If the project TOML file does not exist.
+        ValueError: If the release fails due to invalid input or no new commits since last release.
+        subprocess.CalledProcessError: If a git command fails.
+    """
+    # Planning must not write anything, not even the commit cache
+    changes_message = release_changes(changes_message, write_cache=False)
+    date = datetime.now().astimezone().strftime("%Y-%m-%d")
+    current_version = get_current_version(project_file)
+    new_version = bump_version(current_version, release_type, prerelease_type)
+
+    substitutions = version_substitutions(project_file, new_version)
+    entry = changelog_entry(date, new_version, changes_message)
+    substitutions.append((changelog_file, *insert_changelog_entry(changelog_file, entry)))
+    diff: List[str] = []
+    for file_path, content, new_content in substitutions:
+        existing = Path(file_path).exists()
+        diff += difflib.unified_diff(
+            content.splitlines(keepends=True),
+            new_content.splitlines(keepends=True),
+            fromfile=f"a/{file_path}" if existing else "/dev/null",
+            tofile=f"b/{file_path}",
+        )
+    return new_version, release_tag(new_version), "".join(diff)
+
+
+def release_changes(changes_message: Optional[str], write_cache: bool = True) -> str:
+    """Return the changes of the release, synthesized from the commits since the last release if not given."""
+    # Verify that there are changes since the last release
+    latest_tag = get_latest_release_tag()
+    commits = read_commits(latest_tag, write_cache=write_cache)
+    if not commits:
+        logger.error("No new commits since last release.")
+        raise ValueError("No new commits since last release.")
+    return changes_message or synthesize_changelog(commits)
+
+
+def rev_parse(revision: str) -> str:
+    """Return the SHA of the object a revision points to."""
+    return subprocess.check_output(["git", "rev-parse", "--verify", revision], text=True).strip()
+
+
 def get_latest_release_tag() -> Optional[str]:
     """Find the latest release tag matching 'v<PyPI version>'."""
     tags = subprocess.check_output(["git", "tag"], text=True).splitlines()
@@ -145,9 +273,117 @@ def get_latest_release_tag() -> Optional[str]:
 
 def get_commits_since_tag(tag: Optional[str]) -> list[str]:
     """Retrieve commit messages since the given tag."""
-    range = f"{tag}..HEAD" if tag else "HEAD"
-    commit_messages = subprocess.check_output(["git", "log", f"{range}", "--pretty=format:%s"], text=True).splitlines()
-    return commit_messages
+    return [commit.subject for commit in read_commits(tag)]
+
+
+def parse_commit(sha: str, message: str, trailers: str) -> Commit:
+    """Parse a commit message, its type, scope and breaking marker following conventional commits."""
+    subject, _, body = message.strip().partition("\n")
+    commit = Commit(sha=sha, subject=subject.strip(), body=body.strip(), change=Change(description=subject.strip()))
+    for line in trailers.splitlines():
+        key, separator, value = line.partition(":")
+        if separator:
+            commit.trailers.setdefault(key.strip(), []).append(value.strip())
+    match = CONVENTIONAL_SUBJECT.match(commit.subject)
+    if match:
+        commit.change = Change(
+            type=match["type"].lower(),
+            scope=match["scope"] or "",
+            description=match["description"].strip(),
+            breaking=bool(match["breaking"]),
+        )
+    # Git does not recognize "BREAKING CHANGE" as a trailer because of the space
+    if any(line.startswith(BREAKING_NOTES) for line in body.splitlines()):
+        commit.change.breaking = True
+    return commit
+
+
+def log_commits(shas: List[str]) -> Iterator[Commit]:
+    """Parse the given commits with their bodies and trailers from a single streamed ``git log`` pass."""
+    log_format = f"--format=%H{FIELD_SEPARATOR}%B{FIELD_SEPARATOR}%(trailers:only,unfold){RECORD_SEPARATOR}"
+    with subprocess.Popen(
+        ["git", "log", "--no-walk=unsorted", "--stdin", log_format],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    ) as log:
+        assert log.stdin is not None and log.stdout is not None
+        # Git reads all the revisions before writing anything, so this cannot deadlock
+        log.stdin.write("\n".join(shas) + "\n")
+        log.stdin.close()
+        pending = ""
+        for chunk in iter(lambda: log.stdout.read(65536), ""):  # type: ignore[union-attr]
+            *records, pending = (pending + chunk).split(RECORD_SEPARATOR)
+            for record in records:
+                yield parse_commit(*record.lstrip("\n").split(FIELD_SEPARATOR))
+    if log.returncode:
+        raise subprocess.CalledProcessError(log.returncode, log.args)
+
+
+def read_commits(tag: Optional[str], cache_file: str = COMMITS_CACHE, write_cache: bool = True) -> List[Commit]:
+    """
+    Read the commits since the given tag, newest first and without merge commits.
+
+    Commits parsed by a previous run are taken from the cache by SHA; the others are read with their bodies
+    and trailers in a single streamed ``git log`` pass, so repeated runs only list the SHAs. With
+    ``write_cache`` false the cache is only read.
+    """
+    revision_range = f"{tag}..HEAD" if tag else "HEAD"
+    shas = subprocess.check_output(["git", "rev-list", "--no-merges", revision_range], text=True).split()
+    cache: Dict[str, Commit] = {}
+    try:
+        with open(cache_file) as f:
+            cache = {
+                sha: Commit(**{**data, "change": Change(**data["change"])}) for sha, data in json.load(f).items()
+            }
+    except (OSError, ValueError, TypeError, KeyError):
+        logger.info(f"No usable commit cache in '{cache_file}'.")
+
+    missing = [sha for sha in shas if sha not in cache]
+    if missing:
+        cache.update((commit.sha, commit) for commit in log_commits(missing))
+        logger.info(f"Parsed {len(missing)} new commits, {len(shas) - len(missing)} cached.")
+
+    if write_cache:
+        # Only the commits of the current range are kept, so the cache does not grow across releases. It is
+        # replaced atomically, so an interrupted or concurrent run never leaves a truncated cache behind
+        directory, name = os.path.split(cache_file)
+        with tempfile.NamedTemporaryFile("w", dir=directory or ".", prefix=f"{name}.", delete=False) as tmp:
+            json.dump({sha: asdict(cache[sha]) for sha in shas}, tmp)
+        os.replace(tmp.name, cache_file)
+    return [cache[sha] for sha in shas]
+
+
+def synthesize_changelog(commits: List[Commit]) -> str:
+    """
+    Group commits into changelog sections by conventional commit type and, within a section, by scope.
+
+    Breaking changes are listed first and commits not following conventional commits last. Without any
+    conventional commit the changelog is a plain list of the commit subjects.
+    """
+    if all(commit.change.type not in CHANGE_SECTIONS for commit in commits):
+        return "\n".join(f"- {commit.subject}" for commit in commits)
+
+    sections: Dict[str, List[Commit]] = {}
+    for commit in commits:
+        if commit.change.breaking:
+            section = BREAKING_SECTION
+        else:
+            section = CHANGE_SECTIONS.get(commit.change.type, OTHER_SECTION)
+        sections.setdefault(section, []).append(commit)
+
+    order = [BREAKING_SECTION, *CHANGE_SECTIONS.values(), OTHER_SECTION]
+    return "\n\n".join(changelog_section(section, sections[section]) for section in order if section in sections)
+
+
+def changelog_section(section: str, commits: List[Commit]) -> str:
+    """Render a changelog section, its commits ordered by scope."""
+    lines = [f"#### {section}"]
+    # Sorting is stable, so the commits of a scope stay in log order
+    for commit in sorted(commits, key=lambda commit: commit.change.scope):
+        scope = f"**{commit.change.scope}**: " if commit.change.scope else ""
+        lines.append(f"- {scope}{commit.change.description} ({commit.sha[:7]})")
+    return "\n".join(lines)
 
 
 def get_current_version(project_file: str) -> Version:
@@ -281,6 +517,35 @@ def bump_version(  # pylint: disable=too-many-branches
         raise
 
 
+def version_substitutions(project_file: str, new_version: Version) -> List[Tuple[str, str, str]]:
+    """Return the path, current content and content with the new version of every project file holding it."""
+    contents: Dict[str, Tuple[str, str]] = {}
+    version_variables = read_from_toml_file(project_file, "semantic_release", "version_variable")
+    for version_variable in version_variables or []:
+        file_path, version_key = version_variable.split(":")
+        file = Path(file_path)
+        if not file.exists():
+            logger.warning(f"'{file_path}' does not exist, skipping.")
+            continue
+        # Several variables of the same file are substituted one after the other
+        if file_path in contents:
+            content, current_content = contents[file_path]
+        else:
+            content = current_content = file.read_text()
+        new_content, found = re.subn(
+            rf'{version_key} = "[^"]+"', f'{version_key} = "{new_version}"', current_content, count=1
+        )
+        if found:
+            contents[file_path] = (content, new_content)
+        else:
+            logger.warning(f"'{version_key}' not found in '{file_path}', skipping.")
+
+    if project_file not in contents:
+        logger.error(f"Failed to update version in  '{project_file}'.")
+        raise ValueError(f"Failed to update version in '{project_file}'.")
+    return [(file_path, content, new_content) for file_path, (content, new_content) in contents.items()]
+
+
 def update_version_files(project_file: str, new_version: Version) -> None:
     """Update version in all project files needed."""
     global files_backup
@@ -288,35 +553,39 @@ def update_version_files(project_file: str, new_version: Version) -> None:
     logger.info(f"Updating files with new version: {new_version}")
     updated_files = []
     original_contents = []
-    version_variables = read_from_toml_file(project_file, "semantic_release", "version_variable")
-    if version_variables:
-        for version_variable in version_variables:
-            file_path, version_key = version_variable.split(":")
-            print(f"-Updating '{version_key}' to {new_version} in '{file_path}'.")
-            file = Path(file_path)
-            if not file.exists():
-                logger.warning(f"'{file_path}' does not exist, skipping.")
-                continue
-            content = file.read_text()
-            new_content, found = re.subn(
-                rf'{version_key} = "[^"]+"', f'{version_key} = "{new_version}"', content, count=1
-            )
-            if found:
-                file.write_text(new_content)
-                updated_files.append(file_path)
-                original_contents.append(content)
-                logger.info(f"Updated '{file_path}' to version {new_version}.")
-            else:
-                logger.warning(f"'{version_key}' not found in '{file_path}', skipping.")
+    for file_path, content, new_content in version_substitutions(project_file, new_version):
+        print(f"-Updating version to {new_version} in '{file_path}'.")
+        Path(file_path).write_text(new_content)
+        updated_files.append(file_path)
+        original_contents.append(content)
+        logger.info(f"Updated '{file_path}' to version {new_version}.")
 
     if files_backup:
         files_backup = chain(files_backup, zip(updated_files, original_contents))
     else:
         files_backup = zip(updated_files, original_contents)
 
-    if project_file not in updated_files:
-        logger.error(f"Failed to update version in  '{project_file}'.")
-        raise ValueError(f"Failed to update version in '{project_file}'.")
+
+def changelog_entry(date: str, new_version: Version, changes: str) -> str:
+    """Return the changelog entry of a release."""
+    return f"## [{new_version}] - {date}\n\n ### Changes\n{changes}\n\n"
+
+
+def insert_changelog_entry(changelog_path: str, entry: str) -> Tuple[str, str]:
+    """Return the current content of the changelog file and its content with the entry added."""
+    changelog_file = Path(changelog_path)
+    if changelog_file.exists():
+        current_content = changelog_file.read_text()
+        # Find the position after the first heading
+        if "\n## " in current_content:
+            header, rest = current_content.split("\n## ", 1)
+            new_content = f"{header}\n{entry}\n\n## {rest}"
+        else:
+            new_content = f"{current_content}\n\n{entry}\n"
+    else:
+        current_content = ""
+        new_content = f"# Changelog\n\n{entry}\n"
+    return current_content, new_content
 
 
 def update_changelog(changelog_path: str, date: str, new_version: Version, changes: str) -> Optional[str]:
@@ -325,29 +594,16 @@ def update_changelog(changelog_path: str, date: str, new_version: Version, chang
 
     print(f"-Updating '{changelog_path}' to {new_version}.")
     try:
-        changelog_entry = f"## [{new_version}] - {date}\n\n ### Changes\n"
-        changelog_entry += changes + "\n\n"
-        changelog_entry = open_in_editor("changelog entry", changelog_entry, "md")
-        changelog_file = Path(changelog_path)
-        if changelog_file.exists():
-            current_content = changelog_file.read_text()
-            # Find the position after the first heading
-            if "\n## " in current_content:
-                header, rest = current_content.split("\n## ", 1)
-                new_content = f"{header}\n{changelog_entry}\n\n## {rest}"
-            else:
-                new_content = f"{current_content}\n\n{changelog_entry}\n"
-        else:
-            current_content = ""
-            new_content = f"# Changelog\n\n{changelog_entry}\n"
-        changelog_file.write_text(new_content)
+        entry = open_in_editor("changelog entry", changelog_entry(date, new_version, changes), "md")
+        current_content, new_content = insert_changelog_entry(changelog_path, entry)
+        Path(changelog_path).write_text(new_content)
 
         if files_backup:
-            files_backup = chain(files_backup, zip([str(changelog_file)], [current_content]))
+            files_backup = chain(files_backup, zip([changelog_path], [current_content]))
         else:
-            files_backup = zip([str(changelog_file)], [current_content])
+            files_backup = zip([changelog_path], [current_content])
 
-        return changelog_entry
+        return entry
 
     except Exception as e:
         logger.error(e)
@@ -447,9 +703,14 @@ def create_commit(
     return commit_message
 
 
+def release_tag(new_version: Version) -> str:
+    """Return the name of the tag of a release."""
+    return f"v{new_version}"
+
+
 def create_tag(date: str, new_version: Version, changes: str) -> None:
     """Create a tag for the release."""
-    tag = f"v{new_version}"
+    tag = release_tag(new_version)
     logger.info(f"Creating tag: {tag}")
     if "Changes" in changes:
         _, changes = changes.split("Changes", 1)
@@ -459,28 +720,30 @@ def create_tag(date: str, new_version: Version, changes: str) -> None:
     subprocess.run(["git", "tag", "-a", tag, "-m", tag_message], check=True)
 
 
-def save_state(start_dt: datetime, current_version: Version) -> None:
+def save_state(refs: ReleaseRefs, current_version: Version) -> None:
     """Save the state to allow for rollover after release is succesful."""
     global files_backup  # noqa: F824
 
     try:
         with open(BEFORE_LAST_RELEASE, "wb") as f:
-            pickle.dump((start_dt, current_version, files_backup), f)
+            pickle.dump((refs, current_version, files_backup), f)
         logger.info("Release state saved successfully to allow for rolloever.")
     except Exception as e:
         logger.error(f"Failed to save release state: {e}")
         raise RuntimeError(f"Failed to save release state: {e}")
 
 
-def load_state() -> Tuple[datetime, Version, Optional[Iterator[Tuple[str, str]]]]:
+def load_state() -> Tuple[ReleaseRefs, Version, Optional[Iterator[Tuple[str, str]]]]:
     """Load the state to allow for rollback after release is succesful."""
     global files_backup  # noqa: F824
 
     try:
         with open(BEFORE_LAST_RELEASE, "rb") as f:
-            start_dt, current_version, files_backup = pickle.load(f)
+            refs, current_version, files_backup = pickle.load(f)
+        if not isinstance(refs, ReleaseRefs):
+            raise ValueError("the release was saved by an older version of this script, roll it back manually")
         logger.info("Release state loaded successfully to allow for rolloever.")
-        return start_dt, current_version, files_backup
+        return refs, current_version, files_backup
     except FileNotFoundError:
         logger.warning("No saved release found.")
         raise FileNotFoundError("No saved release found.")
@@ -489,35 +752,58 @@ def load_state() -> Tuple[datetime, Version, Optional[Iterator[Tuple[str, str]]]
         raise RuntimeError(f"Failed to load release state: {e}")
 
 
-def rollback(start_dt: datetime) -> None:
-    """Rollback changes if something goes wrong."""
+def send_ref_commands(transaction: "subprocess.Popen[str]", *commands: str) -> bool:
+    """Send commands to a ``git update-ref --stdin`` transaction and return whether the last one succeeded."""
+    assert transaction.stdin is not None and transaction.stdout is not None
+    try:
+        transaction.stdin.write("".join(f"{command}\n" for command in commands))
+        transaction.stdin.flush()
+    except BrokenPipeError:
+        return False
+    return transaction.stdout.readline().strip() == f"{commands[-1]}: ok"
+
+
+def rollback(refs: Optional[ReleaseRefs]) -> bool:
+    """
+    Rollback changes if something goes wrong.
+
+    The recorded tag and release commit are undone in a single ref transaction. The refs are locked and checked
+    against the recorded release first, and only updated once the files of the commit before the release are
+    checked out, so nothing changes if any of those refs moved since the release, e.g. after amending the
+    release commit, or if a file changed by the release has local changes.
+
+    Returns:
+        Whether the rollback succeeded.
+    """
     global files_backup  # noqa: F824
 
     logger.info("Rolling back changes...")
     try:
-        # Check if last tag is after the script start
-        last_tag = subprocess.check_output(["git", "describe", "--tags", "--abbrev=0"], text=True).strip()
-        last_tag_commit_dt_str = subprocess.check_output(
-            ["git", "log", "-1", "--format=%cd", "--date=iso-strict", last_tag], text=True
-        ).strip()
-        last_tag_commit_dt = datetime.fromisoformat(last_tag_commit_dt_str)
-        if last_tag_commit_dt > start_dt:
-            # Delete the last tag
-            print(f"-Deleting tag: {last_tag}")
-            subprocess.run(["git", "tag", "-d", last_tag], check=True)
-
-        # Check if last commit is after the script start
-        last_commit_dt_str = subprocess.check_output(
-            ["git", "log", "-1", "--format=%cd", "--date=iso-strict"], text=True
-        ).strip()
-        last_commit_dt = datetime.fromisoformat(last_commit_dt_str)
-        if last_commit_dt > start_dt:
-            # Reset to previous commit
-            print("-Deleting last commit")
-            subprocess.run(["git", "reset", "--hard", "HEAD~1"], check=True)
-
-        # Restore version files from backup
-        if files_backup:
+        if refs and refs.commit:
+            updates = [f"update HEAD {refs.before} {refs.commit}"]
+            if refs.tag and refs.tag_object:
+                print(f"-Deleting tag: {refs.tag.removeprefix('refs/tags/')}")
+                updates.append(f"delete {refs.tag} {refs.tag_object}")
+            print(f"-Deleting release commit: {refs.commit[:7]}")
+            with subprocess.Popen(
+                ["git", "update-ref", "-m", "release: rollback", "--stdin"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+            ) as transaction:
+                started = send_ref_commands(transaction, "start")
+                if not (started and send_ref_commands(transaction, *updates, "prepare")):
+                    raise subprocess.CalledProcessError(transaction.wait(), transaction.args)
+                # Check out the files of the commit before the release, refusing to overwrite local changes
+                subprocess.run(["git", "update-index", "-q", "--refresh"], stdout=subprocess.DEVNULL, check=False)
+                checkout = subprocess.run(["git", "read-tree", "-m", "-u", refs.commit, refs.before], check=False)
+                if checkout.returncode:
+                    send_ref_commands(transaction, "abort")
+                    raise subprocess.CalledProcessError(checkout.returncode, checkout.args)
+                if not send_ref_commands(transaction, "commit"):
+                    raise subprocess.CalledProcessError(transaction.wait(), transaction.args)
+        elif files_backup:
+            # Restore version files from backup
             for file_path, original_content in files_backup:
                 file = Path(file_path)
                 if file.exists():
@@ -525,10 +811,12 @@ def rollback(start_dt: datetime) -> None:
                     file.write_text(original_content)
 
         logger.info("Rollback complete")
+        return True
 
     except subprocess.CalledProcessError as e:
         logger.error(f"Error during rollback: {e}")
         logger.error("Manual intervention may be required")
+        return False
 
 
 def main() -> None:
@@ -546,6 +834,12 @@ def main() -> None:
         release_parser.add_argument("--pre", choices=[t.value for t in PrereleaseType], help="Type of pre-release")
         release_parser.add_argument("--changes", nargs=1, help="Changes for changelog")
 
+        # Plan release command
+        plan_parser = subparsers.add_parser("plan", help="Show the changes of a new release without making them")
+        plan_parser.add_argument("type", choices=[t.value for t in ReleaseType], help="Type of release")
+        plan_parser.add_argument("--pre", choices=[t.value for t in PrereleaseType], help="Type of pre-release")
+        plan_parser.add_argument("--changes", nargs=1, help="Changes for changelog")
+
         # Rollback command
         subparsers.add_parser("rollback", help="Rollback last release")
 
@@ -569,14 +863,24 @@ def main() -> None:
             print("1. Review the changes: CHANGLOG.md entry, latest commit and latest tag.")
             print("2. Run: git push && git push --tags")
 
+        elif args.command == "plan":
+            new_version, tag, diff = plan_release(
+                ReleaseType(args.type),
+                PrereleaseType(args.pre) if args.pre else None,
+                changes_message=args.changes[0] if args.changes else None,
+            )
+            print(diff, end="")
+            print(f"Release {new_version} would be committed and tagged as {tag}")
+
         elif args.command == "rollback":
             print("Caution: This will rollback the last release and will delete your latest commit and tag.")
             answer = input("Are you sure you want to continue? (y/n): ")
             if answer.lower() != "y":
                 print("Rollback cancelled.")
                 sys.exit(0)
-            start_dt, current_version, files_backup = load_state()
-            rollback(start_dt)
+            refs, current_version, files_backup = load_state()
+            if not rollback(refs):
+                raise RuntimeError("Rollback failed, manual intervention is required")
             if os.path.exists(BEFORE_LAST_RELEASE):
                 os.remove(BEFORE_LAST_RELEASE)
             print(f"Successfully rolled back to {current_version}")
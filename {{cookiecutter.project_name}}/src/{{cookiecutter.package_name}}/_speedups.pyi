@@ -0,0 +1,12 @@
+from typing import (
+    Iterable,
+    List,
+    Union,
+)
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+FNV_OFFSET: int
+
+def fnv1a_64(data: Buffer, seed: int = ...) -> int: ...
+def fnv1a_64_batch(items: Iterable[Buffer], seed: int = ...) -> List[int]: ...
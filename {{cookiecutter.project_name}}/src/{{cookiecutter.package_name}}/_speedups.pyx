@@ -0,0 +1,32 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled implementation of the hot-path functions in speedups.py.
+
+Built by build.py; it must behave exactly like _speedups_py.py, which the tests check.
+"""
+
+from libc.stdint cimport uint64_t
+
+
+FNV_OFFSET = 0xCBF29CE484222325
+cdef uint64_t FNV_PRIME = 0x100000001B3
+
+
+cdef inline uint64_t fnv1a(const unsigned char[:] data, uint64_t value) noexcept nogil:
+    cdef Py_ssize_t i
+    for i in range(data.shape[0]):
+        value = (value ^ data[i]) * FNV_PRIME
+    return value
+
+
+def fnv1a_64(const unsigned char[:] data, uint64_t seed=FNV_OFFSET):
+    """Return the 64-bit FNV-1a hash of a bytes-like object."""
+    cdef uint64_t value
+    with nogil:
+        value = fnv1a(data, seed)
+    return value
+
+
+def fnv1a_64_batch(items, uint64_t seed=FNV_OFFSET):
+    """Return the 64-bit FNV-1a hash of every bytes-like object in ``items``."""
+    return [fnv1a(item, seed) for item in items]
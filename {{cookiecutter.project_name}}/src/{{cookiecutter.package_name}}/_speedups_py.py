@@ -0,0 +1,27 @@
+"""Pure-Python implementation of the hot-path functions, used when the compiled extension is unavailable."""
+
+from typing import (
+    Iterable,
+    List,
+    Union,
+)
+
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+FNV_OFFSET = 0xCBF29CE484222325
+FNV_PRIME = 0x100000001B3
+MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def fnv1a_64(data: Buffer, seed: int = FNV_OFFSET) -> int:
+    """Return the 64-bit FNV-1a hash of a bytes-like object."""
+    value = seed
+    for byte in memoryview(data).cast("B"):
+        value = ((value ^ byte) * FNV_PRIME) & MASK
+    return value
+
+
+def fnv1a_64_batch(items: Iterable[Buffer], seed: int = FNV_OFFSET) -> List[int]:
+    """Return the 64-bit FNV-1a hash of every bytes-like object in ``items``."""
+    return [fnv1a_64(item, seed) for item in items]
@@ -0,0 +1,28 @@
+"""
+Bounded caches and memoization.
+
+``Cache`` evicts least recently used entries beyond an entry count or byte budget and expires entries
+after a TTL, ``DiskCache`` adds a persistent SQLite tier below it and ``memoize`` caches the results of
+functions and coroutine functions. Every cache reports its hit rate through ``Cache.stats``.
+"""
+
+from .cache import (
+    Cache,
+    CacheStats,
+    estimate_size,
+)
+from .disk import DiskCache
+from .memoize import (
+    make_key,
+    memoize,
+)
+
+
+__all__ = [
+    "Cache",
+    "CacheStats",
+    "DiskCache",
+    "estimate_size",
+    "make_key",
+    "memoize",
+]
@@ -0,0 +1,196 @@
+"""
+Bounded in-memory cache with LRU and TTL eviction.
+
+Entries are evicted least recently used first once ``max_entries`` or ``max_bytes`` is exceeded, and
+expire ``ttl`` seconds after they were stored. Sizes are estimated with ``estimate_size`` unless a
+``sizeof`` function is given; a value larger than ``max_bytes`` on its own is not cached at all.
+
+    cache = Cache(max_entries=10_000, max_bytes=64 * 1024 * 1024, ttl=300, name="users")
+    user = cache.get(user_id)
+    if user is None:
+        user = cache.set(user_id, load_user(user_id))
+
+With a ``disk`` tier, values missing from memory are looked up on disk and stored values are written to
+both. When ``name`` is given, hits and misses are also counted by the package instrumentation.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    NamedTuple,
+    Optional,
+)
+
+from .. import instrumentation
+from .disk import DiskCache
+
+
+MISSING: Any = object()
+# Nested containers are sized up to this depth, deeper objects count with their shallow size only
+SIZE_DEPTH = 3
+
+
+class Entry(NamedTuple):
+    value: Any
+    size: int
+    expires: float
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def estimate_size(value: Any, depth: int = SIZE_DEPTH) -> int:
+    """Estimate the memory held by a value, following the items of containers up to ``depth`` levels."""
+    size = sys.getsizeof(value)
+    if depth <= 0 or isinstance(value, (str, bytes, bytearray, memoryview)):
+        return size
+    if isinstance(value, dict):
+        return size + sum(estimate_size(k, depth - 1) + estimate_size(v, depth - 1) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, depth - 1) for item in value)
+    return size
+
+
+class Cache:
+    """Thread-safe mapping bounded by entries and bytes, with optional expiry and disk tier."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 1024,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        disk: Optional[DiskCache] = None,
+        name: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries is None and max_bytes is None:
+            raise ValueError("An unbounded cache is a memory leak, set max_entries or max_bytes")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.disk = disk
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = CacheStats()
+        self._hit_counter = instrumentation.counter(f"cache.{name}.hit") if name else None
+        self._miss_counter = instrumentation.counter(f"cache.{name}.miss") if name else None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= self.clock():
+                self._remove(key)
+                self._stats.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._record(hit=True)
+                return entry.value
+        if self.disk is not None:
+            found = self.disk.lookup(key)
+            if found is not None:
+                # Promoted for the lifetime the entry has left on disk, so it never outlives the stored one
+                value, ttl = found
+                self._store(key, value, ttl)
+                self._record(hit=True)
+                return value
+        self._record(hit=False)
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> Any:
+        """Store a value, returning it so the call can be chained with its computation."""
+        ttl = self.ttl if ttl is None else ttl
+        self._store(key, value, ttl)
+        if self.disk is not None:
+            self.disk.set(key, value, ttl)
+        return value
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.entries = self._stats.bytes = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def expire(self) -> int:
+        """Drop the expired entries now instead of on their next lookup and return how many were dropped."""
+        now = self.clock()
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if entry.expires <= now]
+            for key in expired:
+                self._remove(key)
+            self._stats.expirations += len(expired)
+        return len(expired)
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.expires > self.clock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            expires = self.clock() + ttl if ttl is not None else float("inf")
+            self._entries[key] = Entry(value, size, expires)
+            self._stats.entries += 1
+            self._stats.bytes += size
+            while (self.max_entries is not None and self._stats.entries > self.max_entries) or (
+                self.max_bytes is not None and self._stats.bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._stats.entries -= 1
+        self._stats.bytes -= entry.size
+
+    def _record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+        counter = self._hit_counter if hit else self._miss_counter
+        if counter is not None:
+            counter.add()
@@ -0,0 +1,135 @@
+"""
+On-disk cache tier backed by SQLite.
+
+Values are pickled into a single SQLite file, so they survive restarts and can be shared by the
+processes of one host. The file is bounded by ``max_bytes`` of pickled data, evicting the least recently
+used entries first, and entries expire ``ttl`` seconds (wall-clock time) after they were stored.
+
+Only cache data written by this package: unpickling data from an untrusted file can run arbitrary code.
+"""
+
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Optional,
+    Tuple,
+    Union,
+)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+class DiskCache:
+    """Persistent cache tier bounded by the total size of the pickled values."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # WAL lets readers in other processes proceed while one process writes
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    @staticmethod
+    def key(key: Hashable) -> str:
+        """Turn a cache key into a stable text key; keys must be picklable."""
+        return hashlib.sha256(pickle.dumps(key, protocol=4)).hexdigest()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found = self.lookup(key)
+        return default if found is None else found[0]
+
+    def lookup(self, key: Hashable) -> Optional[Tuple[Any, Optional[float]]]:
+        """Return a stored value and the seconds it has left before expiring, None if it is missing or expired."""
+        digest, now = self.key(key), self.clock()
+        with self._lock:
+            row = self._db.execute("SELECT value, expires FROM entries WHERE key = ?", (digest,)).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (digest,))
+                return None
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, digest))
+        return pickle.loads(row[0]), None if row[1] is None else row[1] - now
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        now = self.clock()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                    (self.key(key), data, len(data), now + ttl if ttl is not None else None, now),
+                )
+                self._evict(now)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (self.key(key),))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+
+    @property
+    def size(self) -> int:
+        """Total size of the stored pickled values in bytes."""
+        with self._lock:
+            return int(self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM entries ORDER BY accessed, rowid").fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", evicted)
@@ -0,0 +1,102 @@
+"""
+Memoization of functions and coroutine functions through a bounded ``Cache``.
+
+Unlike ``functools.lru_cache`` the cache is bounded in bytes as well as entries, entries can expire, and
+hit rates are visible through ``cache.stats``::
+
+    users = Cache(max_entries=10_000, ttl=60)
+
+    @memoize(users)
+    async def fetch_user(user_id: int) -> User: ...
+
+Concurrent calls of a memoized coroutine function with the same arguments share a single call, so a
+burst of misses on a cold key does not stampede the backend. Exceptions are never cached.
+"""
+
+import asyncio
+import functools
+import inspect
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from .cache import (
+    MISSING,
+    Cache,
+)
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Separates the positional from the keyword arguments in keys, picklable so keys work with DiskCache
+KWARGS_MARK = ("__kwargs__",)
+
+
+def make_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+    """Build a key from call arguments; all of them must be hashable."""
+    if not kwargs:
+        return args
+    return (*args, KWARGS_MARK, *sorted(kwargs.items()))
+
+
+def memoize(
+    cache: Optional[Cache] = None,
+    *,
+    key: Callable[[Tuple[Any, ...], Dict[str, Any]], Hashable] = make_key,
+    ttl: Optional[float] = None,
+) -> Callable[[F], F]:
+    """
+    Cache the results of a function or coroutine function.
+
+    Args:
+        cache: Cache holding the results, by default a new one with 1024 entries.
+        key: Builds the cache key from the positional and keyword arguments.
+        ttl: Expiry of the results, by default the one of the cache.
+    """
+    store = cache if cache is not None else Cache()
+
+    def decorate(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            pending: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                cache_key = key(args, kwargs)
+                value = store.get(cache_key, MISSING)
+                if value is not MISSING:
+                    return value
+                call = pending.get(cache_key)
+                if call is None:
+                    call = asyncio.ensure_future(func(*args, **kwargs))
+                    pending[cache_key] = call
+                    call.add_done_callback(lambda done: finish(cache_key, done))
+                # Shielded so a cancelled caller does not cancel the call shared with the others
+                return await asyncio.shield(call)
+
+            def finish(cache_key: Hashable, call: "asyncio.Future[Any]") -> None:
+                pending.pop(cache_key, None)
+                if not call.cancelled() and call.exception() is None:
+                    store.set(cache_key, call.result(), ttl)
+
+            setattr(async_wrapper, "cache", store)
+            return cast(F, async_wrapper)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache_key = key(args, kwargs)
+            value = store.get(cache_key, MISSING)
+            if value is MISSING:
+                value = store.set(cache_key, func(*args, **kwargs), ttl)
+            return value
+
+        setattr(wrapper, "cache", store)
+        return cast(F, wrapper)
+
+    return decorate
@@ -0,0 +1,146 @@
+"""
+Zero-copy file I/O: memory-mapped readers, a chunk iterator and streaming record parsers.
+
+``f.read()`` copies a whole file into the process heap, so memory grows with the file. These helpers keep
+it bounded whatever the file size: ``MappedFile`` maps the file and lets the OS page it in and out on
+demand, ``iter_chunks`` reads into a single reused buffer, and the record parsers hand out slices of the
+mapping instead of copies::
+
+    for line in iter_lines("events.log"):
+        if line[:5] == b"ERROR":
+            errors.append(bytes(line))
+
+The views yielded by the iterators borrow memory that is reused or unmapped afterwards: they are only
+valid until the next item is requested. Copy what has to be kept with ``bytes(view)``, or turn a view into
+an array without copying with ``numpy.frombuffer(view, dtype)``.
+"""
+
+import mmap
+import os
+import struct
+from typing import (
+    Any,
+    BinaryIO,
+    Generator,
+    Tuple,
+    Union,
+)
+
+
+PathLike = Union[str, "os.PathLike[str]"]
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class MappedFile:
+    """
+    Read-only memory mapping of a file, exposed as a ``memoryview``.
+
+    Args:
+        path: File to map.
+        sequential: Hint the OS to read ahead and drop pages behind, for a single front-to-back pass.
+    """
+
+    def __init__(self, path: PathLike, sequential: bool = False) -> None:
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # Empty files cannot be mapped
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        if self._mmap is not None and sequential and hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+        self.view = memoryview(self._mmap if self._mmap is not None else b"")
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def find(self, sub: bytes, start: int = 0, end: int = -1) -> int:
+        """Return the lowest offset of ``sub`` at or after ``start``, -1 when it is not found."""
+        if self._mmap is None:
+            return -1
+        return self._mmap.find(sub, start, len(self) if end < 0 else end)
+
+    def close(self) -> None:
+        try:
+            self.view.release()
+            if self._mmap is not None:
+                self._mmap.close()
+        except BufferError:
+            # Views kept by the caller still use the mapping, it is unmapped once they are released
+            pass
+        self._file.close()
+
+    def __enter__(self) -> "MappedFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def iter_chunks(
+    source: Union[PathLike, BinaryIO], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Generator[memoryview, None, None]:
+    """Yield the content of a file or binary stream in chunks read into one reused buffer."""
+    stream = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    try:
+        while True:
+            read = stream.readinto(view)  # type: ignore[attr-defined]
+            if not read:
+                break
+            chunk = view[:read]
+            yield chunk
+            chunk.release()
+    finally:
+        view.release()
+        if stream is not source:
+            stream.close()
+
+
+def iter_lines(path: PathLike, keepends: bool = False) -> Generator[memoryview, None, None]:
+    """Yield the lines of a file as views of its mapping, without the trailing newline unless ``keepends``."""
+    with MappedFile(path, sequential=True) as mapped:
+        start, size = 0, len(mapped)
+        while start < size:
+            newline = mapped.find(b"\n", start)
+            end = size if newline < 0 else newline + 1
+            line = mapped.view[start : end if keepends or newline < 0 else newline]
+            yield line
+            line.release()
+            start = end
+
+
+def iter_records(path: PathLike, fmt: str) -> Generator[Tuple[Any, ...], None, None]:
+    """
+    Unpack a file of fixed-size binary records, e.g. ``"<qd"`` for a timestamp and a value.
+
+    Raises:
+        ValueError: The file size is not a multiple of the record size.
+    """
+    record = struct.Struct(fmt)
+    with MappedFile(path, sequential=True) as mapped:
+        if len(mapped) % record.size:
+            raise ValueError(f"{path}: size {len(mapped)} is not a multiple of the {record.size}-byte record")
+        yield from record.iter_unpack(mapped.view)
+
+
+def iter_length_prefixed(path: PathLike, prefix: str = "<I") -> Generator[memoryview, None, None]:
+    """
+    Yield the payloads of a file of length-prefixed records as views of its mapping.
+
+    Raises:
+        ValueError: The last record is truncated.
+    """
+    header = struct.Struct(prefix)
+    with MappedFile(path, sequential=True) as mapped:
+        offset, size = 0, len(mapped)
+        while offset < size:
+            if offset + header.size > size:
+                raise ValueError(f"{path}: truncated record header at offset {offset}")
+            (length,) = header.unpack_from(mapped.view, offset)
+            start = offset + header.size
+            if start + length > size:
+                raise ValueError(f"{path}: truncated record at offset {offset}")
+            payload = mapped.view[start : start + length]
+            yield payload
+            payload.release()
+            offset = start + length
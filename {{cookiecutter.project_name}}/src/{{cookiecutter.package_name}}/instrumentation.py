@@ -0,0 +1,367 @@
+"""
+Hot-path instrumentation: timers, counters and histograms exported to a JSON-lines file.
+
+Instrumentation is off by default, and then every instrumented call costs a single flag check. It is
+enabled with ``{{ cookiecutter.package_name.upper() }}_INSTRUMENT=1`` set in the environment or in the
+``.env`` file of the working directory, which is read like ``run.sh try-load-dotenv`` reads it
+(``KEY=value`` lines, comments and blank lines skipped) and, as there, takes precedence over exported
+variables. The settings are read when a metric is first created or the instrumentation configured::
+
+    from {{ cookiecutter.package_name }}.instrumentation import counter, histogram, timed
+
+    @timed()
+    def parse(line: str) -> Record: ...
+
+    counter("cache.miss").add()
+    histogram("batch.size", buckets=(1, 10, 100, 1000)).observe(len(batch))
+
+Metrics are aggregated in memory and their values since the previous flush are appended to
+``{{ cookiecutter.package_name.upper() }}_INSTRUMENT_FILE`` (default ``instrumentation.jsonl``) every
+``{{ cookiecutter.package_name.upper() }}_INSTRUMENT_FLUSH_INTERVAL`` seconds (default 60) and at exit.
+Summarize a file with ``python -m {{ cookiecutter.package_name }}.instrumentation instrumentation.jsonl``.
+"""
+
+import argparse
+import atexit
+import bisect
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    cast,
+)
+
+
+ENV_PREFIX = "{{ cookiecutter.package_name.upper() }}_INSTRUMENT"
+DEFAULT_FILE = "instrumentation.jsonl"
+DEFAULT_FLUSH_INTERVAL = 60.0
+# Upper bounds of the duration buckets in seconds: powers of two from 1 microsecond to about 2 minutes
+DURATION_BUCKETS = tuple(1e-6 * 2**i for i in range(28))
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def read_dotenv(path: Path) -> Dict[str, str]:
+    """Read ``KEY=value`` lines the way ``run.sh try-load-dotenv`` does, skipping comments and blank lines."""
+    values: Dict[str, str] = {}
+    if path.is_file():
+        for line in path.read_text().splitlines():
+            key, separator, value = line.partition("=")
+            if line and not line.startswith("#") and separator:
+                values[key] = value
+    return values
+
+
+def environment_settings(dotenv: Path = Path(".env")) -> Dict[str, str]:
+    """Return the exported environment variables overridden by the ``.env`` values, as ``run.sh`` exports them."""
+    return {**os.environ, **read_dotenv(dotenv)}
+
+
+class Counter:
+    """Monotonic count of events, e.g. cache misses or retries."""
+
+    def __init__(self, registry: "Registry", name: str) -> None:
+        self.registry = registry
+        self.name = name
+        self.value = 0
+
+    def add(self, amount: int = 1) -> None:
+        if not self.registry.enabled:
+            return
+        with self.registry.lock:
+            self.value += amount
+        self.registry.maybe_flush()
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """Return the count since the previous snapshot and reset it, None when nothing was counted."""
+        if not self.value:
+            return None
+        record = {"type": "counter", "name": self.name, "value": self.value}
+        self.value = 0
+        return record
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets, e.g. durations or batch sizes."""
+
+    def __init__(self, registry: "Registry", name: str, buckets: Sequence[float] = DURATION_BUCKETS) -> None:
+        self.registry = registry
+        self.name = name
+        self.bounds = tuple(sorted(buckets))
+        self._reset()
+
+    def _reset(self) -> None:
+        # The last bucket counts the values above the highest bound
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value: float) -> None:
+        if not self.registry.enabled:
+            return
+        index = bisect.bisect_left(self.bounds, value)
+        with self.registry.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+        self.registry.maybe_flush()
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """Return the distribution since the previous snapshot and reset it, None when nothing was observed."""
+        if not self.count:
+            return None
+        bounds: List[Optional[float]] = [*self.bounds, None]
+        record = {
+            "type": "histogram",
+            "name": self.name,
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            "buckets": [[bound, count] for bound, count in zip(bounds, self.counts) if count],
+        }
+        self._reset()
+        return record
+
+
+class Registry:
+    """Named metrics sharing an enable switch and a JSON-lines sink."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        path: Union[str, Path] = DEFAULT_FILE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        self.enabled = enabled
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.metrics: Dict[str, Union[Counter, Histogram]] = {}
+        self.last_flush = time.monotonic()
+
+    @classmethod
+    def from_settings(cls, settings: Mapping[str, str]) -> "Registry":
+        return cls(
+            enabled=settings.get(ENV_PREFIX, "").lower() in ("1", "true", "yes", "on"),
+            path=settings.get(f"{ENV_PREFIX}_FILE") or DEFAULT_FILE,
+            flush_interval=float(settings.get(f"{ENV_PREFIX}_FLUSH_INTERVAL") or DEFAULT_FLUSH_INTERVAL),
+        )
+
+    def configure(
+        self,
+        enabled: Optional[bool] = None,
+        path: Union[str, Path, None] = None,
+        flush_interval: Optional[float] = None,
+    ) -> None:
+        """Change the settings at runtime, e.g. to enable instrumentation from a test or a CLI flag."""
+        if enabled is not None:
+            self.enabled = enabled
+        if path is not None:
+            self.path = Path(path)
+        if flush_interval is not None:
+            self.flush_interval = flush_interval
+
+    def counter(self, name: str) -> Counter:
+        """Return the counter with the given name, creating it on first use."""
+        metric = self.metrics.get(name)
+        if metric is None:
+            with self.lock:
+                metric = self.metrics.setdefault(name, Counter(self, name))
+        if not isinstance(metric, Counter):
+            raise TypeError(f"Metric '{name}' is a {type(metric).__name__}, not a Counter")
+        return metric
+
+    def histogram(self, name: str, buckets: Sequence[float] = DURATION_BUCKETS) -> Histogram:
+        """Return the histogram with the given name, creating it with the given buckets on first use."""
+        metric = self.metrics.get(name)
+        if metric is None:
+            with self.lock:
+                metric = self.metrics.setdefault(name, Histogram(self, name, buckets))
+        if not isinstance(metric, Histogram):
+            raise TypeError(f"Metric '{name}' is a {type(metric).__name__}, not a Histogram")
+        return metric
+
+    def timed(self, name: Optional[str] = None) -> Callable[[F], F]:
+        """Decorate a function or coroutine function to record its durations, named after it by default."""
+
+        def decorate(func: F) -> F:
+            metric = self.histogram(name or f"{func.__module__}.{func.__qualname__}")
+
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    start = time.perf_counter()
+                    try:
+                        return await func(*args, **kwargs)
+                    finally:
+                        metric.observe(time.perf_counter() - start)
+
+                return cast(F, async_wrapper)
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    metric.observe(time.perf_counter() - start)
+
+            return cast(F, wrapper)
+
+        return decorate
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Record the duration of a block; prefer ``timed`` in tight loops, it is cheaper when disabled."""
+        if not self.enabled:
+            yield
+            return
+        metric = self.histogram(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            metric.observe(time.perf_counter() - start)
+
+    def maybe_flush(self) -> None:
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> int:
+        """Append the metric values since the previous flush to the sink and return the number of records."""
+        with self.lock:
+            self.last_flush = time.monotonic()
+            snapshots = [metric.snapshot() for metric in self.metrics.values()]
+        records = [record for record in snapshots if record is not None]
+        if records:
+            header = {"time": round(time.time(), 3), "pid": os.getpid()}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                for record in records:
+                    f.write(json.dumps({**header, **record}) + "\n")
+        return len(records)
+
+
+def quantile(buckets: Mapping[Optional[float], int], count: int, maximum: float, q: float) -> float:
+    """Estimate a quantile as the upper bound of the bucket holding it, capped by the maximum."""
+    seen = 0
+    for bound in sorted(buckets, key=lambda bound: float("inf") if bound is None else bound):
+        seen += buckets[bound]
+        if seen >= q * count:
+            return maximum if bound is None else min(bound, maximum)
+    return maximum
+
+
+def summarize(path: Union[str, Path]) -> Dict[str, Dict[str, Any]]:
+    """Merge the records of a JSON-lines file into one total per metric."""
+    totals: Dict[str, Dict[str, Any]] = {}
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            total = totals.setdefault(
+                record["name"],
+                {"type": record["type"], "value": 0, "count": 0, "sum": 0.0, "min": None, "max": None, "buckets": {}},
+            )
+            if record["type"] == "counter":
+                total["value"] += record["value"]
+                continue
+            total["count"] += record["count"]
+            total["sum"] += record["sum"]
+            total["min"] = record["min"] if total["min"] is None else min(total["min"], record["min"])
+            total["max"] = record["max"] if total["max"] is None else max(total["max"], record["max"])
+            for bound, count in record["buckets"]:
+                total["buckets"][bound] = total["buckets"].get(bound, 0) + count
+    for total in totals.values():
+        if total["type"] == "histogram":
+            total["mean"] = total["sum"] / total["count"]
+            for q in (0.5, 0.99):
+                total[f"p{round(q * 100)}"] = quantile(total["buckets"], total["count"], total["max"], q)
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarize an instrumentation JSON-lines file")
+    parser.add_argument("path", nargs="?", default=DEFAULT_FILE, help=f"Metrics file (default: {DEFAULT_FILE})")
+    args = parser.parse_args()
+
+    totals = summarize(args.path)
+    print(f"{'metric':<48} {'count':>10} {'mean':>10} {'p50':>10} {'p99':>10} {'max':>10}")
+    for name, total in sorted(totals.items()):
+        if total["type"] == "counter":
+            print(f"{name:<48} {total['value']:>10}")
+        else:
+            values = " ".join(f"{total[key]:>10.4g}" for key in ("mean", "p50", "p99", "max"))
+            print(f"{name:<48} {total['count']:>10} {values}")
+
+
+_registry: Optional[Registry] = None
+_registry_lock = threading.Lock()
+
+
+def registry() -> Registry:
+    """Return the package registry, created from the settings of the environment and ``.env`` on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = Registry.from_settings(environment_settings())
+                atexit.register(_registry.flush)
+    return _registry
+
+
+def configure(
+    enabled: Optional[bool] = None,
+    path: Union[str, Path, None] = None,
+    flush_interval: Optional[float] = None,
+) -> None:
+    registry().configure(enabled, path, flush_interval)
+
+
+def counter(name: str) -> Counter:
+    return registry().counter(name)
+
+
+def histogram(name: str, buckets: Sequence[float] = DURATION_BUCKETS) -> Histogram:
+    return registry().histogram(name, buckets)
+
+
+def timed(name: Optional[str] = None) -> Callable[[F], F]:
+    return registry().timed(name)
+
+
+def timer(name: str) -> ContextManager[None]:
+    return registry().timer(name)
+
+
+def flush() -> int:
+    return registry().flush()
+
+
+if __name__ == "__main__":
+    main()
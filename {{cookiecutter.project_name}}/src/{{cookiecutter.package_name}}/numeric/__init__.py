@@ -0,0 +1,31 @@
+"""
+Numeric core: array-backed containers and batched operations.
+
+The operations have plain Python reference implementations (``*_scalar``) next to their vectorized
+versions; kernels that cannot be vectorized are compiled with numba when it is installed (see ``accel``).
+"""
+
+from .accel import ENABLED as ACCELERATED
+from .accel import jit
+from .containers import (
+    TimeSeries,
+    TimeSeriesBuilder,
+)
+from .ops import (
+    ewma,
+    pairwise_distances,
+    rolling_mean,
+    zscore,
+)
+
+
+__all__ = [
+    "ACCELERATED",
+    "TimeSeries",
+    "TimeSeriesBuilder",
+    "ewma",
+    "jit",
+    "pairwise_distances",
+    "rolling_mean",
+    "zscore",
+]
@@ -0,0 +1,34 @@
+"""
+Optional numba acceleration.
+
+Kernels decorated with ``jit`` are compiled by numba in nopython mode when it is installed
+(``poetry install -E accel``) and run as plain Python otherwise, so numba is never required. Set
+``{{ cookiecutter.package_name.upper() }}_DISABLE_JIT=1`` to run the plain Python kernels even when numba
+is installed, e.g. to step through them in a debugger.
+"""
+
+import importlib
+import os
+from typing import (
+    Any,
+    Callable,
+    TypeVar,
+)
+
+
+try:
+    numba: Any = importlib.import_module("numba")
+except ImportError:
+    numba = None
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+ENABLED = numba is not None and not os.environ.get("{{ cookiecutter.package_name.upper() }}_DISABLE_JIT")
+
+
+def jit(func: F) -> F:
+    """Compile ``func`` with numba when acceleration is enabled, otherwise return it unchanged."""
+    if not ENABLED:
+        return func
+    return numba.njit(cache=True)(func)
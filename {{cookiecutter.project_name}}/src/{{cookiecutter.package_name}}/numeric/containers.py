@@ -0,0 +1,96 @@
+"""
+Array-backed containers for time series data.
+
+``TimeSeries`` keeps timestamps and values in two NumPy arrays instead of a list of Python objects, so a
+million samples take 16 MB rather than hundreds, and every query is a vectorized operation. Slicing by
+time returns views that share memory with the original series. ``TimeSeriesBuilder`` collects samples
+one at a time or in batches into preallocated buffers that grow geometrically.
+"""
+
+from typing import (
+    Iterable,
+    Tuple,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+
+class TimeSeries:
+    """Samples ordered by integer timestamp, one float value (or one row of values) per timestamp."""
+
+    def __init__(self, timestamps: npt.ArrayLike, values: npt.ArrayLike) -> None:
+        self.timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        if self.timestamps.ndim != 1 or len(self.values) != len(self.timestamps):
+            raise ValueError("timestamps must be one-dimensional and match the number of values")
+        if len(self.timestamps) > 1 and np.any(self.timestamps[1:] < self.timestamps[:-1]):
+            raise ValueError("timestamps must be sorted")
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[int, float]]) -> "TimeSeries":
+        """Build a series from ``(timestamp, value)`` pairs without intermediate Python lists."""
+        data = np.fromiter(records, dtype=[("timestamp", np.int64), ("value", np.float64)])
+        return cls(data["timestamp"], data["value"])
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def window(self, start: int, stop: int) -> "TimeSeries":
+        """Samples with ``start <= timestamp < stop``, as a view on this series' arrays."""
+        first, last = np.searchsorted(self.timestamps, [start, stop], side="left")
+        return TimeSeries(self.timestamps[first:last], self.values[first:last])
+
+    def bucket_mean(self, width: int) -> "TimeSeries":
+        """Average the samples in consecutive buckets of ``width`` time units, labelled by bucket start."""
+        if width < 1:
+            raise ValueError("width must be at least 1")
+        if not len(self):
+            return self
+        buckets = self.timestamps // width
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+        counts = np.diff(np.append(starts, len(buckets)))
+        sums = np.add.reduceat(self.values, starts, axis=0)
+        means = sums / counts.reshape((-1,) + (1,) * (self.values.ndim - 1))
+        return TimeSeries(buckets[starts] * width, means)
+
+
+class TimeSeriesBuilder:
+    """Accumulate samples in place; appending is amortized O(1) and ``extend`` copies whole batches."""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._timestamps = np.empty(max(1, capacity), dtype=np.int64)
+        self._values = np.empty(max(1, capacity), dtype=np.float64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._timestamps):
+            return
+        capacity = max(size, 2 * len(self._timestamps))
+        self._timestamps = np.resize(self._timestamps, capacity)
+        self._values = np.resize(self._values, capacity)
+
+    def append(self, timestamp: int, value: float) -> None:
+        self._reserve(self._size + 1)
+        self._timestamps[self._size] = timestamp
+        self._values[self._size] = value
+        self._size += 1
+
+    def extend(self, timestamps: npt.ArrayLike, values: npt.ArrayLike) -> None:
+        timestamps, values = np.asarray(timestamps), np.asarray(values)
+        if len(timestamps) != len(values):
+            raise ValueError("timestamps and values must have the same length")
+        end = self._size + len(timestamps)
+        self._reserve(end)
+        self._timestamps[self._size : end] = timestamps
+        self._values[self._size : end] = values
+        self._size = end
+
+    def build(self) -> TimeSeries:
+        """Return the collected samples sorted by timestamp; the builder can keep accumulating."""
+        timestamps, values = self._timestamps[: self._size], self._values[: self._size]
+        order = np.argsort(timestamps, kind="stable")
+        return TimeSeries(timestamps[order], values[order])
@@ -0,0 +1,103 @@
+"""
+Batched numeric operations.
+
+Every operation works on a whole array at once, and on a batch of series when given a 2-D array (one
+series per row). The ``*_scalar`` functions are plain Python reference implementations: the tests check
+the fast paths against them and the benchmarks measure how much faster the fast paths are.
+"""
+
+import math
+from typing import (
+    List,
+    Sequence,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+from .accel import jit
+
+
+FloatArray = npt.NDArray[np.float64]
+
+
+def as_float_array(values: npt.ArrayLike) -> FloatArray:
+    """Return ``values`` as a C-contiguous float64 array, without copying when it already is one."""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def rolling_mean(values: npt.ArrayLike, window: int) -> FloatArray:
+    """Mean of every ``window`` consecutive values along the last axis, computed from a cumulative sum."""
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    array = as_float_array(values)
+    if array.shape[-1] < window:
+        return np.empty(array.shape[:-1] + (0,))
+    cumulative = np.cumsum(array, axis=-1)
+    sums = cumulative[..., window - 1 :].copy()
+    sums[..., 1:] -= cumulative[..., :-window]
+    return sums / window
+
+
+def rolling_mean_scalar(values: Sequence[float], window: int) -> List[float]:
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    return [sum(values[i : i + window]) / window for i in range(len(values) - window + 1)]
+
+
+def zscore(values: npt.ArrayLike) -> FloatArray:
+    """Standardize values along the last axis to zero mean and unit variance; constant series become 0."""
+    array = as_float_array(values)
+    mean = array.mean(axis=-1, keepdims=True)
+    std = array.std(axis=-1, keepdims=True)
+    return np.divide(array - mean, std, out=np.zeros_like(array), where=std > 0)
+
+
+def zscore_scalar(values: Sequence[float]) -> List[float]:
+    mean = sum(values) / len(values)
+    std = math.sqrt(sum((value - mean) ** 2 for value in values) / len(values))
+    return [(value - mean) / std if std > 0 else 0.0 for value in values]
+
+
+def pairwise_distances(points: npt.ArrayLike, others: npt.ArrayLike) -> FloatArray:
+    """Euclidean distances between every row of ``points`` (n x d) and every row of ``others`` (m x d)."""
+    a, b = as_float_array(points), as_float_array(others)
+    squared = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2.0 * (a @ b.T)
+    return np.sqrt(np.maximum(squared, 0.0))
+
+
+def pairwise_distances_scalar(
+    points: Sequence[Sequence[float]], others: Sequence[Sequence[float]]
+) -> List[List[float]]:
+    return [[math.dist(point, other) for other in others] for point in points]
+
+
+@jit
+def _ewma_rows(values: FloatArray, alpha: float, out: FloatArray) -> None:
+    # The recurrence depends on the previous output, so it cannot be vectorized; numba compiles the loop
+    for row in range(values.shape[0]):
+        average = values[row, 0]
+        for i in range(values.shape[1]):
+            average = alpha * values[row, i] + (1.0 - alpha) * average
+            out[row, i] = average
+
+
+def ewma(values: npt.ArrayLike, alpha: float) -> FloatArray:
+    """Exponentially weighted moving average along the last axis, seeded with the first value."""
+    if not 0.0 < alpha <= 1.0:
+        raise ValueError("alpha must be in (0, 1]")
+    array = as_float_array(values)
+    rows = array.reshape(-1, array.shape[-1]) if array.ndim != 1 else array[None, :]
+    out = np.empty_like(rows)
+    if rows.shape[1]:
+        _ewma_rows(rows, alpha, out)
+    return out.reshape(array.shape)
+
+
+def ewma_scalar(values: Sequence[float], alpha: float) -> List[float]:
+    result: List[float] = []
+    average = values[0] if values else 0.0
+    for value in values:
+        average = alpha * value + (1.0 - alpha) * average
+        result.append(average)
+    return result
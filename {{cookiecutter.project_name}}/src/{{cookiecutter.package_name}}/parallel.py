@@ -0,0 +1,242 @@
+"""
+Chunked, ordered map over a process pool, with shared-memory buffers for large array inputs.
+
+``parallel_map`` sends the items to the worker processes in chunks, so the per-item pickling and IPC
+overhead is paid once per chunk, and yields the results in input order. Only a few chunks are submitted
+ahead of the results being consumed, which bounds the memory held by pending results::
+
+    for result in parallel_map(score, documents, max_workers=8):
+        ...
+
+Large arrays should not be pickled into every task: ``SharedArray`` copies a buffer (a NumPy array, an
+``array.array``, ``bytes``...) once into shared memory, and its handle pickles to a few bytes::
+
+    with SharedArray.copy_of(samples) as shared:
+        totals = list(parallel_map(functools.partial(window_sum, shared), ranges))
+
+    def window_sum(shared: SharedArray, bounds: Tuple[int, int]) -> float:
+        return sum(shared.view()[bounds[0] : bounds[1]])
+
+Functions and items must be picklable, so the functions have to be defined at module level. An exception
+in a worker stops the map: pending chunks are cancelled and a ``WorkerError`` naming the failing item is
+raised, chained to the original traceback. Closing the iterator early, or interrupting it, also cancels
+the pending chunks and shuts down the pool it created.
+"""
+
+import itertools
+import os
+import sys
+from collections import (
+    OrderedDict,
+    deque,
+)
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+)
+from multiprocessing import shared_memory
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Chunks submitted per worker ahead of the consumer, so workers never wait for the next chunk
+CHUNKS_AHEAD = 2
+# Chunks per worker when the chunk size is derived from the number of items, to balance uneven items
+CHUNKS_PER_WORKER = 4
+DEFAULT_CHUNKSIZE = 16
+# Shared memory blocks a process keeps attached; the least recently used one is closed beyond that
+MAX_ATTACHED = 8
+
+
+class WorkerError(Exception):
+    """An item raised an exception in a worker process."""
+
+    def __init__(self, index: int, error: str) -> None:
+        super().__init__(index, error)
+        self.index = index
+        self.error = error
+
+    def __str__(self) -> str:
+        return f"item {self.index} failed: {self.error}"
+
+
+def _run_chunk(func: Callable[[T], R], start: int, chunk: List[T]) -> List[R]:
+    results = []
+    for offset, item in enumerate(chunk):
+        try:
+            results.append(func(item))
+        except Exception as e:
+            raise WorkerError(start + offset, f"{type(e).__name__}: {e}") from e
+    return results
+
+
+def worker_count(max_workers: Optional[int] = None) -> int:
+    return max_workers or os.cpu_count() or 1
+
+
+def parallel_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    chunksize: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Generator[R, None, None]:
+    """
+    Apply ``func`` to every item in worker processes and yield the results in input order.
+
+    Args:
+        func: Module-level function applied to each item.
+        items: Items to process, consumed lazily as chunks are submitted.
+        chunksize: Items per task, by default derived from the number of items and workers.
+        max_workers: Number of worker processes, by default the number of CPUs.
+        executor: Pool to run the chunks on instead of a new ``ProcessPoolExecutor``, e.g. to reuse
+            warm workers across calls. It is left running.
+
+    Raises:
+        WorkerError: An item raised an exception.
+        concurrent.futures.process.BrokenProcessPool: A worker process died, e.g. killed for memory.
+    """
+    workers = worker_count(max_workers)
+    if chunksize is None:
+        size = len(items) if isinstance(items, Sequence) else None
+        chunksize = max(1, -(-size // (workers * CHUNKS_PER_WORKER))) if size else DEFAULT_CHUNKSIZE
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    return _map(func, iter(items), chunksize, workers, executor)
+
+
+def _map(
+    func: Callable[[T], R], items: Iterator[T], chunksize: int, workers: int, executor: Optional[Executor]
+) -> Generator[R, None, None]:
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    pending: Deque["Future[List[R]]"] = deque()
+    start = 0
+
+    def submit() -> bool:
+        nonlocal start
+        chunk = list(itertools.islice(items, chunksize))
+        if not chunk:
+            return False
+        pending.append(pool.submit(_run_chunk, func, start, chunk))
+        start += len(chunk)
+        return True
+
+    try:
+        while len(pending) < workers * CHUNKS_AHEAD and submit():
+            pass
+        while pending:
+            results = pending.popleft().result()
+            submit()
+            yield from results
+    finally:
+        for future in pending:
+            future.cancel()
+        if executor is None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _typed_view(buffer: memoryview, format: str, shape: Tuple[int, ...]) -> memoryview:
+    # typeshed only accepts literal format characters
+    return buffer.cast(format, shape)  # type: ignore[call-overload]
+
+
+# Shared memory blocks attached by this process, kept open while the process reuses them across chunks
+_attached: "OrderedDict[str, shared_memory.SharedMemory]" = OrderedDict()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    memory = _attached.get(name)
+    if memory is not None:
+        _attached.move_to_end(name)
+        return memory
+    # Before Python 3.13, attaching also registers the block with the resource tracker, which may unlink it
+    # or warn about a leak at shutdown although the creating process owns it
+    if sys.version_info >= (3, 13):
+        memory = _attached[name] = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        memory = _attached[name] = shared_memory.SharedMemory(name=name)
+    while len(_attached) > MAX_ATTACHED:
+        _, evicted = _attached.popitem(last=False)
+        try:
+            evicted.close()
+        except BufferError:
+            # A view is still in use; the mapping is released once it is garbage collected
+            pass
+    return memory
+
+
+class SharedArray:
+    """
+    A buffer copied once into shared memory, readable from worker processes without pickling it.
+
+    The process that created it owns the shared memory and releases it on ``close`` or when leaving the
+    ``with`` block; pickled copies only carry its name, format and shape.
+    """
+
+    def __init__(self, name: str, format: str, shape: Tuple[int, ...], nbytes: int) -> None:
+        self.name = name
+        self.format = format
+        self.shape = shape
+        self.nbytes = nbytes
+        self._memory: Optional[shared_memory.SharedMemory] = None
+
+    @classmethod
+    def copy_of(cls, data: Any) -> "SharedArray":
+        """Copy any object supporting the buffer protocol into a new shared memory block."""
+        view = memoryview(data)
+        if not view.c_contiguous:
+            view = _typed_view(memoryview(view.tobytes()), view.format, tuple(view.shape or ()))
+        # Shared memory blocks cannot be empty
+        memory = shared_memory.SharedMemory(create=True, size=max(view.nbytes, 1))
+        cast(memoryview, memory.buf)[: view.nbytes] = view.cast("B")
+        shared = cls(memory.name, view.format, tuple(view.shape or ()), view.nbytes)
+        shared._memory = memory
+        return shared
+
+    def view(self) -> memoryview:
+        """Return a zero-copy view with the original format and shape, attaching to the memory if needed."""
+        memory = self._memory or _attach(self.name)
+        return _typed_view(cast(memoryview, memory.buf)[: self.nbytes], self.format, self.shape)
+
+    def asarray(self) -> Any:
+        """Return a zero-copy NumPy array over the shared memory; NumPy must be installed."""
+        import numpy
+
+        return numpy.asarray(self.view())
+
+    def close(self) -> None:
+        """Release and remove the shared memory; only has an effect in the process that created it."""
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"name": self.name, "format": self.format, "shape": self.shape, "nbytes": self.nbytes}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state, _memory=None)
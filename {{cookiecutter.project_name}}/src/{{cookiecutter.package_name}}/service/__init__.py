@@ -0,0 +1,32 @@
+"""
+Concurrency building blocks for asyncio services.
+
+``ConnectionPool`` bounds the connections to a backend, ``Batcher`` groups single requests into batches,
+``WorkQueue`` applies backpressure to producers and ``GracefulShutdown`` drains all of them on SIGTERM.
+``testing`` provides in-process servers to test them against.
+"""
+
+from .batching import Batcher
+from .pool import (
+    ConnectionPool,
+    PoolClosed,
+    PoolStats,
+    PoolTimeout,
+)
+from .shutdown import GracefulShutdown
+from .work_queue import (
+    QueueClosed,
+    WorkQueue,
+)
+
+
+__all__ = [
+    "Batcher",
+    "ConnectionPool",
+    "GracefulShutdown",
+    "PoolClosed",
+    "PoolStats",
+    "PoolTimeout",
+    "QueueClosed",
+    "WorkQueue",
+]
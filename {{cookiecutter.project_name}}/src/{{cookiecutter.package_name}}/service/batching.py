@@ -0,0 +1,101 @@
+"""
+Request batching.
+
+Callers submit single items and await their own result, while the handler receives them in batches of up
+to ``max_batch_size`` items. A batch is dispatched as soon as it is full, or ``max_delay`` seconds after
+its first item arrived, so batching adds at most that much latency under light load and saves a round
+trip per item under heavy load.
+
+    async def lookup_many(keys: List[str]) -> List[bytes]:
+        return await database.fetch_many(keys)
+
+    batcher = Batcher(lookup_many, max_batch_size=100, max_delay=0.005)
+    value = await batcher.submit("key")
+"""
+
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class Batcher(Generic[T, R]):
+    def __init__(
+        self,
+        handler: Callable[[List[T]], Awaitable[Sequence[R]]],
+        max_batch_size: int = 100,
+        max_delay: float = 0.005,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self._handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: List[Tuple[T, "asyncio.Future[R]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set["asyncio.Task[None]"] = set()
+        self._closed = False
+        self.batches = 0
+        self.items = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    async def submit(self, item: T) -> R:
+        """Queue ``item`` for the next batch and wait for its result."""
+        if self._closed:
+            raise RuntimeError("batcher is closed")
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[R]" = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[T, "asyncio.Future[R]"]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await self._handler([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"batch handler returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            # Callers that gave up waiting have cancelled their future
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Dispatch the items still pending and wait for all running batches to finish."""
+        self._closed = True
+        self._flush()
+        await asyncio.gather(*self._running, return_exceptions=True)
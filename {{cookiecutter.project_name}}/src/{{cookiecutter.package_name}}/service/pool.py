@@ -0,0 +1,176 @@
+"""
+Bounded connection pool.
+
+At most ``max_size`` connections are open at any time; callers beyond that wait for a connection to be
+released, up to ``acquire_timeout`` seconds, instead of opening more and overloading the server. Idle
+connections are reused most recently released first, so a burst does not keep every connection warm, and
+are closed once idle for longer than ``max_idle_time``. A connection released after an error is closed
+rather than reused.
+
+    pool = ConnectionPool(lambda: LineConnection.open(host, port), LineConnection.close, max_size=10)
+    async with pool.connection() as connection:
+        reply = await connection.request("ping")
+    await pool.close()
+"""
+
+import asyncio
+import contextlib
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+
+C = TypeVar("C")
+
+
+class PoolClosed(RuntimeError):
+    """The pool was closed and does not hand out connections anymore."""
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the acquire timeout."""
+
+
+@dataclass
+class PoolStats:
+    size: int
+    idle: int
+    in_use: int
+    waiting: int
+    created: int
+    reused: int
+
+
+class ConnectionPool(Generic[C]):
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[C]],
+        close: Callable[[C], Awaitable[None]],
+        max_size: int = 10,
+        acquire_timeout: Optional[float] = None,
+        max_idle_time: Optional[float] = None,
+        check: Optional[Callable[[C], bool]] = None,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._connect = connect
+        self._close = close
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.max_idle_time = max_idle_time
+        self._check = check
+        self._idle: Deque[Tuple[C, float]] = deque()
+        self._condition = asyncio.Condition()
+        # Connections open or being opened
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._created = 0
+        self._reused = 0
+        self._closed = False
+
+    def stats(self) -> PoolStats:
+        return PoolStats(self._size, len(self._idle), self._in_use, self._waiting, self._created, self._reused)
+
+    def _usable(self, connection: C, released_at: float) -> bool:
+        loop = asyncio.get_running_loop()
+        if self.max_idle_time is not None and loop.time() - released_at > self.max_idle_time:
+            return False
+        return self._check is None or self._check(connection)
+
+    async def acquire(self) -> C:
+        """Return an idle connection, open a new one if below ``max_size``, or wait for one to be released."""
+        loop = asyncio.get_running_loop()
+        deadline = None if self.acquire_timeout is None else loop.time() + self.acquire_timeout
+        stale: List[C] = []
+        try:
+            async with self._condition:
+                while True:
+                    if self._closed:
+                        raise PoolClosed("connection pool is closed")
+                    while self._idle:
+                        connection, released_at = self._idle.pop()
+                        if self._usable(connection, released_at):
+                            self._in_use += 1
+                            self._reused += 1
+                            return connection
+                        stale.append(connection)
+                        self._size -= 1
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    await self._wait(deadline)
+        finally:
+            for connection in stale:
+                await self._close_quietly(connection)
+
+        try:
+            connection = await self._connect()
+        except BaseException:
+            async with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        self._in_use += 1
+        self._created += 1
+        return connection
+
+    async def _wait(self, deadline: Optional[float]) -> None:
+        timeout = None if deadline is None else deadline - asyncio.get_running_loop().time()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._condition.wait(), timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeout(f"no connection available within {self.acquire_timeout}s") from None
+        finally:
+            self._waiting -= 1
+
+    async def release(self, connection: C, discard: bool = False) -> None:
+        """Return a connection to the pool, or close it when ``discard`` is set or the pool is closed."""
+        async with self._condition:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((connection, asyncio.get_running_loop().time()))
+            self._condition.notify_all()
+        if discard or self._closed:
+            await self._close_quietly(connection)
+
+    @contextlib.asynccontextmanager
+    async def connection(self) -> AsyncIterator[C]:
+        """Acquire a connection for the duration of the block; it is discarded if the block raises."""
+        connection = await self.acquire()
+        try:
+            yield connection
+        except BaseException:
+            await self.release(connection, discard=True)
+            raise
+        await self.release(connection)
+
+    async def close(self, timeout: Optional[float] = None) -> None:
+        """Stop handing out connections, wait up to ``timeout`` for those in use, and close the idle ones."""
+        async with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._condition.wait_for(lambda: self._in_use == 0), timeout)
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+        for connection in idle:
+            await self._close_quietly(connection)
+
+    async def _close_quietly(self, connection: C) -> None:
+        with contextlib.suppress(Exception):
+            await self._close(connection)
@@ -0,0 +1,102 @@
+"""
+Graceful shutdown on SIGINT and SIGTERM.
+
+The first signal sets an event the service waits on; the service then stops accepting new work and the
+registered cleanup callbacks run in reverse order of registration (close the server before the pools it
+uses). Each callback gets at most ``timeout`` seconds, so a stuck one cannot keep the process alive forever
+nor stop the others from running.
+
+    async def main() -> None:
+        async with GracefulShutdown(timeout=30) as shutdown:
+            queue = WorkQueue()
+            shutdown.on_shutdown(queue.shutdown)
+            await serve_until(shutdown.wait())
+"""
+
+import asyncio
+import logging
+import signal
+from types import TracebackType
+from typing import (
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Sequence,
+    Type,
+)
+
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[], Awaitable[None]]
+
+
+class GracefulShutdown:
+    def __init__(
+        self, timeout: float = 30.0, signals: Sequence[signal.Signals] = (signal.SIGINT, signal.SIGTERM)
+    ) -> None:
+        self.timeout = timeout
+        self.signals = signals
+        self._event = asyncio.Event()
+        self._callbacks: List[Callback] = []
+        self._installed: List[signal.Signals] = []
+
+    @property
+    def requested(self) -> bool:
+        return self._event.is_set()
+
+    def trigger(self) -> None:
+        """Request the shutdown, as receiving one of the signals does."""
+        if not self._event.is_set():
+            logger.info("Shutdown requested")
+        self._event.set()
+
+    async def wait(self) -> None:
+        await self._event.wait()
+
+    def on_shutdown(self, callback: Callback) -> Callback:
+        """Register a cleanup coroutine function; can be used as a decorator."""
+        self._callbacks.append(callback)
+        return callback
+
+    def install(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in self.signals:
+            try:
+                loop.add_signal_handler(sig, self.trigger)
+            except (NotImplementedError, RuntimeError):
+                # Not supported on Windows event loops or outside the main thread
+                continue
+            self._installed.append(sig)
+
+    def uninstall(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in self._installed:
+            loop.remove_signal_handler(sig)
+        self._installed.clear()
+
+    async def run_callbacks(self) -> List[BaseException]:
+        """Run the cleanup callbacks newest first, each within the timeout, and return the errors they raised."""
+        errors: List[BaseException] = []
+        while self._callbacks:
+            callback = self._callbacks.pop()
+            try:
+                await asyncio.wait_for(callback(), self.timeout)
+            except Exception as e:
+                logger.error(f"Shutdown callback {callback!r} failed: {e!r}")
+                errors.append(e)
+        return errors
+
+    async def __aenter__(self) -> "GracefulShutdown":
+        self.install()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.uninstall()
+        await self.run_callbacks()
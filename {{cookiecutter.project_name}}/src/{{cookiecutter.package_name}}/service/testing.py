@@ -0,0 +1,124 @@
+"""
+In-process stand-in servers for tests.
+
+``LineServer`` is a real TCP server on a free localhost port that answers every newline-terminated request
+with ``handler(request)``, optionally after a delay to simulate a slow backend. It records how many
+connections it accepted and the peak number open at once, so tests can check that pools and queues really
+bound the load they put on a server. ``LineConnection`` is the matching client.
+
+    async with LineServer(str.upper, delay=0.01) as server:
+        connection = await LineConnection.open(server.host, server.port)
+        assert await connection.request("ping") == "PING"
+"""
+
+import asyncio
+import contextlib
+import inspect
+from types import TracebackType
+from typing import (
+    Awaitable,
+    Callable,
+    Optional,
+    Set,
+    Type,
+    Union,
+)
+
+
+Handler = Callable[[str], Union[str, Awaitable[str]]]
+
+
+def echo(request: str) -> str:
+    return request
+
+
+class LineServer:
+    def __init__(self, handler: Handler = echo, delay: float = 0.0, host: str = "127.0.0.1") -> None:
+        self.handler = handler
+        self.delay = delay
+        self.host = host
+        self.port = 0
+        self.connections = 0
+        self.active = 0
+        self.peak_active = 0
+        self.requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> "LineServer":
+        self._server = await asyncio.start_server(self._serve, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        self._writers.add(writer)
+        try:
+            while line := await reader.readline():
+                self.requests += 1
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                response = self.handler(line.decode().rstrip("\n"))
+                if inspect.isawaitable(response):
+                    response = await response
+                writer.write(f"{response}\n".encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.active -= 1
+            self._writers.discard(writer)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def __aenter__(self) -> "LineServer":
+        return await self.start()
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+
+class LineConnection:
+    """Client connection sending one line and reading one line back per request."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "LineConnection":
+        return cls(*await asyncio.open_connection(host, port))
+
+    @property
+    def closed(self) -> bool:
+        return self._writer.is_closing()
+
+    async def request(self, line: str) -> str:
+        self._writer.write(f"{line}\n".encode())
+        await self._writer.drain()
+        response = await self._reader.readline()
+        if not response:
+            raise ConnectionError("connection closed by the server")
+        return response.decode().rstrip("\n")
+
+    async def close(self) -> None:
+        self._writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self._writer.wait_closed()
@@ -0,0 +1,144 @@
+"""
+Work queue with backpressure.
+
+Jobs are coroutine functions run by a fixed number of worker tasks. The queue holds at most
+``max_pending`` jobs: ``submit`` waits for room when it is full, slowing producers down to the pace of the
+workers, while ``try_submit`` returns None instead so a caller can shed load (e.g. answer 503). Memory use
+stays bounded however fast work arrives.
+
+    async with WorkQueue(workers=8, max_pending=100) as queue:
+        future = await queue.submit(handle, request)
+        result = await future
+"""
+
+import asyncio
+import functools
+from types import TracebackType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+
+Job = Tuple[Callable[[], Awaitable[Any]], "asyncio.Future[Any]"]
+
+
+class QueueClosed(RuntimeError):
+    """The queue is shutting down and does not accept new jobs."""
+
+
+class WorkQueue:
+    def __init__(self, workers: int = 4, max_pending: int = 100) -> None:
+        if workers < 1 or max_pending < 1:
+            raise ValueError("workers and max_pending must be at least 1")
+        self.worker_count = workers
+        self._queue: "asyncio.Queue[Optional[Job]]" = asyncio.Queue(max_pending)
+        self._workers: List["asyncio.Task[None]"] = []
+        self._futures: Set["asyncio.Future[Any]"] = set()
+        self._closed = False
+        self.processed = 0
+        self.failed = 0
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self.worker_count)]
+
+    def _job(self, func: Callable[..., Awaitable[Any]], args: Tuple[Any, ...]) -> Job:
+        if self._closed:
+            raise QueueClosed("work queue is shutting down")
+        self.start()
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        return functools.partial(func, *args), future
+
+    async def submit(self, func: Callable[..., Awaitable[Any]], *args: Any) -> "asyncio.Future[Any]":
+        """Queue ``func(*args)``, waiting while the queue is full, and return the future of its result."""
+        job = self._job(func, args)
+        try:
+            await self._queue.put(job)
+        except BaseException:
+            job[1].cancel()
+            raise
+        return job[1]
+
+    def try_submit(self, func: Callable[..., Awaitable[Any]], *args: Any) -> "Optional[asyncio.Future[Any]]":
+        """Queue ``func(*args)`` if there is room, otherwise return None without waiting."""
+        if self._queue.full():
+            return None
+        job = self._job(func, args)
+        self._queue.put_nowait(job)
+        return job[1]
+
+    async def run(self, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Queue ``func(*args)`` and wait for its result."""
+        return await (await self.submit(func, *args))
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if job is None:
+                    return
+                func, future = job
+                if future.done():
+                    continue
+                try:
+                    result = await func()
+                except Exception as e:
+                    self.failed += 1
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    self.processed += 1
+                    if not future.done():
+                        future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+    async def shutdown(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting jobs and stop the workers.
+
+        Args:
+            drain: Finish the queued jobs first; otherwise they are cancelled.
+            timeout: Seconds to wait for the workers; jobs still running after that are cancelled.
+        """
+        self._closed = True
+        if not drain:
+            while not self._queue.empty():
+                job = self._queue.get_nowait()
+                if job is not None:
+                    job[1].cancel()
+                self._queue.task_done()
+        for _ in self._workers:
+            await self._queue.put(None)
+        if self._workers:
+            _, running = await asyncio.wait(self._workers, timeout=timeout)
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+        for future in list(self._futures):
+            future.cancel()
+
+    async def __aenter__(self) -> "WorkQueue":
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.shutdown(drain=exc_type is None)
@@ -0,0 +1,40 @@
+"""
+Hot-path functions with an optional compiled implementation.
+
+The compiled ``_speedups`` extension is used when it was built (see ``build.py``), otherwise the
+pure-Python implementation in ``_speedups_py`` is imported instead. ``COMPILED`` tells which one is in use.
+Setting the environment variable ``{{ cookiecutter.package_name.upper() }}_PURE_PYTHON=1`` forces the
+pure-Python implementation, e.g. to compare both.
+"""
+
+import os
+
+
+if os.environ.get("{{ cookiecutter.package_name.upper() }}_PURE_PYTHON"):
+    from ._speedups_py import (
+        FNV_OFFSET,
+        fnv1a_64,
+        fnv1a_64_batch,
+    )
+
+    COMPILED = False
+else:
+    try:
+        from ._speedups import (
+            FNV_OFFSET,
+            fnv1a_64,
+            fnv1a_64_batch,
+        )
+
+        COMPILED = True
+    except ImportError:
+        from ._speedups_py import (
+            FNV_OFFSET,
+            fnv1a_64,
+            fnv1a_64_batch,
+        )
+
+        COMPILED = False
+
+
+__all__ = ["COMPILED", "FNV_OFFSET", "fnv1a_64", "fnv1a_64_batch"]
@@ -8,3 +8,11 @@ TESTS_DIR_PARENT = (THIS_DIR / "..").resolve()
 
 # ensure that `from tests ...` import statements work within the tests/ dir
 sys.path.insert(0, str(TESTS_DIR_PARENT))
+
+pytest_plugins = [
+    "tests.plugins.timing",
+    "tests.plugins.asyncio_harness",
+    "tests.plugins.memory",
+    "tests.plugins.benchmark",
+    "tests.plugins.sharding",
+]
@@ -0,0 +1,231 @@
+"""
+Asyncio test harness: event loop policies, loop latency, task throughput and blocking-call detection.
+
+Async tests (``@pytest.mark.asyncio``) run on an event loop in debug mode whose slow callback threshold is
+``--blocking-threshold`` seconds (default 0.1). A synchronous call that blocks the loop for longer than that
+fails the test, unless the test is marked with ``allow_blocking``.
+
+The loop policy is selected with ``--event-loop-policy``. Passing several comma separated policies runs each
+async test once per policy for comparison, e.g. ``./run.sh tests --event-loop-policy=default,uvloop``.
+
+Fixtures:
+    loop_latency: Async context manager measuring how late the loop runs scheduled callbacks.
+    task_throughput: Coroutine running many tasks with bounded concurrency and reporting tasks per second.
+    blocking_calls: Slow callbacks reported by the loop so far in the current test.
+"""
+
+import asyncio
+import contextlib
+import inspect
+import logging
+import statistics
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+)
+
+import pytest
+
+
+POLICIES = ("default", "uvloop")
+DEFAULT_BLOCKING_THRESHOLD = 0.1
+
+
+class BlockingCallDetector(logging.Handler):
+    """Collect the slow callback warnings that asyncio logs when the loop runs in debug mode."""
+
+    def __init__(self) -> None:
+        super().__init__(level=logging.WARNING)
+        self.calls: List[str] = []
+        self._logger = logging.getLogger("asyncio")
+        self._previous_level = self._logger.level
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if isinstance(record.msg, str) and record.msg.startswith("Executing"):
+            self.calls.append(record.getMessage())
+
+    def install(self) -> None:
+        self._previous_level = self._logger.level
+        if self._logger.getEffectiveLevel() > logging.WARNING:
+            self._logger.setLevel(logging.WARNING)
+        self._logger.addHandler(self)
+
+    def uninstall(self) -> None:
+        self._logger.removeHandler(self)
+        self._logger.setLevel(self._previous_level)
+
+
+blocking_calls_key = pytest.StashKey[BlockingCallDetector]()
+
+
+class LoopLatencyProbe:
+    """Measure event loop latency as the delay between when a periodic timer is due and when it runs."""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def _probe(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - due))
+
+    async def __aenter__(self) -> "LoopLatencyProbe":
+        self.samples.clear()
+        self._task = asyncio.create_task(self._probe())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+    @property
+    def max(self) -> float:
+        return max(self.samples, default=0.0)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples) if self.samples else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Return the latency below which the given percentage of the samples fall."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+@dataclass
+class ThroughputResult:
+    tasks: int
+    seconds: float
+
+    @property
+    def per_second(self) -> float:
+        return self.tasks / self.seconds if self.seconds > 0 else float("inf")
+
+
+async def measure_throughput(
+    factory: Callable[[], Awaitable[Any]], tasks: int, concurrency: Optional[int] = None
+) -> ThroughputResult:
+    """Run ``tasks`` coroutines created by ``factory`` with at most ``concurrency`` in flight."""
+    semaphore = asyncio.Semaphore(concurrency or tasks)
+
+    async def run_one() -> None:
+        async with semaphore:
+            await factory()
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*(run_one() for _ in range(tasks)))
+    return ThroughputResult(tasks, loop.time() - start)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("asyncio-harness", "asyncio test harness")
+    group.addoption(
+        "--event-loop-policy",
+        default="default",
+        help=f"Comma separated event loop policies to run async tests on: {', '.join(POLICIES)} (default: default)",
+    )
+    group.addoption(
+        "--blocking-threshold",
+        type=float,
+        default=DEFAULT_BLOCKING_THRESHOLD,
+        help="Fail async tests when a callback blocks the event loop longer than this many seconds, 0 disables "
+        f"(default: {DEFAULT_BLOCKING_THRESHOLD})",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "allow_blocking: do not fail the test when a callback blocks the event loop")
+    for name in selected_policies(config):
+        new_policy(name)
+
+
+def selected_policies(config: pytest.Config) -> List[str]:
+    return [name.strip() for name in config.getoption("event_loop_policy").split(",") if name.strip()]
+
+
+def new_policy(name: str) -> asyncio.AbstractEventLoopPolicy:
+    """Create the event loop policy registered under the given name."""
+    if name == "default":
+        return asyncio.DefaultEventLoopPolicy()
+    if name == "uvloop":
+        try:
+            import uvloop
+        except ImportError:
+            raise pytest.UsageError("The uvloop event loop policy requires the uvloop package")
+        return uvloop.EventLoopPolicy()
+    raise pytest.UsageError(f"Unknown event loop policy '{name}', choose from: {', '.join(POLICIES)}")
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    policies = selected_policies(metafunc.config)
+    is_async = inspect.iscoroutinefunction(metafunc.function) or "event_loop" in metafunc.fixturenames
+    if len(policies) > 1 and is_async:
+        metafunc.parametrize("loop_policy_name", policies, indirect=True)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo[None]) -> Generator[None, Any, None]:
+    """Turn a passing async test into a failure when a callback blocked its event loop."""
+    outcome = yield
+    report = outcome.get_result()
+    detector = item.stash.get(blocking_calls_key, None)
+    if detector is None or not detector.calls or report.when != "call" or not report.passed:
+        return
+    if item.get_closest_marker("allow_blocking") is None:
+        report.outcome = "failed"
+        report.longrepr = "Blocking calls detected on the event loop:\n" + "\n".join(
+            f"  {blocking_call}" for blocking_call in detector.calls
+        )
+
+
+@pytest.fixture(autouse=True)
+def loop_policy_name(request: pytest.FixtureRequest) -> str:
+    """Name of the event loop policy the current test runs on."""
+    return str(getattr(request, "param", selected_policies(request.config)[0]))
+
+
+@pytest.fixture
+def event_loop(request: pytest.FixtureRequest, loop_policy_name: str) -> Iterator[asyncio.AbstractEventLoop]:
+    """Create the loop of each async test from the selected policy, with blocking-call detection."""
+    loop = new_policy(loop_policy_name).new_event_loop()
+    detector = BlockingCallDetector()
+    threshold = request.config.getoption("blocking_threshold")
+    if threshold > 0:
+        loop.set_debug(True)
+        loop.slow_callback_duration = threshold
+        detector.install()
+    request.node.stash[blocking_calls_key] = detector
+    yield loop
+    detector.uninstall()
+    loop.close()
+
+
+@pytest.fixture
+def blocking_calls(request: pytest.FixtureRequest, event_loop: asyncio.AbstractEventLoop) -> List[str]:
+    return request.node.stash[blocking_calls_key].calls
+
+
+@pytest.fixture
+def loop_latency() -> LoopLatencyProbe:
+    return LoopLatencyProbe()
+
+
+@pytest.fixture
+def task_throughput() -> Callable[..., Awaitable[ThroughputResult]]:
+    return measure_throughput
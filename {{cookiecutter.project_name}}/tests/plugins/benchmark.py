@@ -0,0 +1,138 @@
+"""
+Opt-in micro-benchmarks comparing implementations of the same operation.
+
+Tests marked with ``benchmark`` are skipped unless pytest runs with ``--benchmarks``, so the regular test
+suite stays fast. The ``bench`` fixture times callables like ``timeit`` does, calibrating the number of
+calls per round and keeping the best round::
+
+    @pytest.mark.benchmark
+    def test_vectorized_is_faster(bench) -> None:
+        scalar = bench.measure("scalar", rolling_mean_scalar, values, 10)
+        vectorized = bench.measure("vectorized", rolling_mean, array, 10)
+        assert vectorized.per_call * 5 < scalar.per_call
+
+Every measurement is listed in the terminal summary, relative to the first one of its test.
+"""
+
+import time
+from dataclasses import (
+    asdict,
+    dataclass,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    cast,
+)
+
+import pytest
+
+
+DEFAULT_ROUNDS = 5
+# Calls per round are increased until a round takes at least this many seconds
+MIN_ROUND_TIME = 0.02
+
+
+@dataclass
+class Timing:
+    name: str
+    per_call: float
+    number: int
+    rounds: int
+
+
+class Bench:
+    """Time callables and record the results on the test report."""
+
+    def __init__(self, node: pytest.Item, rounds: int = DEFAULT_ROUNDS) -> None:
+        self.node = node
+        self.rounds = rounds
+        self.timings: List[Timing] = []
+
+    def measure(self, name: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Timing:
+        """Return the best time per call of ``func(*args, **kwargs)`` over the configured rounds."""
+        number = 1
+        while True:
+            elapsed = self._round(func, number, args, kwargs)
+            if elapsed >= MIN_ROUND_TIME or number >= 1 << 20:
+                break
+            number *= 2 if elapsed <= 0 else max(2, min(10, int(MIN_ROUND_TIME / elapsed) + 1))
+        best = min([elapsed] + [self._round(func, number, args, kwargs) for _ in range(self.rounds - 1)])
+        timing = Timing(name, best / number, number, self.rounds)
+        self.timings.append(timing)
+        self.node.user_properties.append(("benchmark", asdict(timing)))
+        return timing
+
+    @staticmethod
+    def _round(func: Callable[..., Any], number: int, args: Any, kwargs: Dict[str, Any]) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args, **kwargs)
+        return time.perf_counter() - start
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks", "micro-benchmarks")
+    group.addoption("--benchmarks", action="store_true", help="Run the tests marked with 'benchmark'")
+    group.addoption(
+        "--benchmark-rounds",
+        type=int,
+        default=DEFAULT_ROUNDS,
+        help=f"Timed rounds per measurement, the best one is kept (default: {DEFAULT_ROUNDS})",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "benchmark: micro-benchmark, only run with --benchmarks")
+    if config.getoption("benchmarks"):
+        config.pluginmanager.register(BenchmarkReporter(), "benchmark-reporter")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item]) -> None:
+    if config.getoption("benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with --benchmarks")
+    for item in items:
+        if item.get_closest_marker("benchmark") is not None:
+            item.add_marker(skip)
+
+
+class BenchmarkReporter:
+    """Collect the measurements of all tests, also from pytest-xdist workers, and summarize them."""
+
+    def __init__(self) -> None:
+        self.results: Dict[str, List[Dict[str, Any]]] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        timings = [cast(Dict[str, Any], value) for name, value in report.user_properties if name == "benchmark"]
+        if report.when == "call" and timings:
+            self.results[report.nodeid] = timings
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.results:
+            return
+        terminalreporter.write_sep("=", "benchmarks: best time per call, relative to the first measurement")
+        for nodeid, timings in self.results.items():
+            terminalreporter.write_line(nodeid)
+            reference = timings[0]["per_call"]
+            for timing in timings:
+                relative = reference / timing["per_call"] if timing["per_call"] > 0 else float("inf")
+                terminalreporter.write_line(
+                    f"  {timing['name']:<24} {format_duration(timing['per_call']):>10} {relative:8.2f}x"
+                    f"  ({timing['number']} calls x {timing['rounds']} rounds)"
+                )
+
+
+def format_duration(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest) -> Bench:
+    """Measure the best time per call of callables, see ``Bench.measure``."""
+    return Bench(request.node, request.config.getoption("benchmark_rounds"))
@@ -0,0 +1,253 @@
+"""
+Per-test memory profiling with tracemalloc.
+
+With ``--memprofile`` the call phase of every test is traced and its peak and retained allocations are
+recorded in ``.perf/memory/latest.json``. Results are compared with a stored baseline
+(``.perf/memory/baseline.json`` by default, written with ``--memprofile-save-baseline``) and a test whose
+peak grows beyond ``--memprofile-tolerance`` fails. The terminal summary lists the tests with the highest
+peaks together with their top allocation sites.
+
+The ``memory_usage`` fixture traces allocations inside a single test without the command line option::
+
+    def test_load(memory_usage) -> None:
+        load_everything()
+        assert memory_usage.peak < 50 * 1024**2
+"""
+
+import gc
+import json
+import linecache
+import os
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
+
+import pytest
+
+
+BASELINE_FILE = ".perf/memory/baseline.json"
+RESULTS_FILE = ".perf/memory/latest.json"
+DEFAULT_TOLERANCE = 0.2
+DEFAULT_TOP = 5
+TRACE_FRAMES = 10
+# Growth below this many bytes is treated as noise when comparing with the baseline
+NOISE_BYTES = 64 * 1024
+
+
+def format_size(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class MemoryTracker:
+    """Trace the allocations made between ``start`` and ``stop`` with tracemalloc."""
+
+    def __init__(self, root: Optional[Path] = None, frames: int = TRACE_FRAMES) -> None:
+        self.root = str(root or Path.cwd())
+        self.frames = frames
+        self._owns_tracing = False
+        self._base = 0
+        self._before: Optional[tracemalloc.Snapshot] = None
+        self._after: Optional[tracemalloc.Snapshot] = None
+        self._final: Optional[Tuple[int, int]] = None
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(True, os.path.join(self.root, "*"), all_frames=True)]
+        )
+
+    def _is_project_frame(self, frame: tracemalloc.Frame) -> bool:
+        return frame.filename.startswith(self.root) and not any(
+            part in frame.filename for part in ("site-packages", __file__)
+        )
+
+    def start(self) -> "MemoryTracker":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracing = True
+        gc.collect()
+        self._before = self._snapshot()
+        tracemalloc.reset_peak()
+        self._base = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def stop(self) -> None:
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        self._final = (current - self._base, peak - self._base)
+        self._after = self._snapshot()
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def _traced(self) -> Tuple[int, int]:
+        if self._final is not None:
+            return self._final
+        current, peak = tracemalloc.get_traced_memory()
+        return current - self._base, peak - self._base
+
+    @property
+    def peak(self) -> int:
+        """Highest memory allocated on top of what was in use when tracing started."""
+        return max(0, self._traced()[1])
+
+    @property
+    def retained(self) -> int:
+        """Memory still allocated, net of what was in use when tracing started."""
+        return self._traced()[0]
+
+    def top(self, limit: int = DEFAULT_TOP) -> List[str]:
+        """
+        Return the project source lines whose live allocations grew the most since tracing started.
+
+        Allocations made inside libraries are attributed to the innermost project frame that led to them.
+        """
+        if self._before is None:
+            return []
+        after = self._after or self._snapshot()
+        growth: Dict[Tuple[str, int], List[int]] = defaultdict(lambda: [0, 0])
+        for stat in after.compare_to(self._before, "traceback"):
+            frame = next((frame for frame in reversed(stat.traceback) if self._is_project_frame(frame)), None)
+            if frame is not None:
+                growth[(frame.filename, frame.lineno)][0] += stat.size_diff
+                growth[(frame.filename, frame.lineno)][1] += stat.count_diff
+        sites = []
+        for (filename, lineno), (size, count) in sorted(growth.items(), key=lambda item: -item[1][0])[:limit]:
+            if size <= 0:
+                break
+            source = linecache.getline(filename, lineno).strip()
+            location = f"{os.path.relpath(filename, self.root)}:{lineno}"
+            sites.append(f"{location} +{format_size(size)} ({count} blocks) {source}")
+        return sites
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("memprofile", "per-test memory profiling")
+    group.addoption("--memprofile", action="store_true", help="Record peak and retained allocations of each test")
+    group.addoption(
+        "--memprofile-baseline",
+        default=BASELINE_FILE,
+        help=f"Baseline file to compare memory results with (default: {BASELINE_FILE})",
+    )
+    group.addoption(
+        "--memprofile-save-baseline", action="store_true", help="Store the results of this run as the new baseline"
+    )
+    group.addoption(
+        "--memprofile-tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"Allowed peak growth over the baseline as a fraction (default: {DEFAULT_TOLERANCE})",
+    )
+    group.addoption(
+        "--memprofile-top",
+        type=int,
+        default=DEFAULT_TOP,
+        help=f"Number of tests and allocation sites to report (default: {DEFAULT_TOP})",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("memprofile"):
+        config.pluginmanager.register(MemoryProfiler(config), "memory-profiler")
+
+
+class MemoryProfiler:
+    """Trace the call phase of every test and compare the results with the baseline."""
+
+    def __init__(self, config: pytest.Config) -> None:
+        self.config = config
+        root = Path(config.rootpath)
+        self.baseline_file = root / config.getoption("memprofile_baseline")
+        self.results_file = root / RESULTS_FILE
+        self.save_baseline: bool = config.getoption("memprofile_save_baseline")
+        self.tolerance: float = config.getoption("memprofile_tolerance")
+        self.top: int = config.getoption("memprofile_top")
+        self.baseline: Dict[str, Dict[str, Any]] = {}
+        if self.baseline_file.exists() and not self.save_baseline:
+            self.baseline = json.loads(self.baseline_file.read_text())
+        self.trackers: Dict[str, MemoryTracker] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item: pytest.Item) -> Generator[None, None, None]:
+        tracker = MemoryTracker(Path(self.config.rootpath)).start()
+        try:
+            yield
+        finally:
+            tracker.stop()
+            self.trackers[item.nodeid] = tracker
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item) -> Generator[None, Any, None]:
+        outcome = yield
+        report = outcome.get_result()
+        tracker = self.trackers.pop(item.nodeid, None)
+        if report.when != "call" or tracker is None:
+            return
+        result: Dict[str, Any] = {"peak": tracker.peak, "retained": tracker.retained, "top": tracker.top(self.top)}
+        # user_properties travel with the report, so results reach the pytest-xdist controller too
+        report.user_properties.append(("memory", result))
+        baseline = self.baseline.get(item.nodeid)
+        if report.passed and baseline:
+            allowed = max(baseline["peak"] * (1 + self.tolerance), baseline["peak"] + NOISE_BYTES)
+            if result["peak"] > allowed:
+                report.outcome = "failed"
+                report.longrepr = (
+                    f"Memory regression: peak {format_size(result['peak'])} exceeds baseline "
+                    f"{format_size(baseline['peak'])} by more than {self.tolerance:.0%}\n"
+                    + "\n".join(f"  {site}" for site in result["top"])
+                )
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        for name, value in report.user_properties:
+            if name == "memory":
+                self.results[report.nodeid] = cast(Dict[str, Any], value)
+
+    def pytest_sessionfinish(self) -> None:
+        if hasattr(self.config, "workerinput") or not self.results:
+            return
+        self.results_file.parent.mkdir(parents=True, exist_ok=True)
+        self.results_file.write_text(json.dumps(self.results, indent=2))
+        if self.save_baseline:
+            self.baseline_file.parent.mkdir(parents=True, exist_ok=True)
+            self.baseline_file.write_text(json.dumps(self.results, indent=2))
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if self.top <= 0 or not self.results:
+            return
+        highest = sorted(self.results.items(), key=lambda item: item[1]["peak"], reverse=True)[: self.top]
+        terminalreporter.write_sep(
+            "=", f"memory: top {len(highest)} tests by peak allocation, with retained allocation sites"
+        )
+        for nodeid, result in highest:
+            baseline = self.baseline.get(nodeid)
+            change = "new"
+            if baseline and baseline["peak"]:
+                change = f"{(result['peak'] - baseline['peak']) / baseline['peak']:+.0%}"
+            peak, retained = format_size(result["peak"]), format_size(result["retained"])
+            terminalreporter.write_line(f"{peak:>11} peak {retained:>11} retained {change:>6}  {nodeid}")
+            for site in result["top"]:
+                terminalreporter.write_line(f"{'':14}{site}")
+        if self.save_baseline:
+            terminalreporter.write_line(f"Memory baseline saved to {self.baseline_file}")
+
+
+@pytest.fixture
+def memory_usage(request: pytest.FixtureRequest) -> Iterator[MemoryTracker]:
+    """Trace the allocations made by the test; read ``peak``, ``retained`` and ``top()`` at any point."""
+    tracker = MemoryTracker(Path(request.config.rootpath)).start()
+    yield tracker
+    tracker.stop()
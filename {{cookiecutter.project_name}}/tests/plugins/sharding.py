@@ -0,0 +1,89 @@
+"""
+Split the test suite into shards that run in separate CI jobs.
+
+``--shard K/N`` keeps the K-th of N disjoint shards (1-based) of the collected tests and deselects the
+others, so N jobs run every test exactly once::
+
+    pytest --shard 1/4
+
+Tests are dealt round-robin in collection order by default. With ``--shard-durations`` pointing to a
+timings history (see ``tests.plugins.timing``) they are balanced by their latest recorded duration
+instead, the longest first onto the least loaded shard. Every shard must read the same history, e.g. a
+file committed to the repository, otherwise the shards overlap or miss tests.
+"""
+
+from pathlib import Path
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import pytest
+
+from tests.plugins.timing import read_history
+
+
+# Duration assumed for tests missing from the history
+DEFAULT_DURATION = 0.1
+SHARD_SUMMARY = pytest.StashKey[str]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("sharding", "test suite sharding")
+    group.addoption("--shard", help="Only run the K-th of N shards of the tests, given as K/N")
+    group.addoption("--shard-durations", help="Timings history used to balance the shards by duration")
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse ``K/N`` into a 0-based shard index and the number of shards."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise pytest.UsageError(f"--shard expects K/N, got '{value}'") from None
+    if not 1 <= index <= count:
+        raise pytest.UsageError(f"--shard {value}: K must be between 1 and N")
+    return index - 1, count
+
+
+def latest_durations(path: Path) -> Dict[str, float]:
+    """Return the duration of each test in the last run that recorded it."""
+    return {str(record["nodeid"]): float(record["duration"]) for record in read_history(path)}
+
+
+def assign_shards(nodeids: List[str], count: int, durations: Optional[Dict[str, float]] = None) -> List[int]:
+    """Return the shard of each test: round-robin, or the least loaded shard longest tests first."""
+    if durations is None:
+        return [position % count for position in range(len(nodeids))]
+    loads = [0.0] * count
+    shards = [0] * len(nodeids)
+    # Sorting on the node id as well keeps the assignment identical in every shard
+    order = sorted(range(len(nodeids)), key=lambda i: (-durations.get(nodeids[i], DEFAULT_DURATION), nodeids[i]))
+    for position in order:
+        shard = loads.index(min(loads))
+        shards[position] = shard
+        loads[shard] += durations.get(nodeids[position], DEFAULT_DURATION)
+    return shards
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item]) -> None:
+    value = config.getoption("shard")
+    if not value:
+        return
+    index, count = parse_shard(value)
+    history = config.getoption("shard_durations")
+    durations = latest_durations(Path(config.rootpath) / history) if history else None
+    shards = assign_shards([item.nodeid for item in items], count, durations)
+
+    selected = [item for item, shard in zip(items, shards) if shard == index]
+    deselected = [item for item, shard in zip(items, shards) if shard != index]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    config.stash[SHARD_SUMMARY] = f"shard {index + 1}/{count}: {len(selected)} of {len(items)} tests"
+    items[:] = selected
+
+
+def pytest_report_collectionfinish(config: pytest.Config) -> Optional[str]:
+    return config.stash.get(SHARD_SUMMARY, None)
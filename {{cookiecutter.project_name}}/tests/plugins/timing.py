@@ -0,0 +1,224 @@
+"""
+Per-test duration telemetry and time budget enforcement.
+
+Every test session appends the call duration of each test to a JSON-lines history store
+(``.perf/timings.jsonl`` by default), tagged with the current git commit. At the end of the
+session the slowest tests are reported together with their trend against previous commits.
+
+Tests can declare a time budget with the ``time_budget`` marker and fail when they exceed it::
+
+    @pytest.mark.time_budget(0.5)
+    def test_fast_path() -> None:
+        ...
+
+The history can be inspected without running the tests::
+
+    python -m tests.plugins.timing --top 20
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import pytest
+
+
+HISTORY_FILE = ".perf/timings.jsonl"
+DEFAULT_TOP = 10
+TREND_COMMITS = 5
+
+Series = List[Tuple[str, float]]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("timings", "test duration telemetry")
+    group.addoption(
+        "--timings-history",
+        default=HISTORY_FILE,
+        help=f"JSON-lines file where test durations are appended (default: {HISTORY_FILE})",
+    )
+    group.addoption(
+        "--timings-top",
+        type=int,
+        default=DEFAULT_TOP,
+        help=f"Number of slowest tests to report, 0 to disable the report (default: {DEFAULT_TOP})",
+    )
+    group.addoption("--no-timings", action="store_true", help="Do not record test durations")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "time_budget(seconds): fail the test when its call phase takes longer than the given seconds"
+    )
+    if not config.getoption("no_timings"):
+        config.pluginmanager.register(TimingRecorder(config), "timing-recorder")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo[None]) -> Generator[None, Any, None]:
+    """Turn a passing test into a failure when it exceeds its time budget."""
+    outcome = yield
+    report = outcome.get_result()
+    marker = item.get_closest_marker("time_budget")
+    if marker is None or report.when != "call" or not report.passed:
+        return
+    budget = budget_seconds(marker)
+    if call.duration > budget:
+        report.outcome = "failed"
+        report.longrepr = f"Time budget exceeded: call took {call.duration:.3f}s, budget is {budget:.3f}s"
+
+
+def budget_seconds(marker: pytest.Mark) -> float:
+    """Read the budget from ``time_budget(seconds)`` or ``time_budget(seconds=...)``."""
+    seconds = marker.args[0] if marker.args else marker.kwargs.get("seconds")
+    if seconds is None:
+        raise pytest.UsageError("time_budget marker requires a number of seconds")
+    return float(seconds)
+
+
+class TimingRecorder:
+    """Collect the test durations of a session and append them to the history store."""
+
+    def __init__(self, config: pytest.Config) -> None:
+        self.config = config
+        self.history = Path(config.rootpath) / config.getoption("timings_history")
+        self.top: int = config.getoption("timings_top")
+        self.run_id = datetime.now().astimezone().isoformat(timespec="milliseconds")
+        self.commit = current_commit(Path(config.rootpath))
+        self.durations: Dict[str, Tuple[float, str]] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when == "call":
+            self.durations[report.nodeid] = (report.duration, report.outcome)
+
+    def pytest_sessionfinish(self) -> None:
+        # Under pytest-xdist only the controller writes, workers relay their reports to it
+        if hasattr(self.config, "workerinput") or not self.durations:
+            return
+        self.history.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.history, "a") as f:
+            for nodeid, (duration, outcome) in self.durations.items():
+                record = {
+                    "run": self.run_id,
+                    "commit": self.commit,
+                    "nodeid": nodeid,
+                    "duration": round(duration, 6),
+                    "outcome": outcome,
+                }
+                f.write(json.dumps(record) + "\n")
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if self.top <= 0 or not self.durations:
+            return
+        slowest = sorted(self.durations.items(), key=lambda item: item[1][0], reverse=True)[: self.top]
+        trends = commit_series(
+            read_history(self.history), [nodeid for nodeid, _ in slowest], exclude_commit=self.commit
+        )
+        terminalreporter.write_sep("=", f"slowest {len(slowest)} tests (trend vs last {TREND_COMMITS} commits)")
+        for nodeid, (duration, _) in slowest:
+            terminalreporter.write_line(f"{duration:8.3f}s {format_trend(duration, trends.get(nodeid, []))}  {nodeid}")
+
+
+def current_commit(cwd: Path) -> str:
+    """Return the short SHA of HEAD, or 'unknown' outside a git repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def read_history(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream the records of the history store, skipping malformed lines."""
+    if not path.exists():
+        return
+    with open(path) as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def commit_series(
+    records: Iterable[Dict[str, Any]], nodeids: Iterable[str], exclude_commit: Optional[str] = None
+) -> Dict[str, Series]:
+    """
+    Compute the mean duration per commit for the given tests.
+
+    Returns:
+        A mapping from test node id to ``(commit, mean duration)`` pairs for the last ``TREND_COMMITS``
+        commits in which the test ran, oldest first.
+    """
+    wanted = set(nodeids)
+    durations: Dict[str, Dict[str, List[float]]] = defaultdict(dict)
+    for record in records:
+        nodeid, commit = str(record.get("nodeid")), str(record.get("commit"))
+        if nodeid not in wanted or commit == exclude_commit:
+            continue
+        per_commit = durations[nodeid]
+        # Re-inserting moves the commit to the end so the order follows the latest run of each commit
+        samples = per_commit.pop(commit, [])
+        samples.append(float(record["duration"]))
+        per_commit[commit] = samples
+    return {
+        nodeid: [(commit, statistics.fmean(samples)) for commit, samples in per_commit.items()][-TREND_COMMITS:]
+        for nodeid, per_commit in durations.items()
+    }
+
+
+def format_trend(duration: float, series: Series) -> str:
+    """Format the change of a duration relative to the mean of previous commits."""
+    if not series:
+        return "   new"
+    baseline = statistics.fmean(mean for _, mean in series)
+    if baseline <= 0:
+        return "     -"
+    return f"{(duration - baseline) / baseline:+6.0%}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report the slowest tests and their trend across commits")
+    parser.add_argument("--history", default=HISTORY_FILE, help=f"History store (default: {HISTORY_FILE})")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Number of tests to report")
+    args = parser.parse_args()
+
+    history = Path(args.history)
+    latest: Dict[str, float] = {}
+    latest_run, latest_commit = None, None
+    for record in read_history(history):
+        if record.get("run") != latest_run:
+            latest_run, latest_commit, latest = record.get("run"), record.get("commit"), {}
+        latest[record["nodeid"]] = float(record["duration"])
+    if not latest:
+        print(f"No test timings recorded in '{history}'.")
+        return
+
+    slowest = sorted(latest.items(), key=lambda item: item[1], reverse=True)[: args.top]
+    trends = commit_series(read_history(history), [nodeid for nodeid, _ in slowest], exclude_commit=latest_commit)
+    print(f"Slowest tests of run {latest_run} at commit {latest_commit}:")
+    for nodeid, duration in slowest:
+        series = trends.get(nodeid, [])
+        history_line = " -> ".join(f"{commit} {mean:.3f}s" for commit, mean in series)
+        print(f"{duration:8.3f}s {format_trend(duration, series)}  {nodeid}")
+        if history_line:
+            print(f"{'':17}{history_line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Tests for the bounded caches and memoization."""
+
+import asyncio
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from {{ cookiecutter.package_name }}.caching import (
+    Cache,
+    DiskCache,
+    estimate_size,
+    memoize,
+)
+from tests.plugins.benchmark import Bench
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction() -> None:
+    """Test that the least recently used entry is evicted beyond max_entries."""
+    cache = Cache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_byte_bound() -> None:
+    """Test that entries are evicted beyond max_bytes and oversized values are not cached."""
+    cache = Cache(max_entries=None, max_bytes=100, sizeof=len)
+    for key in "abcd":
+        cache.set(key, b"x" * 30)
+    assert len(cache) == 3 and "a" not in cache
+    assert cache.stats.bytes == 90
+    cache.set("huge", b"x" * 101)
+    assert "huge" not in cache and len(cache) == 3
+
+
+def test_unbounded_cache_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        Cache(max_entries=None)
+
+
+def test_ttl_expiry() -> None:
+    """Test that entries expire after their TTL, on lookup or through expire()."""
+    clock = FakeClock()
+    cache = Cache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=100)
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    clock.now += 100
+    assert cache.expire() == 1
+    stats = cache.stats
+    assert (stats.expirations, stats.entries, stats.bytes) == (2, 0, 0)
+
+
+def test_stats_hit_rate() -> None:
+    cache = Cache()
+    cache.set("a", 1)
+    for key in ("a", "a", "a", "b"):
+        cache.get(key)
+    assert cache.stats.hit_rate == 0.75
+
+
+def test_estimate_size_follows_containers() -> None:
+    assert estimate_size({"key": b"x" * 1000}) > 1000
+    assert estimate_size([[b"x" * 1000]]) > 1000
+
+
+def test_memoize() -> None:
+    """Test that results are cached per arguments and exceptions are not."""
+    calls: List[int] = []
+
+    @memoize(Cache(max_entries=10))
+    def square(value: int, offset: int = 0) -> int:
+        calls.append(value)
+        if value < 0:
+            raise ValueError(value)
+        return value * value + offset
+
+    assert [square(3), square(3), square(3, offset=1), square(value=3)] == [9, 9, 10, 9]
+    assert calls == [3, 3, 3]
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            square(-1)
+    assert calls.count(-1) == 2
+
+
+def test_memoize_coroutine_coalesces_calls() -> None:
+    """Test that concurrent calls with the same arguments share one call, also when a caller is cancelled."""
+    calls: List[int] = []
+
+    @memoize(Cache(max_entries=10))
+    async def fetch(value: int) -> int:
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    async def main() -> List[int]:
+        cancelled = asyncio.ensure_future(fetch(1))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        results = await asyncio.gather(*(fetch(1) for _ in range(10)), fetch(2))
+        return [*results, await fetch(1)]
+
+    assert asyncio.run(main()) == [2] * 10 + [4, 2]
+    assert sorted(calls) == [1, 2]
+
+
+def test_disk_cache(tmp_path: Path) -> None:
+    """Test that the disk tier persists values, expires them and stays within its byte budget."""
+    clock = FakeClock()
+    disk = DiskCache(tmp_path / "cache.sqlite", max_bytes=10_000, clock=clock)
+    disk.set(("user", 1), {"name": "Ada"})
+    disk.set("short", 1, ttl=5)
+    disk.close()
+
+    disk = DiskCache(tmp_path / "cache.sqlite", max_bytes=10_000, clock=clock)
+    assert disk.get(("user", 1)) == {"name": "Ada"}
+    clock.now += 6
+    assert disk.get("short") is None
+    for index in range(10):
+        clock.now += 1
+        disk.set(index, b"x" * 2000)
+    assert disk.size <= 10_000
+    assert disk.get(9) is not None and disk.get(0) is None
+
+
+def test_disk_tier(tmp_path: Path) -> None:
+    """Test that memory misses fall through to the disk tier and are promoted."""
+    disk = DiskCache(tmp_path / "cache.sqlite")
+    Cache(disk=disk).set("a", [1, 2, 3])
+
+    cache = Cache(disk=disk)
+    assert cache.get("a") == [1, 2, 3]
+    assert "a" in cache
+    assert cache.stats.hits == 1
+
+
+def test_disk_tier_expiry(tmp_path: Path) -> None:
+    """Test that values promoted from the disk tier keep the lifetime they have left there."""
+    disk_clock, clock = FakeClock(), FakeClock()
+    disk = DiskCache(tmp_path / "cache.sqlite", clock=disk_clock)
+    Cache(ttl=100, disk=disk, clock=clock).set("a", 1, ttl=10)
+
+    disk_clock.now += 6
+    cache = Cache(ttl=100, disk=disk, clock=clock)
+    assert cache.get("a") == 1
+    clock.now += 5
+    disk_clock.now += 5
+    assert "a" not in cache
+    assert cache.get("a") is None
+
+
+@pytest.mark.benchmark
+def test_memoized_lookup_is_faster(bench: Bench) -> None:
+    """Benchmark a memoized call against recomputing the result."""
+
+    def compute(value: int) -> int:
+        return sum(i * i for i in range(value))
+
+    memoized = memoize(Cache(max_entries=10))(compute)
+    recomputed = bench.measure("recompute", compute, 2000)
+    cached = bench.measure("memoized", memoized, 2000)
+    assert cached.per_call * 10 < recomputed.per_call
@@ -0,0 +1,142 @@
+"""Tests for the zero-copy file I/O helpers."""
+
+import io
+import struct
+import subprocess
+import sys
+import textwrap
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.package_name }}.fileio import (
+    MappedFile,
+    iter_chunks,
+    iter_length_prefixed,
+    iter_lines,
+    iter_records,
+)
+
+
+LINE = b"x" * 99 + b"\n"
+
+
+@pytest.fixture
+def big_file(tmp_path: Path) -> Path:
+    """A 32 MB file of 100-byte lines."""
+    path = tmp_path / "big.txt"
+    with open(path, "wb") as f:
+        block = LINE * 10_000
+        for _ in range(32):
+            f.write(block)
+    return path
+
+
+def test_mapped_file(tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"header:payload")
+    with MappedFile(path) as mapped:
+        assert len(mapped) == 14
+        assert mapped.find(b":") == 6
+        assert mapped.view[7:] == b"payload"
+
+
+def test_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    with MappedFile(path) as mapped:
+        assert len(mapped) == 0 and mapped.find(b"\n") == -1
+    assert list(iter_lines(path)) == []
+    assert list(iter_chunks(path)) == []
+
+
+def test_iter_lines(tmp_path: Path) -> None:
+    path = tmp_path / "lines.txt"
+    path.write_bytes(b"first\n\nsecond\nlast without newline")
+    assert [bytes(line) for line in iter_lines(path)] == [b"first", b"", b"second", b"last without newline"]
+    assert b"".join(bytes(line) for line in iter_lines(path, keepends=True)) == path.read_bytes()
+
+
+def test_iter_chunks_reuses_one_buffer() -> None:
+    chunks = iter_chunks(io.BytesIO(b"abcdefghij"), chunk_size=4)
+    assert [bytes(chunk) for chunk in chunks] == [b"abcd", b"efgh", b"ij"]
+
+
+def test_iter_records(tmp_path: Path) -> None:
+    record = struct.Struct("<qd")
+    path = tmp_path / "records.bin"
+    path.write_bytes(b"".join(record.pack(i, i / 2) for i in range(1000)))
+    records = list(iter_records(path, "<qd"))
+    assert len(records) == 1000 and records[-1] == (999, 499.5)
+
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="not a multiple"):
+        list(iter_records(path, "<qd"))
+
+
+def test_iter_length_prefixed(tmp_path: Path) -> None:
+    payloads = [b"", b"a", b"hello" * 100]
+    path = tmp_path / "framed.bin"
+    path.write_bytes(b"".join(struct.pack("<I", len(p)) + p for p in payloads))
+    assert [bytes(payload) for payload in iter_length_prefixed(path)] == payloads
+
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="truncated record"):
+        list(iter_length_prefixed(path))
+
+
+def test_early_exit_releases_the_mapping(big_file: Path) -> None:
+    lines = iter_lines(big_file)
+    kept = bytes(next(lines))
+    lines.close()
+    assert kept == LINE[:-1]
+
+
+def test_streaming_memory_is_bounded(big_file: Path) -> None:
+    """Test that Python allocations stay far below the file size while streaming it."""
+    tracemalloc.start()
+    try:
+        assert sum(1 for _ in iter_lines(big_file)) == 320_000
+        assert sum(len(chunk) for chunk in iter_chunks(big_file, chunk_size=1 << 16)) == 32_000_000
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 1_000_000
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs RLIMIT_DATA and /proc")
+def test_file_larger_than_memory_limit(big_file: Path) -> None:
+    """Test that files larger than the process data limit are streamed while reading them at once fails."""
+    script = textwrap.dedent(
+        """
+        import re
+        import resource
+        import sys
+
+        from {{ cookiecutter.package_name }}.fileio import iter_chunks, iter_lines
+
+        with open("/proc/self/status") as f:
+            used = int(re.search(r"VmData:\\s+(\\d+)", f.read()).group(1)) * 1024
+        # Room for 8 MB of allocations, a quarter of the file
+        resource.setrlimit(resource.RLIMIT_DATA, (used + (8 << 20), resource.RLIM_INFINITY))
+
+        path = sys.argv[1]
+        lines = sum(1 for line in iter_lines(path))
+        size = sum(len(chunk) for chunk in iter_chunks(path))
+        try:
+            with open(path, "rb") as f:
+                f.read()
+            print("read fit")
+        except MemoryError:
+            print(f"read failed, streamed {lines} lines and {size} bytes")
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, str(big_file)],
+        capture_output=True,
+        text=True,
+        env={"PYTHONPATH": str(Path(__file__).parents[1] / "src")},
+    )
+    assert result.returncode == 0, result.stderr
+    assert "read failed, streamed 320000 lines and 32000000 bytes" in result.stdout
@@ -0,0 +1,146 @@
+"""Tests for the hot-path instrumentation."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+import pytest
+
+from {{ cookiecutter.package_name }} import instrumentation
+from {{ cookiecutter.package_name }}.instrumentation import (
+    ENV_PREFIX,
+    Registry,
+    environment_settings,
+    summarize,
+)
+from tests.plugins.benchmark import Bench
+
+
+def read_records(path: Path) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def registry(tmp_path: Path) -> Registry:
+    return Registry(enabled=True, path=tmp_path / "metrics.jsonl", flush_interval=3600)
+
+
+def test_disabled_records_nothing(tmp_path: Path) -> None:
+    """Test that disabled metrics keep no values and write no file."""
+    registry = Registry(path=tmp_path / "metrics.jsonl")
+
+    @registry.timed()
+    def double(value: int) -> int:
+        return value * 2
+
+    assert double(21) == 42
+    registry.counter("calls").add()
+    with registry.timer("block"):
+        pass
+    assert registry.flush() == 0
+    assert not registry.path.exists()
+
+
+def test_metrics_are_flushed_as_json_lines(registry: Registry) -> None:
+    """Test that counters, histograms and timers are written and reset on flush."""
+
+    @registry.timed("double")
+    def double(value: int) -> int:
+        return value * 2
+
+    @registry.timed()
+    async def wait() -> None:
+        await asyncio.sleep(0.01)
+
+    for value in range(10):
+        double(value)
+    asyncio.run(wait())
+    registry.counter("misses").add(3)
+    registry.histogram("batch", buckets=(1, 10, 100)).observe(50)
+    with registry.timer("block"):
+        pass
+
+    assert registry.flush() == 5
+    records = {record["name"]: record for record in read_records(registry.path)}
+    assert records["double"]["count"] == 10
+    assert records["misses"]["value"] == 3
+    assert records["batch"]["buckets"] == [[100, 1]]
+    assert records[f"{__name__}.test_metrics_are_flushed_as_json_lines.<locals>.wait"]["min"] >= 0.01
+    assert all(record["pid"] and record["time"] for record in records.values())
+    assert registry.flush() == 0
+
+
+def test_flush_interval(registry: Registry) -> None:
+    """Test that metrics are flushed while recording once the flush interval has passed."""
+    registry.configure(flush_interval=0)
+    registry.counter("events").add()
+    assert read_records(registry.path)[0]["value"] == 1
+
+
+def test_metric_kind_conflict(registry: Registry) -> None:
+    """Test that a name cannot be used for two kinds of metrics."""
+    registry.counter("requests")
+    with pytest.raises(TypeError):
+        registry.histogram("requests")
+
+
+def test_summarize(registry: Registry) -> None:
+    """Test that the flushed intervals are merged into totals with estimated quantiles."""
+    for values in ([1, 2, 3], [4, 200]):
+        for value in values:
+            registry.histogram("size", buckets=(2, 4, 8)).observe(value)
+            registry.counter("events").add()
+        registry.flush()
+
+    totals = summarize(registry.path)
+    assert totals["events"]["value"] == 5
+    size = totals["size"]
+    assert (size["count"], size["min"], size["max"], size["mean"]) == (5, 1, 200, 42)
+    assert size["p50"] == 4
+    assert size["p99"] == 200
+
+
+def test_settings_from_dotenv(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that .env is read like run.sh does and takes precedence over exported variables, as there."""
+    dotenv = tmp_path / ".env"
+    dotenv.write_text(f"# instrumentation\n\n{ENV_PREFIX}=1\n{ENV_PREFIX}_FILE=from-dotenv.jsonl\n")
+    monkeypatch.delenv(ENV_PREFIX, raising=False)
+    monkeypatch.setenv(f"{ENV_PREFIX}_FILE", "from-env.jsonl")
+    monkeypatch.setenv(f"{ENV_PREFIX}_FLUSH_INTERVAL", "5")
+
+    registry = Registry.from_settings(environment_settings(dotenv))
+    assert registry.enabled
+    assert registry.path == Path("from-dotenv.jsonl")
+    assert registry.flush_interval == 5
+    assert not Registry.from_settings(environment_settings(tmp_path / "missing")).enabled
+
+
+def test_registry_created_on_first_use(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that importing the module reads no settings and the registry is created when first used."""
+    monkeypatch.setattr(instrumentation, "_registry", None)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".env").write_text(f"{ENV_PREFIX}=1\n{ENV_PREFIX}_FILE=metrics.jsonl\n")
+
+    instrumentation.counter("events").add(2)
+    assert instrumentation.registry().enabled
+    assert instrumentation.flush() == 1
+    assert read_records(tmp_path / "metrics.jsonl")[0]["value"] == 2
+
+
+@pytest.mark.benchmark
+def test_disabled_overhead(bench: Bench) -> None:
+    """Benchmark a disabled timed function against the undecorated one."""
+
+    def work() -> int:
+        return sum(range(100))
+
+    timed_work = Registry().timed("work")(work)
+    plain = bench.measure("undecorated", work)
+    disabled = bench.measure("timed, disabled", timed_work)
+    assert disabled.per_call < plain.per_call * 2
@@ -0,0 +1,114 @@
+"""Tests for the numeric core: vectorized paths against their scalar references, and benchmarks."""
+
+import numpy as np
+import pytest
+
+from {{ cookiecutter.package_name }}.numeric import (
+    TimeSeries,
+    TimeSeriesBuilder,
+    ewma,
+    pairwise_distances,
+    rolling_mean,
+    zscore,
+)
+from {{ cookiecutter.package_name }}.numeric.ops import (
+    ewma_scalar,
+    pairwise_distances_scalar,
+    rolling_mean_scalar,
+    zscore_scalar,
+)
+from tests.plugins.benchmark import Bench
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(42)
+
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+def test_rolling_mean(rng: np.random.Generator, window: int) -> None:
+    values = rng.normal(size=200)
+    np.testing.assert_allclose(rolling_mean(values, window), rolling_mean_scalar(values.tolist(), window))
+
+
+def test_rolling_mean_batch(rng: np.random.Generator) -> None:
+    batch = rng.normal(size=(4, 50))
+    result = rolling_mean(batch, 5)
+    assert result.shape == (4, 46)
+    for row, expected in zip(result, batch):
+        np.testing.assert_allclose(row, rolling_mean_scalar(expected.tolist(), 5))
+    assert rolling_mean(batch, 60).shape == (4, 0)
+    with pytest.raises(ValueError):
+        rolling_mean(batch, 0)
+
+
+def test_zscore(rng: np.random.Generator) -> None:
+    values = rng.normal(5, 2, size=100)
+    np.testing.assert_allclose(zscore(values), zscore_scalar(values.tolist()))
+    assert np.all(zscore(np.ones((2, 5))) == 0)
+
+
+def test_pairwise_distances(rng: np.random.Generator) -> None:
+    points, others = rng.normal(size=(20, 3)), rng.normal(size=(30, 3))
+    expected = pairwise_distances_scalar(points.tolist(), others.tolist())
+    np.testing.assert_allclose(pairwise_distances(points, others), expected, atol=1e-9)
+
+
+def test_ewma(rng: np.random.Generator) -> None:
+    values = rng.normal(size=100)
+    np.testing.assert_allclose(ewma(values, 0.3), ewma_scalar(values.tolist(), 0.3))
+    batch = rng.normal(size=(3, 10))
+    assert ewma(batch, 0.5).shape == (3, 10)
+    np.testing.assert_allclose(ewma(batch, 0.5)[1], ewma_scalar(batch[1].tolist(), 0.5))
+    with pytest.raises(ValueError):
+        ewma(values, 0)
+
+
+def test_time_series_window_is_a_view() -> None:
+    series = TimeSeries.from_records((t, float(t)) for t in range(0, 100, 10))
+    window = series.window(20, 50)
+    assert window.timestamps.tolist() == [20, 30, 40]
+    assert np.shares_memory(window.values, series.values)
+    with pytest.raises(ValueError):
+        TimeSeries([2, 1], [0.0, 0.0])
+
+
+def test_time_series_bucket_mean() -> None:
+    series = TimeSeries([0, 1, 5, 6, 7, 12], [1.0, 3.0, 2.0, 4.0, 6.0, 10.0])
+    buckets = series.bucket_mean(5)
+    assert buckets.timestamps.tolist() == [0, 5, 10]
+    assert buckets.values.tolist() == [2.0, 4.0, 10.0]
+
+
+def test_time_series_builder() -> None:
+    builder = TimeSeriesBuilder(capacity=2)
+    for t in range(5):
+        builder.append(t, t * 2.0)
+    builder.extend(np.arange(10, 1000), np.zeros(990))
+    series = builder.build()
+    assert len(series) == len(builder) == 995
+    assert series.values[:5].tolist() == [0.0, 2.0, 4.0, 6.0, 8.0]
+
+
+@pytest.mark.benchmark
+def test_rolling_mean_speedup(bench: Bench, rng: np.random.Generator) -> None:
+    values = rng.normal(size=20_000)
+    scalar = bench.measure("scalar", rolling_mean_scalar, values.tolist(), 50)
+    vectorized = bench.measure("vectorized", rolling_mean, values, 50)
+    assert vectorized.per_call * 5 < scalar.per_call
+
+
+@pytest.mark.benchmark
+def test_pairwise_distances_speedup(bench: Bench, rng: np.random.Generator) -> None:
+    points, others = rng.normal(size=(200, 8)), rng.normal(size=(200, 8))
+    scalar = bench.measure("scalar", pairwise_distances_scalar, points.tolist(), others.tolist())
+    vectorized = bench.measure("vectorized", pairwise_distances, points, others)
+    assert vectorized.per_call * 5 < scalar.per_call
+
+
+@pytest.mark.benchmark
+def test_ewma_speedup(bench: Bench, rng: np.random.Generator) -> None:
+    values = rng.normal(size=(10, 10_000))
+    ewma(values[:, :10], 0.1)  # compile the kernel before timing when numba is installed
+    bench.measure("scalar", lambda: [ewma_scalar(row, 0.1) for row in values.tolist()])
+    bench.measure("batched", ewma, values, 0.1)
@@ -0,0 +1,128 @@
+"""Tests for the process-pool batch execution helpers."""
+
+import array
+import functools
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import (
+    Iterator,
+    Tuple,
+)
+
+import pytest
+
+from {{ cookiecutter.package_name }} import parallel
+from {{ cookiecutter.package_name }}.parallel import (
+    MAX_ATTACHED,
+    SharedArray,
+    WorkerError,
+    parallel_map,
+)
+from tests.plugins.benchmark import Bench
+
+
+def square(value: int) -> int:
+    return value * value
+
+
+def fail_on_13(value: int) -> int:
+    if value == 13:
+        raise ValueError("unlucky")
+    return value
+
+
+def window_sum(shared: SharedArray, bounds: Tuple[int, int]) -> float:
+    return sum(shared.view()[bounds[0] : bounds[1]])
+
+
+def busy(value: int) -> int:
+    return sum(i * i for i in range(value))
+
+
+def test_results_are_ordered() -> None:
+    assert list(parallel_map(square, range(1000), chunksize=7, max_workers=2)) == [i * i for i in range(1000)]
+
+
+def test_lazy_iterable_input() -> None:
+    """Test that items from an iterator are consumed and processed without a known length."""
+
+    def numbers() -> Iterator[int]:
+        yield from range(100)
+
+    assert sum(parallel_map(square, numbers(), max_workers=2)) == sum(i * i for i in range(100))
+
+
+def test_worker_error_names_the_item() -> None:
+    with pytest.raises(WorkerError) as error:
+        list(parallel_map(fail_on_13, range(100), chunksize=5, max_workers=2))
+    assert error.value.index == 13
+    assert "ValueError: unlucky" in str(error.value)
+
+
+def test_early_exit_shuts_down_the_pool() -> None:
+    """Test that closing the iterator early cancels the pending chunks and stops the workers."""
+    results = parallel_map(square, range(10_000), chunksize=10, max_workers=2)
+    assert next(results) == 0
+    results.close()
+    assert not multiprocessing.active_children()
+
+
+def test_reused_executor_is_left_running() -> None:
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert list(parallel_map(square, range(10), executor=executor)) == [i * i for i in range(10)]
+        assert list(parallel_map(square, range(3), executor=executor)) == [0, 1, 4]
+
+
+def test_shared_array_is_read_in_workers() -> None:
+    """Test that workers read a shared buffer, also when started with spawn, and that it is released."""
+    values = array.array("d", range(100_000))
+    bounds = [(start, start + 10_000) for start in range(0, 100_000, 10_000)]
+    context = multiprocessing.get_context("spawn")
+    with SharedArray.copy_of(values) as shared, ProcessPoolExecutor(2, mp_context=context) as executor:
+        totals = list(parallel_map(functools.partial(window_sum, shared), bounds, executor=executor))
+        name = shared.name
+    assert sum(totals) == sum(values)
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_attached_memory_is_bounded() -> None:
+    """Test that a process reading many shared arrays keeps only the recently used ones attached."""
+    owned = [SharedArray.copy_of(bytes([index])) for index in range(MAX_ATTACHED + 2)]
+    try:
+        # Unpickled copies attach to the memory like in a worker process
+        copies = [pickle.loads(pickle.dumps(shared)) for shared in owned]
+        assert [copy.view()[0] for copy in copies] == list(range(MAX_ATTACHED + 2))
+        assert list(parallel._attached) == [copy.name for copy in copies[2:]]
+        assert copies[0].view()[0] == 0
+        assert list(parallel._attached)[-1] == copies[0].name
+        assert len(parallel._attached) == MAX_ATTACHED
+    finally:
+        for shared in owned:
+            shared.close()
+
+
+def test_shared_numpy_array() -> None:
+    numpy = pytest.importorskip("numpy")
+    matrix = numpy.arange(12, dtype=numpy.float64).reshape(3, 4)
+    with SharedArray.copy_of(matrix[:, 1:]) as shared:
+        assert shared.shape == (3, 3)
+        numpy.testing.assert_array_equal(shared.asarray(), matrix[:, 1:])
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif((os.cpu_count() or 1) < 2, reason="needs at least 2 CPUs")
+def test_parallel_scaling(bench: Bench) -> None:
+    """Benchmark the map on one worker against all CPUs, reusing warm pools."""
+    items = [20_000] * 64
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(1) as single, ProcessPoolExecutor(workers) as multiple:
+        serial = bench.measure("1 worker", lambda: list(parallel_map(busy, items, executor=single)))
+        scaled = bench.measure(
+            f"{workers} workers",
+            lambda: list(parallel_map(busy, items, max_workers=workers, executor=multiple)),
+        )
+    assert scaled.per_call * 1.3 < serial.per_call
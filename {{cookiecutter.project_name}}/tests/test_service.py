@@ -0,0 +1,189 @@
+"""Tests for the service building blocks, run against in-process stand-in servers."""
+
+import asyncio
+import os
+import signal
+from typing import (
+    AsyncIterator,
+    List,
+)
+
+import pytest
+import pytest_asyncio
+
+from {{ cookiecutter.package_name }}.service import (
+    Batcher,
+    ConnectionPool,
+    GracefulShutdown,
+    PoolClosed,
+    PoolTimeout,
+    QueueClosed,
+    WorkQueue,
+)
+from {{ cookiecutter.package_name }}.service.testing import (
+    LineConnection,
+    LineServer,
+)
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[LineServer]:
+    async with LineServer(str.upper, delay=0.01) as server:
+        yield server
+
+
+def line_pool(server: LineServer, **kwargs: float) -> "ConnectionPool[LineConnection]":
+    return ConnectionPool(
+        lambda: LineConnection.open(server.host, server.port), LineConnection.close, **kwargs  # type: ignore[arg-type]
+    )
+
+
+async def request(pool: "ConnectionPool[LineConnection]", line: str) -> str:
+    async with pool.connection() as connection:
+        return await connection.request(line)
+
+
+@pytest.mark.asyncio
+async def test_pool_bounds_connections(server: LineServer) -> None:
+    pool = line_pool(server, max_size=3)
+    replies = await asyncio.gather(*(request(pool, f"r{i}") for i in range(20)))
+    assert replies == [f"R{i}" for i in range(20)]
+    assert server.peak_active <= 3
+    stats = pool.stats()
+    assert stats.created == 3 and stats.reused == 17 and stats.idle == 3
+    await pool.close()
+    assert pool.stats().size == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_acquire_timeout(server: LineServer) -> None:
+    pool = line_pool(server, max_size=1, acquire_timeout=0.05)
+    connection = await pool.acquire()
+    with pytest.raises(PoolTimeout):
+        await pool.acquire()
+    await pool.release(connection)
+    assert await request(pool, "again") == "AGAIN"
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_discards_failed_connections(server: LineServer) -> None:
+    pool = line_pool(server, max_size=2)
+    with pytest.raises(RuntimeError):
+        async with pool.connection():
+            raise RuntimeError("request failed")
+    assert pool.stats().size == 0
+    assert await request(pool, "fresh") == "FRESH"
+    assert pool.stats().created == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_close_waits_for_connections_in_use(server: LineServer) -> None:
+    pool = line_pool(server, max_size=2)
+    in_flight = asyncio.create_task(request(pool, "slow"))
+    await asyncio.sleep(0.001)
+    await pool.close(timeout=1)
+    assert await in_flight == "SLOW"
+    with pytest.raises(PoolClosed):
+        await pool.acquire()
+
+
+@pytest.mark.asyncio
+async def test_batcher_groups_requests() -> None:
+    batches: List[List[int]] = []
+
+    async def double(items: List[int]) -> List[int]:
+        batches.append(items)
+        return [item * 2 for item in items]
+
+    batcher = Batcher(double, max_batch_size=4, max_delay=0.01)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+    assert results == [i * 2 for i in range(10)]
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert batcher.mean_batch_size == pytest.approx(10 / 3)
+    await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_batcher_propagates_errors() -> None:
+    async def fail(items: List[int]) -> List[int]:
+        raise ValueError("backend down")
+
+    batcher = Batcher(fail, max_batch_size=10, max_delay=0.001)
+    results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    await batcher.close()
+    with pytest.raises(RuntimeError):
+        await batcher.submit(3)
+
+
+@pytest.mark.asyncio
+async def test_work_queue_backpressure() -> None:
+    release = asyncio.Event()
+
+    async def job(value: int) -> int:
+        await release.wait()
+        return value
+
+    async with WorkQueue(workers=1, max_pending=2) as queue:
+        first = await queue.submit(job, 1)
+        await asyncio.sleep(0)  # the worker takes the first job, leaving room for two more
+        second, third = await queue.submit(job, 2), await queue.submit(job, 3)
+        assert queue.try_submit(job, 4) is None
+        blocked = asyncio.create_task(queue.submit(job, 5))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        release.set()
+        fifth = await blocked
+        assert [await first, await second, await third, await fifth] == [1, 2, 3, 5]
+    assert queue.processed == 4
+    with pytest.raises(QueueClosed):
+        await queue.submit(job, 6)
+
+
+@pytest.mark.asyncio
+async def test_work_queue_drains_on_shutdown(server: LineServer) -> None:
+    pool = line_pool(server, max_size=2)
+    queue = WorkQueue(workers=2, max_pending=50)
+    futures = [await queue.submit(request, pool, f"job{i}") for i in range(10)]
+    await queue.shutdown(drain=True)
+    assert [future.result() for future in futures] == [f"JOB{i}" for i in range(10)]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_work_queue_failures() -> None:
+    async def fail() -> None:
+        raise KeyError("missing")
+
+    async with WorkQueue(workers=1) as queue:
+        with pytest.raises(KeyError):
+            await queue.run(fail)
+    assert queue.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_graceful_shutdown_runs_callbacks_in_reverse() -> None:
+    calls: List[str] = []
+    async with GracefulShutdown(timeout=0.1) as shutdown:
+
+        @shutdown.on_shutdown
+        async def close_pool() -> None:
+            calls.append("pool")
+
+        @shutdown.on_shutdown
+        async def stop_server() -> None:
+            calls.append("server")
+
+        @shutdown.on_shutdown
+        async def stuck() -> None:
+            await asyncio.sleep(10)
+
+        if os.name == "posix":
+            os.kill(os.getpid(), signal.SIGTERM)
+        else:
+            shutdown.trigger()
+        await asyncio.wait_for(shutdown.wait(), 1)
+        assert shutdown.requested
+    assert calls == ["server", "pool"]
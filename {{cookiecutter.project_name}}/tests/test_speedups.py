@@ -0,0 +1,64 @@
+"""Tests for the hot-path functions, run against both the compiled and the pure-Python implementation."""
+
+import os
+from types import ModuleType
+
+import pytest
+
+from {{ cookiecutter.package_name }} import (
+    _speedups_py,
+    speedups,
+)
+
+
+try:
+    from {{ cookiecutter.package_name }} import _speedups
+except ImportError:
+    _speedups = None  # type: ignore[assignment]
+
+
+IMPLEMENTATIONS = [
+    pytest.param(_speedups_py, id="python"),
+    pytest.param(_speedups, id="compiled", marks=pytest.mark.skipif(_speedups is None, reason="extension not built")),
+]
+
+# Reference values of the 64-bit FNV-1a hash
+KNOWN_HASHES = [
+    pytest.param(b"", 0xCBF29CE484222325, id="empty"),
+    pytest.param(b"a", 0xAF63DC4C8601EC8C, id="a"),
+    pytest.param(b"foobar", 0x85944171F73967E8, id="foobar"),
+]
+
+
+@pytest.fixture(params=IMPLEMENTATIONS)
+def implementation(request: pytest.FixtureRequest) -> ModuleType:
+    return request.param
+
+
+@pytest.mark.parametrize("data, expected", KNOWN_HASHES)
+def test_fnv1a_64(implementation: ModuleType, data: bytes, expected: int) -> None:
+    assert implementation.fnv1a_64(data) == expected
+
+
+def test_fnv1a_64_buffers(implementation: ModuleType) -> None:
+    data = os.urandom(1000)
+    expected = _speedups_py.fnv1a_64(data)
+    assert implementation.fnv1a_64(bytearray(data)) == expected
+    assert implementation.fnv1a_64(memoryview(data)) == expected
+    assert implementation.fnv1a_64(data, seed=1) == _speedups_py.fnv1a_64(data, seed=1)
+
+
+def test_fnv1a_64_batch(implementation: ModuleType) -> None:
+    items = [os.urandom(size) for size in range(50)]
+    assert implementation.fnv1a_64_batch(items) == [_speedups_py.fnv1a_64(item) for item in items]
+    assert implementation.fnv1a_64_batch([]) == []
+
+
+def test_fnv1a_64_rejects_text(implementation: ModuleType) -> None:
+    with pytest.raises(TypeError):
+        implementation.fnv1a_64("text")
+
+
+def test_public_module_selects_implementation() -> None:
+    assert speedups.COMPILED == (_speedups is not None and speedups.fnv1a_64 is _speedups.fnv1a_64)
+    assert speedups.fnv1a_64(b"a") == 0xAF63DC4C8601EC8C